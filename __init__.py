@@ -1,24 +1,33 @@
 import os
 import json
-from rdflib import Graph
 
-from .xml_utils import initialize
+from .xml_utils import initialize, sync, LexiconSession
+from .xml_utils import shard_luindex, merge_luindex_shards
 
 from .load_utils import load
 
 from .lexicon import add_lu
 
+from .lexicon import add_lus
+
 from .lexicon import add_lus_from_json
 
-from .lexicon import remove_lu
+from .lexicon import remove_lu, remove_lus
+
+from .lexicon import repair_lexicon
+
+from .lexicon_utils import get_luid, get_luids, select_lu_ids
+from .lexicon_utils import check_lexicon_consistency
 
-from .lexicon_utils import get_luid
+from .validation_utils import validate_lus, ValidationError
 
 # rdf
 from .rdf_utils import generate_lexicon_rdf_uri
 from .rdf_utils import generate_le_and_lu_rdf_uri
 from .rdf_utils import convert_to_lemon
 from .rdf_utils import derive_model
+from .rdf_utils import load_cached_graph
+from .rdf_utils import load_premon_index
 
 # annotations
 from .annotation_utils import add_annotations_from_naf_31
@@ -37,20 +46,19 @@ from .stats_utils import get_ambiguity_df
 dir_path = os.path.dirname(os.path.realpath(__file__))
 
 
+# cache of parsed resources
+cache_dir = os.path.join(dir_path, 'res', 'cache')
+
 # lemon
 lemon_ttl_path = os.path.join(dir_path,
                               'res/lemon/lemon.ttl')
 
-lemon = Graph()
-lemon.parse(lemon_ttl_path, format='ttl')
-
 # FN pos -> lexinfo
 path_fn_pos_to_lexinfo = os.path.join(dir_path,
                                       'res',
                                       'rdf',
                                       'mappings',
                                       'fn_pos_to_lexinfo.json')
-fn_pos_to_lexinfo = json.load(open(path_fn_pos_to_lexinfo))
 
 # premon
 premon_nt = os.path.join(dir_path, 'res/premon/premon-2018a-fn17-noinf.nt')
@@ -60,13 +68,48 @@ ontolex_path = os.path.join(dir_path,
                             'res',
                             'ontolex',
                             'ontolex.rdf')
-ontolex = Graph()
-ontolex.parse(ontolex_path)
 
 # skos
 skos_path = os.path.join(dir_path,
                          'res',
                          'skos',
                          'skos.rdf')
-skos = Graph()
-skos.parse(skos_path)
+
+
+def load_lemon():
+    return load_cached_graph(lemon_ttl_path, format='ttl', cache_dir=cache_dir)
+
+
+def load_fn_pos_to_lexinfo():
+    with open(path_fn_pos_to_lexinfo) as infile:
+        return json.load(infile)
+
+
+def load_ontolex():
+    return load_cached_graph(ontolex_path, cache_dir=cache_dir)
+
+
+def load_skos():
+    return load_cached_graph(skos_path, cache_dir=cache_dir)
+
+
+# the resources below are only loaded the first time they are accessed,
+# e.g., FrameNetNLTK.lemon, since parsing them is expensive
+LAZY_RESOURCES = {
+    'lemon': load_lemon,
+    'fn_pos_to_lexinfo': load_fn_pos_to_lexinfo,
+    'ontolex': load_ontolex,
+    'skos': load_skos,
+}
+
+
+def __getattr__(name):
+    if name in LAZY_RESOURCES:
+        value = LAZY_RESOURCES[name]()
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY_RESOURCES))
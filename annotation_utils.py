@@ -9,7 +9,7 @@ from .xml_utils import strip_corpus_els_and_save
 from .xml_utils import add_annotations_to_nltk_doc
 from .naf_utils import get_sentid_to_info
 from .naf_utils import load_annotations_from_naf
-from .rdf_utils import load_graph
+from .rdf_utils import load_premon_index
 
 
 def generate_id(fulltext_xml_path,
@@ -334,7 +334,7 @@ def add_annotations_from_naf_31(your_fn,
 
     :param nltk.corpus.reader.framenet.FramenetCorpusReader your_fn: a FrameNet in the NLTK format
     :param nltk corpus.reader.framenet.FramenetCorpusReader fn_en: English FrameNet in the NLTK format
-    :param rdflib.graph.Graph premon: use FrameNetNLTK.premon_nt
+    :param str premon_nt: use FrameNetNLTK.premon_nt (only used to build the PreMOn index once, see rdf_utils.load_premon_index)
 
     :param str corpus_name: abbreviated name of the corpus, e.g., HDD, which will be the value
     of the attribute "name" of element "corpus" in the file fulltextIndex.xml
@@ -346,8 +346,8 @@ def add_annotations_from_naf_31(your_fn,
     your_paths = get_relevant_paths(root=your_fn._root, check_if_exists=False)
     en_paths = get_relevant_paths(root=fn_en._root, check_if_exists=True)
 
-    premon = load_graph(path=premon_nt, format='nt')
-    your_fn_in_lemon = load_graph(path=path_to_your_fn_in_lemon, format='ttl')
+    premon_index = load_premon_index(premon_nt_path=premon_nt,
+                                     verbose=verbose)
 
     setup_fulltext(your_paths=your_paths,
                    en_paths=en_paths,
@@ -426,7 +426,7 @@ def add_annotations_from_naf_31(your_fn,
                                                       path_to_your_fn_in_lemon=path_to_your_fn_in_lemon,
                                                       naf_path=naf_path,
                                                       doc_id=doc_id,
-                                                      premon=premon)
+                                                      premon_index=premon_index)
 
 
     # update annotations
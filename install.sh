@@ -22,6 +22,7 @@ wget https://knowledgestore.fbk.eu/files/premon/dataset/latest/premon-2018a-fn17
 gunzip premon-2018a-fn17-noinf.tql.gz
 cd ../..
 python -c 'import rdf_utils;g = rdf_utils.load_nquads_file(path_to_nquad_file="res/premon/premon-2018a-fn17-noinf.tql");rdf_utils.convert_nquads_to_nt(g, output_path="res/premon/premon-2018a-fn17-noinf.nt")' || exit
+python -c 'import rdf_utils;rdf_utils.load_premon_index(premon_nt_path="res/premon/premon-2018a-fn17-noinf.nt", verbose=1)' || exit
 
 cd res || exit
 rm -rf ontolex
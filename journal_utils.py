@@ -0,0 +1,328 @@
+import os
+import json
+import shutil
+import fcntl
+from contextlib import contextmanager
+
+
+JOURNAL_DIR = '.journal'
+LOCK_BASENAME = 'lock'
+TRANSACTION_DIR = 'current'
+MANIFEST_BASENAME = 'manifest.json'
+
+
+def fsync_path(path):
+    """
+    flush a file or folder to disk
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def insert_at(path, offset, data):
+    """
+    replace the content of a file from offset onwards by data, e.g.,
+    to insert elements before the closing tag of the root of an XML file (data then also contains the closing tag).
+    This is idempotent, i.e., applying it twice results in the same file.
+    """
+    with open(path, 'r+b') as outfile:
+        outfile.seek(offset)
+        outfile.write(data)
+        outfile.truncate()
+        outfile.flush()
+        os.fsync(outfile.fileno())
+
+
+class Transaction(object):
+    """
+    A journaled set of file mutations of a lexicon.
+    Every file that is written is first staged in LEXICON/.journal/current,
+    every file that is removed is only recorded.
+    Appends to large files can be recorded as inserts (see insert), which only stage the inserted bytes.
+    When the transaction is committed, a manifest is written (the commit point)
+    after which the staged files replace the originals using atomic renames.
+    If the process dies before the manifest is written, nothing has changed (see recover).
+    If it dies after the manifest is written, the transaction is rolled forward (see recover).
+    """
+    def __init__(self, folder, verbose=0):
+        self.folder = os.path.realpath(folder)
+        self.journal_dir = os.path.join(self.folder, JOURNAL_DIR)
+        self.transaction_dir = os.path.join(self.journal_dir, TRANSACTION_DIR)
+        self.manifest_path = os.path.join(self.transaction_dir, MANIFEST_BASENAME)
+        self.verbose = verbose
+        self.lock_file = None
+
+        # relative path -> operation
+        self.operations = {}
+        self.num_staged = 0
+
+    def relative_path(self, path):
+        rel_path = os.path.relpath(os.path.realpath(path), self.folder)
+        assert not rel_path.startswith(os.pardir), f'{path} is not part of the lexicon at {self.folder}'
+        return rel_path
+
+    def acquire_lock(self):
+        if not os.path.exists(self.journal_dir):
+            os.mkdir(self.journal_dir)
+        self.lock_file = open(os.path.join(self.journal_dir, LOCK_BASENAME), 'a')
+        fcntl.flock(self.lock_file, fcntl.LOCK_EX)
+
+    def release_lock(self):
+        if self.lock_file is not None:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+            self.lock_file.close()
+            self.lock_file = None
+
+    def begin(self):
+        self.acquire_lock()
+        recover_transaction(transaction_dir=self.transaction_dir,
+                            folder=self.folder,
+                            verbose=self.verbose)
+        os.mkdir(self.transaction_dir)
+
+    def materialize(self, rel_path):
+        """
+        convert a recorded insert into a staged copy of the file with the insert applied
+        """
+        operation = self.operations.get(rel_path)
+        if operation is None or operation['action'] != 'insert':
+            return
+
+        insert_path = os.path.join(self.transaction_dir, operation['staged'])
+        with open(insert_path, 'rb') as infile:
+            data = infile.read()
+        os.remove(insert_path)
+
+        staged = f'{self.num_staged}-{os.path.basename(rel_path)}'
+        self.num_staged += 1
+        staged_path = os.path.join(self.transaction_dir, staged)
+        shutil.copyfile(os.path.join(self.folder, rel_path), staged_path)
+        insert_at(staged_path, operation['offset'], data)
+
+        self.operations[rel_path] = {
+            'action' : 'write',
+            'path' : rel_path,
+            'staged' : staged
+        }
+
+    def insert(self, path, offset, data):
+        """
+        record that the content of path from offset onwards is replaced by data (see insert_at).
+        offset refers to the current content of path in this transaction (see current_path).
+        Only data is staged, such that the cost does not depend on the size of the file.
+        """
+        rel_path = self.relative_path(path)
+        self.materialize(rel_path)
+        operation = self.operations.get(rel_path)
+
+        if operation is not None:
+            assert operation['action'] == 'write', f'{path} was removed in this transaction.'
+            insert_at(os.path.join(self.transaction_dir, operation['staged']), offset, data)
+            return
+
+        staged = f'{self.num_staged}-{os.path.basename(rel_path)}.insert'
+        self.num_staged += 1
+        with open(os.path.join(self.transaction_dir, staged), 'wb') as outfile:
+            outfile.write(data)
+
+        self.operations[rel_path] = {
+            'action' : 'insert',
+            'path' : rel_path,
+            'staged' : staged,
+            'offset' : offset
+        }
+
+    def stage(self, path):
+        """
+        obtain the path to which the new content of path should be written
+        """
+        rel_path = self.relative_path(path)
+        self.materialize(rel_path)
+        operation = self.operations.get(rel_path)
+
+        if operation is not None and operation['action'] == 'write':
+            return os.path.join(self.transaction_dir, operation['staged'])
+
+        staged = f'{self.num_staged}-{os.path.basename(rel_path)}'
+        self.num_staged += 1
+        self.operations.pop(rel_path, None)
+        self.operations[rel_path] = {
+            'action' : 'write',
+            'path' : rel_path,
+            'staged' : staged
+        }
+        return os.path.join(self.transaction_dir, staged)
+
+    def current_path(self, path):
+        """
+        obtain the path from which the current content of path should be read,
+        i.e., the staged version if the file was written in this transaction
+        """
+        rel_path = self.relative_path(path)
+        self.materialize(rel_path)
+        operation = self.operations.get(rel_path)
+
+        if operation is None:
+            return path
+
+        assert operation['action'] == 'write', f'{path} was removed in this transaction.'
+        return os.path.join(self.transaction_dir, operation['staged'])
+
+    def exists(self, path):
+        """
+        determine whether path exists in this transaction
+        """
+        operation = self.operations.get(self.relative_path(path))
+
+        if operation is None:
+            return os.path.exists(path)
+        return operation['action'] != 'remove'
+
+    def remove(self, path):
+        rel_path = self.relative_path(path)
+        operation = self.operations.pop(rel_path, None)
+
+        if operation is not None and operation['action'] in {'write', 'insert'}:
+            os.remove(os.path.join(self.transaction_dir, operation['staged']))
+
+        self.operations[rel_path] = {
+            'action' : 'remove',
+            'path' : rel_path
+        }
+
+    def prepare(self):
+        """
+        write the manifest, which is the commit point of the transaction
+        """
+        for operation in self.operations.values():
+            if operation['action'] in {'write', 'insert'}:
+                fsync_path(os.path.join(self.transaction_dir, operation['staged']))
+
+        tmp_path = f'{self.manifest_path}.tmp'
+        with open(tmp_path, 'w') as outfile:
+            json.dump(list(self.operations.values()), outfile)
+            outfile.flush()
+            os.fsync(outfile.fileno())
+        os.replace(tmp_path, self.manifest_path)
+        fsync_path(self.transaction_dir)
+
+    def commit(self):
+        self.prepare()
+        apply_manifest(transaction_dir=self.transaction_dir,
+                       folder=self.folder)
+        shutil.rmtree(self.transaction_dir)
+
+        if self.verbose >= 2:
+            print(f'committed {len(self.operations)} file operation(s) to {self.folder}')
+
+    def rollback(self):
+        if os.path.exists(self.transaction_dir):
+            shutil.rmtree(self.transaction_dir)
+
+        if self.verbose >= 2:
+            print(f'rolled back {len(self.operations)} file operation(s) for {self.folder}')
+
+
+def apply_manifest(transaction_dir, folder):
+    """
+    apply the operations of a prepared transaction.
+    This is idempotent, i.e., it can be repeated after a crash.
+    """
+    with open(os.path.join(transaction_dir, MANIFEST_BASENAME)) as infile:
+        operations = json.load(infile)
+
+    touched_dirs = set()
+    for operation in operations:
+        target = os.path.join(folder, operation['path'])
+        touched_dirs.add(os.path.dirname(target))
+
+        if operation['action'] == 'write':
+            staged = os.path.join(transaction_dir, operation['staged'])
+            if os.path.exists(staged):
+                os.replace(staged, target)
+        elif operation['action'] == 'insert':
+            with open(os.path.join(transaction_dir, operation['staged']), 'rb') as infile:
+                insert_at(target, operation['offset'], infile.read())
+        elif operation['action'] == 'remove':
+            if os.path.exists(target):
+                os.remove(target)
+        else:
+            raise Exception(f'unknown action in journal: {operation}')
+
+    for touched_dir in touched_dirs:
+        fsync_path(touched_dir)
+
+
+def recover_transaction(transaction_dir, folder, verbose=0):
+    """
+    roll a transaction that was interrupted forward (manifest was written)
+    or back (manifest was not written).
+
+    :rtype: str
+    :return: "rolled forward" | "rolled back" | None (no interrupted transaction)
+    """
+    if not os.path.exists(transaction_dir):
+        return None
+
+    if os.path.exists(os.path.join(transaction_dir, MANIFEST_BASENAME)):
+        apply_manifest(transaction_dir=transaction_dir,
+                       folder=folder)
+        outcome = 'rolled forward'
+    else:
+        outcome = 'rolled back'
+
+    shutil.rmtree(transaction_dir)
+
+    if verbose >= 1:
+        print(f'{outcome} interrupted transaction of the lexicon at {folder}')
+
+    return outcome
+
+
+def recover(folder, verbose=0):
+    """
+    recover the lexicon at folder from an interrupted transaction (see recover_transaction)
+    """
+    journal_dir = os.path.join(folder, JOURNAL_DIR)
+    if not os.path.exists(os.path.join(journal_dir, TRANSACTION_DIR)):
+        return None
+
+    the_transaction = Transaction(folder, verbose=verbose)
+    the_transaction.acquire_lock()
+    try:
+        outcome = recover_transaction(transaction_dir=the_transaction.transaction_dir,
+                                      folder=the_transaction.folder,
+                                      verbose=verbose)
+    finally:
+        the_transaction.release_lock()
+
+    return outcome
+
+
+@contextmanager
+def transaction(folder, enabled=True, verbose=0):
+    """
+    context manager around Transaction.
+    The transaction is committed if the block succeeds and rolled back if it raises.
+
+    :param str folder: the lexicon folder
+    :param bool enabled: if False, None is yielded and files are modified directly
+    """
+    if not enabled:
+        yield None
+        return
+
+    the_transaction = Transaction(folder, verbose=verbose)
+    the_transaction.begin()
+    try:
+        yield the_transaction
+    except BaseException:
+        the_transaction.rollback()
+        raise
+    else:
+        the_transaction.commit()
+    finally:
+        the_transaction.release_lock()
@@ -1,13 +1,37 @@
+import os
 import json
 import warnings
 from datetime import datetime
-from collections import Counter
+from collections import Counter, defaultdict
+from contextlib import contextmanager
 
 from . import validation_utils
 from . import lexicon_utils
 from . import xml_utils
 from . import path_utils
 from . import load_utils
+from . import journal_utils
+from . import snapshot_utils
+
+
+@contextmanager
+def lexicon_writer(your_lexicon_folder, session=None, journaled=True, verbose=0):
+    """
+    yield the object through which the files of the lexicon are updated (the journal argument of xml_utils),
+    i.e., the session if one is provided (see xml_utils.LexiconSession), else a transaction (see journal_utils)
+    """
+    if session is not None:
+        yield session
+    else:
+        with journal_utils.transaction(your_lexicon_folder, enabled=journaled, verbose=verbose) as journal:
+            yield journal
+
+
+def get_cdate(timestamp=None):
+    if timestamp is None:
+        timestamp = datetime.utcnow()
+    return timestamp.strftime("%m/%d/%Y %H:%M:%S UTC %a")
+
 
 def add_lu(your_lexicon_folder,
            fn_en,
@@ -24,109 +48,126 @@ def add_lu(your_lexicon_folder,
            timestamp=None,
            skos_predicate_to_external_references={},
            skos=None,
+           lu_template_dir=None,
+           session=None,
+           journaled=True,
            verbose=0):
+    """
+    Add one LU to your lexicon (see README for an explanation of the parameters).
+
+    :param str lu_template_dir: optional folder in which the LU templates are stored (see xml_utils.get_lu_template)
+    :param session: optional xml_utils.LexiconSession, in which case the files are only written when the session is flushed
+    :param bool journaled: if True, the files of the lexicon are updated in a transaction
+    (see journal_utils), i.e., either all of them are updated or none of them.
+    :rtype: bool
+    :return: True if the LU was added
+    """
     succes = False
 
-    your_fn = load_utils.load(folder=your_lexicon_folder)
+    your_fn = load_utils.load(folder=your_lexicon_folder, merge_luindex_shards=False)
 
     lu_lemma, lu_pos = lexicon_utils.get_lemma_pos_from_lu_name(lu_name=lu_name)
+    lexicon_index = lexicon_utils.get_lexicon_index(your_fn)
+    en_frames = snapshot_utils.get_en_frames(fn_en)
 
     # attribute validation steps
-    validation_utils.validate_lu_type(lu_type)
-    validation_utils.validate_num_lexemes(lexemes, lu_type)
-    validation_utils.validate_lu_pos(lu_pos, pos)
-    validation_utils.validate_lexemes(my_fn=your_fn, lexemes=lexemes, lu_type=lu_type)
-    validation_utils.validate_order_attr(lexemes=lexemes)
-    validation_utils.validate_status(status=status)
-    validation_utils.validate_agent(agent=agent)
-    validation_utils.validate_provenance(provenance=provenance)
-    validation_utils.validate_pos(pos=pos)
-    validation_utils.validate_frame(your_fn=your_fn, frame_name=frame)
-    validation_utils.validate_lexemes_vs_luname(lexemes=lexemes,
-                                                lu_type=lu_type,
-                                                lu_lemma=lu_lemma)
-    skos_namespace = validation_utils.validate_skos(skos_predicate_to_external_references=skos_predicate_to_external_references,
-                                                    skos=skos)
-
-    if incorporated_fe is not None:
-        validation_utils.validate_incorporated_fe(fn_en=fn_en,
-                                                  frame_label=frame,
-                                                  incorporated_fe=incorporated_fe)
-
-    validation_utils.validate_incorporate_fe_lu_and_lexemes(incorporated_fe=incorporated_fe,
-                                                            lexemes=lexemes)
+    skos_namespace = validation_utils.validate_lu(your_fn=your_fn,
+                                                  fn_en=fn_en,
+                                                  lu_lemma=lu_lemma,
+                                                  lu_pos=lu_pos,
+                                                  lexemes=lexemes,
+                                                  status=status,
+                                                  pos=pos,
+                                                  frame=frame,
+                                                  agent=agent,
+                                                  provenance=provenance,
+                                                  lu_type=lu_type,
+                                                  incorporated_fe=incorporated_fe,
+                                                  skos_predicate_to_external_references=skos_predicate_to_external_references,
+                                                  skos=skos,
+                                                  lu_ids=lexicon_index['lu_id_to_info'],
+                                                  en_frames=en_frames)
 
     # lexicon validation steps
-    lemma_pos_in_lexicon = validation_utils.frames_with_lemma_pos_in_lexicon(your_fn=your_fn,
-                                                                             lemma=lu_lemma,
-                                                                             pos=pos)
+    lemma_pos = f'{lu_lemma}.{pos.lower()}'
 
-    if frame in lemma_pos_in_lexicon:
+    if (lemma_pos, frame) in lexicon_index['lemma_pos_frame_to_lu_ids']:
         warnings.warn(f'{lu_lemma} {pos} is already part of {frame}. Please inspect.')
         return succes
 
-    frame_obj = fn_en.frame_by_name(frame)
-    frame_id = frame_obj.ID
+    frame_id = en_frames[frame]['ID']
 
     # update XML files
 
     # get relevant paths
     paths_your_fn = path_utils.get_relevant_paths(your_fn.root, check_if_exists=False)
 
-    lu_id = lexicon_utils.get_next_lu_id()
-    lemma_id = lexicon_utils.get_lemma_id(your_fn=your_fn,
-                                          lemma=lu_lemma,
-                                          pos=pos)
-
-    if timestamp is None:
-        cdate = datetime.utcnow().strftime("%m/%d/%Y %H:%M:%S UTC %a")
-    else:
-        cdate = timestamp.strftime("%m/%d/%Y %H:%M:%S UTC %a")
-
-    # create lu/LU_ID.xml file
-    xml_utils.create_lu_xml_file(fn_en,
-                                 your_fn,
-                                 frame,
-                                 lu_id,
-                                 status,
-                                 lexemes,
-                                 lu_lemma,
-                                 pos,
-                                 definition,
-                                 lu_type,
-                                 incorporated_fe=incorporated_fe,
-                                 skos_predicate_to_external_references=skos_predicate_to_external_references,
-                                 skos_namespace=skos_namespace)
-
-    # add lu element to luIndex.xml
-    xml_utils.add_lu_el_to_luindex(path_lu_index=paths_your_fn['luIndex.xml'],
-                                   frame_id=frame_id,
-                                   frame_name=frame,
-                                   status=status,
-                                   lemma=lu_lemma,
-                                   pos=pos,
-                                   lu_id=lu_id,
-                                   lu_type=lu_type,
-                                   skos_predicate_to_external_references=skos_predicate_to_external_references,
-                                   skos_namespace=skos_namespace)
-
-    # add lu to frame/FRAME_NAME.xml file
-    xml_utils.add_lu_to_frame_xml_file(your_fn,
-                                       frame,
-                                       status,
-                                       lu_lemma,
-                                       lemma_id,
-                                       pos,
-                                       lu_id,
-                                       lexemes,
-                                       agent,
-                                       provenance,
-                                       cdate,
-                                       definition,
-                                       lu_type,
-                                       incorporated_fe=incorporated_fe,
+    lu_id = lexicon_utils.get_next_lu_id(your_lexicon_folder=your_lexicon_folder)
+    lemma_id = lexicon_utils.get_lemma_id_from_index(lexicon_index, lemma_pos)
+
+    cdate = get_cdate(timestamp)
+
+    with lexicon_writer(your_lexicon_folder, session=session, journaled=journaled, verbose=verbose) as journal:
+        # create lu/LU_ID.xml file
+        xml_utils.create_lu_xml_file(fn_en,
+                                     your_fn,
+                                     frame,
+                                     lu_id,
+                                     status,
+                                     lexemes,
+                                     lu_lemma,
+                                     pos,
+                                     definition,
+                                     lu_type,
+                                     incorporated_fe=incorporated_fe,
+                                     skos_predicate_to_external_references=skos_predicate_to_external_references,
+                                     skos_namespace=skos_namespace,
+                                     template_dir=lu_template_dir,
+                                     en_frames=en_frames,
+                                     journal=journal)
+
+        # add lu element to luIndex.xml
+        xml_utils.add_lu_el_to_luindex(path_lu_index=paths_your_fn['luIndex.xml'],
+                                       frame_id=frame_id,
+                                       frame_name=frame,
+                                       status=status,
+                                       lemma=lu_lemma,
+                                       pos=pos,
+                                       lu_id=lu_id,
+                                       lu_type=lu_type,
                                        skos_predicate_to_external_references=skos_predicate_to_external_references,
-                                       skos_namespace=skos_namespace)
+                                       skos_namespace=skos_namespace,
+                                       journal=journal)
+
+        # add lu to frame/FRAME_NAME.xml file
+        xml_utils.add_lu_to_frame_xml_file(your_fn,
+                                           frame,
+                                           status,
+                                           lu_lemma,
+                                           lemma_id,
+                                           pos,
+                                           lu_id,
+                                           lexemes,
+                                           agent,
+                                           provenance,
+                                           cdate,
+                                           definition,
+                                           lu_type,
+                                           incorporated_fe=incorporated_fe,
+                                           skos_predicate_to_external_references=skos_predicate_to_external_references,
+                                           skos_namespace=skos_namespace,
+                                           journal=journal)
+
+    lexicon_utils.add_lu_to_lexicon_index(lexicon_index,
+                                          lu_id=lu_id,
+                                          lemma_pos=lemma_pos,
+                                          lemma_id=lemma_id,
+                                          frame=frame,
+                                          agent=agent,
+                                          provenance=provenance,
+                                          referenced_lu_ids=lexicon_utils.get_referenced_lu_ids(lexemes),
+                                          status=status)
+    lexicon_utils.update_lexicon_index_signature(lexicon_index)
 
     if verbose >= 1:
         print(f'added lu id {lu_id}: {lu_lemma}.{pos} -> {frame}')
@@ -135,23 +176,224 @@ def add_lu(your_lexicon_folder,
     return succes
 
 
+def add_lus(your_lexicon_folder,
+            fn_en,
+            lus,
+            skos=None,
+            lu_template_dir=None,
+            session=None,
+            journaled=True,
+            num_processes=1,
+            verbose=0):
+    """
+    Add a batch of LUs to your lexicon.
+    All entries are validated first (see validation_utils.validate_lus). The valid entries are then grouped by frame,
+    such that luIndex.xml and each frame/FRAME_NAME.xml file are parsed and written only once.
+
+    :param your_lexicon_folder:
+    :param fn_en:
+    :param list lus: list of dictionaries with the keyword arguments of add_lu, i.e.,
+    lu_name, lexemes, definition, status, pos, frame, agent, provenance, and optionally
+    lu_type, incorporated_fe, timestamp, skos_predicate_to_external_references
+    :param skos: use FrameNetNLTK.skos (needed if LUs contain external references)
+    :param str lu_template_dir: optional folder in which the LU templates are stored (see xml_utils.get_lu_template)
+    :param session: optional xml_utils.LexiconSession, in which case the files are only written when the session is flushed
+    :param bool journaled: if True, all files are updated in one transaction (see journal_utils)
+    :param int num_processes: number of processes used to validate the entries
+    :param verbose:
+
+    :rtype: list
+    :return: one dictionary per entry (in the order of lus) with the keys:
+    -lu_name: the lu_name of the entry
+    -frame: the frame of the entry
+    -status: "added" or "failed to add"
+    -lu_id: the lu identifier if the LU was added, else None
+    -reason: why the LU was not added (None if it was added), i.e., all failed validation steps
+    """
+    your_fn = load_utils.load(folder=your_lexicon_folder, merge_luindex_shards=False)
+    paths_your_fn = path_utils.get_relevant_paths(your_fn.root, check_if_exists=False)
+    lexicon_index = lexicon_utils.get_lexicon_index(your_fn)
+    en_frames = snapshot_utils.get_en_frames(fn_en)
+
+    report = []
+    to_add = []
+    lemma_pos_frame_in_batch = set()
+
+    # validation steps
+    validation_context = validation_utils.create_validation_context(your_fn=your_fn,
+                                                                    fn_en=fn_en,
+                                                                    lus=lus,
+                                                                    skos=skos,
+                                                                    lu_ids=lexicon_index['lu_id_to_info'],
+                                                                    en_frames=en_frames)
+    skos_namespace = validation_context['skos_namespace_and_predicates'][0]
+    validation_report = validation_utils.validate_lus(your_fn=your_fn,
+                                                      fn_en=fn_en,
+                                                      lus=lus,
+                                                      context=validation_context,
+                                                      num_processes=num_processes)
+
+    for lu, validation in zip(lus, validation_report):
+        result = {
+            'lu_name' : lu.get('lu_name'),
+            'frame' : lu.get('frame'),
+            'status' : 'failed to add',
+            'lu_id' : None,
+            'reason' : None
+        }
+        report.append(result)
+
+        if not validation['valid']:
+            result['reason'] = ' | '.join(validation['errors'])
+            continue
+
+        lu_lemma, lu_pos = lexicon_utils.get_lemma_pos_from_lu_name(lu_name=lu['lu_name'])
+
+        lemma_pos_frame = (f'{lu_lemma}.{lu["pos"].lower()}', lu['frame'])
+        if any([lemma_pos_frame in lexicon_index['lemma_pos_frame_to_lu_ids'],
+                lemma_pos_frame in lemma_pos_frame_in_batch]):
+            result['reason'] = f'{lu_lemma} {lu["pos"]} is already part of {lu["frame"]}.'
+            continue
+
+        lemma_pos_frame_in_batch.add(lemma_pos_frame)
+        to_add.append((result, lu, lu_lemma, skos_namespace))
+
+    # assign identifiers
+    lu_ids = lexicon_utils.reserve_lu_ids(your_lexicon_folder=your_lexicon_folder,
+                                          num_lu_ids=len(to_add))
+    new_lemma_pos_to_lemma_id = {}
+    max_lemma_id = lexicon_index['max_lemma_id']
+    added = []
+
+    luindex_els = []
+    frame_to_lexunit_els = defaultdict(list)
+    frame_to_frame_id = {}
+    skos_namespace_of_batch = None
+
+    with lexicon_writer(your_lexicon_folder, session=session, journaled=journaled, verbose=verbose) as journal:
+        for lu_id, (result, lu, lu_lemma, skos_namespace) in zip(lu_ids, to_add):
+            frame = lu['frame']
+            pos = lu['pos']
+            lu_type = lu.get('lu_type', 'singleton')
+            incorporated_fe = lu.get('incorporated_fe')
+            skos_predicate_to_external_references = lu.get('skos_predicate_to_external_references', {})
+
+            if skos_namespace is not None:
+                skos_namespace_of_batch = skos_namespace
+
+            if frame not in frame_to_frame_id:
+                frame_to_frame_id[frame] = en_frames[frame]['ID']
+
+            lemma_pos = f'{lu_lemma}.{pos.lower()}'
+            lemma_id = lexicon_index['lemma_pos_to_lemma_id'].get(lemma_pos,
+                                                                  new_lemma_pos_to_lemma_id.get(lemma_pos))
+            if lemma_id is None:
+                max_lemma_id += 1
+                lemma_id = new_lemma_pos_to_lemma_id[lemma_pos] = max_lemma_id
+
+            # create lu/LU_ID.xml file
+            xml_utils.create_lu_xml_file(fn_en,
+                                         your_fn,
+                                         frame,
+                                         lu_id,
+                                         lu['status'],
+                                         lu['lexemes'],
+                                         lu_lemma,
+                                         pos,
+                                         lu['definition'],
+                                         lu_type,
+                                         incorporated_fe=incorporated_fe,
+                                         skos_predicate_to_external_references=skos_predicate_to_external_references,
+                                         skos_namespace=skos_namespace,
+                                         template_dir=lu_template_dir,
+                                         en_frames=en_frames,
+                                         journal=journal)
+
+            luindex_els.append(xml_utils.create_luindex_lu_el(frame_id=frame_to_frame_id[frame],
+                                                              frame_name=frame,
+                                                              status=lu['status'],
+                                                              lemma=lu_lemma,
+                                                              pos=pos,
+                                                              lu_id=lu_id,
+                                                              lu_type=lu_type,
+                                                              skos_predicate_to_external_references=skos_predicate_to_external_references,
+                                                              skos_namespace=skos_namespace))
+
+            frame_to_lexunit_els[frame].append(xml_utils.create_lexunit_el(status=lu['status'],
+                                                                           lemma=lu_lemma,
+                                                                           lemma_id=lemma_id,
+                                                                           pos=pos,
+                                                                           lu_id=lu_id,
+                                                                           lexemes=lu['lexemes'],
+                                                                           agent=lu['agent'],
+                                                                           provenance=lu['provenance'],
+                                                                           cdate=get_cdate(lu.get('timestamp')),
+                                                                           definition=lu['definition'],
+                                                                           lu_type=lu_type,
+                                                                           incorporated_fe=incorporated_fe,
+                                                                           skos_predicate_to_external_references=skos_predicate_to_external_references,
+                                                                           skos_namespace=skos_namespace))
+
+            result['status'] = 'added'
+            result['lu_id'] = lu_id
+            added.append((lu_id, lemma_pos, lemma_id, frame, lu))
+
+            if verbose >= 2:
+                print(f'added lu id {lu_id}: {lu_lemma}.{pos} -> {frame}')
+
+        # update luIndex.xml and frame/FRAME_NAME.xml files once
+        if luindex_els:
+            xml_utils.add_lu_els_to_luindex(path_lu_index=paths_your_fn['luIndex.xml'],
+                                            lu_els=luindex_els,
+                                            skos_namespace=skos_namespace_of_batch,
+                                            journal=journal)
+
+        for frame, lexunit_els in frame_to_lexunit_els.items():
+            xml_utils.add_lexunit_els_to_frame_xml_file(your_fn=your_fn,
+                                                        frame=frame,
+                                                        lexunit_els=lexunit_els,
+                                                        skos_namespace=skos_namespace_of_batch,
+                                                        journal=journal)
+
+    for lu_id, lemma_pos, lemma_id, frame, lu in added:
+        lexicon_utils.add_lu_to_lexicon_index(lexicon_index,
+                                              lu_id=lu_id,
+                                              lemma_pos=lemma_pos,
+                                              lemma_id=lemma_id,
+                                              frame=frame,
+                                              agent=lu['agent'],
+                                              provenance=lu['provenance'],
+                                              referenced_lu_ids=lexicon_utils.get_referenced_lu_ids(lu['lexemes']),
+                                              status=lu['status'])
+    lexicon_utils.update_lexicon_index_signature(lexicon_index)
+
+    if verbose:
+        print(f'{len(report)} LUs were provided to be added.')
+        print(f'the process resulted in: {Counter([result["status"] for result in report])}')
+
+    return report
+
+
 def add_lus_from_json(your_lexicon_folder,
                       fn_en,
                       json_path,
                       skos,
+                      journaled=True,
+                      num_processes=1,
                       verbose=0):
     """
+    Add the LUs from a JSON file (see res/json/lus.json for an example) using add_lus.
 
     :param verbose:
     :param your_lexicon_folder:
     :param fn_en:
     :param json_path:
-    :return:
+    :return: the report of add_lus
     """
-    json_lus = json.load(open(json_path))
-
-    status = []
+    with open(json_path) as infile:
+        json_lus = json.load(infile)
 
+    lus = []
     for lu in json_lus['lus']:
 
         the_timestamp = lu['timestamp']
@@ -159,70 +401,140 @@ def add_lus_from_json(your_lexicon_folder,
             year, month, day = lu['timestamp']
             the_timestamp = datetime(year=year, month=month, day=day)
 
-        succes = add_lu(your_lexicon_folder,
-                        fn_en,
-                        lu_name=lu['lu_name'],
-                        lexemes=lu['lexemes'],
-                        definition=lu['definition'],
-                        status=lu['status'],
-                        pos=lu['POS'],
-                        frame=lu['frame'],
-                        agent=lu['agent'],
-                        provenance=lu['provenance'],
-                        lu_type=lu['lu_type'],
-                        incorporated_fe=lu['incorporated_fe'],
-                        timestamp=the_timestamp,
-                        skos=skos,
-                        skos_predicate_to_external_references=lu['skos_predicate_to_external_references'],
-                        verbose=verbose)
-
-        if succes:
-            status.append('added')
-        else:
-            status.append('failed to add')
+        lus.append({
+            'lu_name' : lu['lu_name'],
+            'lexemes' : lu['lexemes'],
+            'definition' : lu['definition'],
+            'status' : lu['status'],
+            'pos' : lu['POS'],
+            'frame' : lu['frame'],
+            'agent' : lu['agent'],
+            'provenance' : lu['provenance'],
+            'lu_type' : lu['lu_type'],
+            'incorporated_fe' : lu['incorporated_fe'],
+            'timestamp' : the_timestamp,
+            'skos_predicate_to_external_references' : lu['skos_predicate_to_external_references'],
+        })
+
+    report = add_lus(your_lexicon_folder=your_lexicon_folder,
+                     fn_en=fn_en,
+                     lus=lus,
+                     skos=skos,
+                     journaled=journaled,
+                     num_processes=num_processes,
+                     verbose=verbose)
+
+    return report
+
+
+def remove_lus(your_lexicon_folder,
+               lu_ids=None,
+               provenance=None,
+               agent=None,
+               session=None,
+               journaled=True,
+               verbose=0):
+    """
+    Remove a batch of LUs from your lexicon, either by providing their identifiers
+    or by selecting them, e.g., all LUs with a provenance (see lexicon_utils.select_lu_ids).
+    The frames of the LUs are obtained from the lexicon index, such that
+    luIndex.xml and each affected frame/FRAME_NAME.xml file are parsed and written only once.
+
+    :param your_lexicon_folder:
+    :param lu_ids: the integer lu identifiers to remove
+    :param str provenance: remove all LUs with this provenance
+    :param str agent: remove all LUs created by this agent
+    :param session: optional xml_utils.LexiconSession, in which case the files are only written when the session is flushed
+    :param bool journaled: if True, all files are updated in one transaction (see journal_utils)
+    :param verbose:
+
+    :rtype: list
+    :return: the removed lu identifiers (sorted)
+    """
+    selectors = {'provenance' : provenance, 'agent' : agent}
+    use_selectors = any(value is not None for value in selectors.values())
+    assert (lu_ids is None) == use_selectors, \
+        f'please provide either lu_ids or at least one of the selectors {list(selectors)}.'
+
+    your_fn = load_utils.load(folder=your_lexicon_folder, merge_luindex_shards=False)
+    paths_your_fn = path_utils.get_relevant_paths(your_fn.root, check_if_exists=False)
+    lexicon_index = lexicon_utils.get_lexicon_index(your_fn)
+
+    if use_selectors:
+        lu_ids = lexicon_utils.select_lu_ids(your_fn, **selectors)
+
+    lu_ids = set(lu_ids)
+    for lu_id in lu_ids:
+        assert type(lu_id) == int, f'the lu id has to be an integer, you provided {type(lu_id)}'
+        assert lu_id in lexicon_index['lu_id_to_info'], f'lu id {lu_id} is not part of the lexicon.'
+
+    # inspect that no endocentric compound that is not removed is referring to them in a lexeme
+    source_lu_ids = set()
+    for lu_id in lu_ids:
+        source_lu_ids.update(lexicon_index['lu_id_to_referring_lu_ids'].get(lu_id, set()) - lu_ids)
+
+    if source_lu_ids:
+        assert False, f'LUs {source_lu_ids} are referring to the LUs that you want to remove in a lexeme.'
+
+    frame_to_lu_ids = defaultdict(set)
+    for lu_id in lu_ids:
+        frame_to_lu_ids[lexicon_index['lu_id_to_info'][lu_id]['frame']].add(lu_id)
+
+    if lu_ids:
+        with lexicon_writer(your_lexicon_folder, session=session, journaled=journaled, verbose=verbose) as journal:
+            # remove lus from frame/FRAME_NAME.xml files
+            for frame_name, lu_ids_of_frame in frame_to_lu_ids.items():
+                xml_utils.remove_lexunit_els_from_frame_xml(your_fn=your_fn,
+                                                            frame_name=frame_name,
+                                                            lu_ids=lu_ids_of_frame,
+                                                            journal=journal)
+
+            # remove lu/LU_ID.xml files
+            for lu_id in sorted(lu_ids):
+                xml_utils.remove_lu_xml_file(your_fn=your_fn,
+                                             lu_id=lu_id,
+                                             journal=journal)
+
+            # remove lu elements from luIndex.xml
+            lu_id_to_frame_and_lu_name = {lu_id: (lexicon_index['lu_id_to_info'][lu_id]['frame'],
+                                                  lexicon_index['lu_id_to_info'][lu_id]['lemma_pos'])
+                                          for lu_id in lu_ids}
+            xml_utils.remove_lu_els_from_luindex(path_lu_index=paths_your_fn['luIndex.xml'],
+                                                 lu_ids=lu_ids,
+                                                 lu_id_to_frame_and_lu_name=lu_id_to_frame_and_lu_name,
+                                                 journal=journal)
+
+        for lu_id in lu_ids:
+            lexicon_utils.remove_lu_from_lexicon_index(lexicon_index, lu_id)
+        lexicon_utils.update_lexicon_index_signature(lexicon_index)
 
     if verbose:
-        print(f'{len(status)} LUs were provided to be added.')
-        print(f'the process resulted in: {Counter(status)}')
+        print(f'removed {len(lu_ids)} LU(s) from {len(frame_to_lu_ids)} frame(s) of the lexicon.')
+
+    return sorted(lu_ids)
 
 
 def remove_lu(your_lexicon_folder,
               lu_id,
+              session=None,
+              journaled=True,
               verbose=0):
     """
 
     :param your_lexicon_folder:
     :param int lu_id: the integer of the lu identifier
+    :param session: optional xml_utils.LexiconSession (see remove_lus)
+    :param bool journaled: if True, the files of the lexicon are updated in a transaction (see journal_utils)
     :param verbose:
     :return:
     """
     assert type(lu_id) == int, f'the lu id has to be an integer, you provided {type(lu_id)}'
 
-    your_fn = load_utils.load(folder=your_lexicon_folder)
-    paths_your_fn = path_utils.get_relevant_paths(your_fn.root, check_if_exists=False)
-
-    # inspect that no endocentric compound is referring to it in a lexeme
-    source_lu_ids = set()
-    for lu in your_fn.lus():
-        for lexeme in lu.lexemes:
-            if 'lu_id' in lexeme:
-                if lexeme['lu_id'] == lu_id:
-                    source_lu_ids.add(lexeme['lu_id'])
-
-    if source_lu_ids:
-        assert False, f'LUs {source_lu_ids} are referring to the LU that you want to remove in a lexeme.'
-
-    # remove lu from frame/FRAME_NAME.xml file
-    xml_utils.remove_lexunit_el_from_frame_xml(your_fn,
-                                               lu_id)
-
-    # remove lu/LU_ID.xml file
-    xml_utils.remove_lu_xml_file(your_fn=your_fn,
-                                 lu_id=lu_id)
-
-    # remove lu element from luIndex.xml
-    xml_utils.remove_lu_el_from_luindex(path_lu_index=paths_your_fn['luIndex.xml'],
-                                        lu_id=lu_id)
+    remove_lus(your_lexicon_folder=your_lexicon_folder,
+               lu_ids=[lu_id],
+               session=session,
+               journaled=journaled,
+               verbose=verbose)
 
     if verbose:
         print(f'removed lu id {lu_id} from the lexicon.')
@@ -231,6 +543,219 @@ def remove_lu(your_lexicon_folder,
     return succes
 
 
+def get_external_references(attrib):
+    """
+    obtain the external references (see add_lu) from the attributes of an element
 
+    :rtype: tuple
+    :return: (the skos namespace or None, skos predicate -> list of external references)
+    """
+    skos_namespace = None
+    skos_predicate_to_external_references = {}
+    for attr_name, value in attrib.items():
+        if not attr_name.startswith('{') or attr_name.startswith('{http://www.w3.org/2001/XMLSchema-instance}'):
+            continue
+        skos_namespace, skos_predicate = attr_name[1:].split('}')
+        skos_predicate_to_external_references[skos_predicate] = value.split('||')
+
+    return skos_namespace, skos_predicate_to_external_references
+
+
+def repair_lexicon(your_lexicon_folder,
+                   num_processes=None,
+                   agent='unknown',
+                   provenance='repair',
+                   journaled=True,
+                   verbose=0):
+    """
+    Regenerate luIndex.xml (or its shards) and the lexUnit elements of the frame/FRAME_NAME.xml files
+    from the lu/LU_ID.xml files, which are read in parallel (see lexicon_utils.collect_lexicon_records).
+    Existing luIndex/lu and frame/lexUnit elements are reused (and moved to the frame of the LU file),
+    such that their metadata is preserved. Missing elements are created from the LU files.
+    Only the frame files of which the lexUnit elements do not match the LU files are rewritten.
+
+    :param str your_lexicon_folder: the folder of your lexicon
+    :param int num_processes: the number of processes (default: number of CPUs, 1: no process pool)
+    :param str agent: the agent of recreated lexUnit elements (LU files do not contain it)
+    :param str provenance: the provenance of recreated lexUnit elements (LU files do not contain it)
+    :param bool journaled: if True, all files are updated in one transaction (see journal_utils)
+
+    :rtype: dict
+    :return: a dictionary with the keys:
+    -report: the consistency report before the repair (see lexicon_utils.check_lexicon_consistency)
+    -frames: the frames of which the lexUnit elements were regenerated
+    -luIndex: True if luIndex.xml (or its shards) was regenerated
+    """
+    validation_utils.validate_agent(agent)
+    validation_utils.validate_provenance(provenance)
+
+    journal_utils.recover(your_lexicon_folder, verbose=verbose)
+    paths_your_fn = path_utils.get_relevant_paths(your_lexicon_folder, check_if_exists=False)
+
+    source_to_records = lexicon_utils.collect_lexicon_records(your_lexicon_folder,
+                                                              num_processes=num_processes,
+                                                              verbose=verbose)
+    report = lexicon_utils.check_lexicon_consistency(your_lexicon_folder,
+                                                     source_to_records=source_to_records,
+                                                     verbose=verbose)
+
+    # the LU files are the source of truth, the file lu/luLU_ID.xml is preferred for duplicate identifiers
+    lu_id_to_record = {}
+    for record in sorted(source_to_records['lu'], key=lambda record: record['path']):
+        if all([record['lu_id'] in lu_id_to_record,
+                os.path.basename(record['path']) != f'lu{record["lu_id"]}.xml']):
+            continue
+        lu_id_to_record[record['lu_id']] = record
+
+    skos_namespace = None
+    for record in lu_id_to_record.values():
+        skos_namespace_of_lu, _ = get_external_references(record['attrib'])
+        if skos_namespace_of_lu is not None:
+            skos_namespace = skos_namespace_of_lu
+            break
+
+    frame_to_lu_ids = defaultdict(list)
+    for lu_id, record in lu_id_to_record.items():
+        frame_to_lu_ids[record['frame']].append(lu_id)
+
+    frame_to_found_lu_ids = defaultdict(list)
+    for record in source_to_records['frame']:
+        frame_to_found_lu_ids[record['frame']].append(record['lu_id'])
+
+    frames_to_rewrite = set()
+    for frame in set(frame_to_lu_ids) | set(frame_to_found_lu_ids):
+        if sorted(frame_to_lu_ids[frame]) != sorted(frame_to_found_lu_ids[frame]):
+            frame_path = os.path.join(paths_your_fn['frame_dir'], f'{frame}.xml')
+            if not os.path.exists(frame_path):
+                warnings.warn(f'{frame_path} does not exist. Not able to repair the lexUnit elements of frame {frame}.')
+                continue
+            frames_to_rewrite.add(frame)
+
+    expected_lu_els = sorted((lu_id, record['frame'], record['name'])
+                             for lu_id, record in lu_id_to_record.items())
+    found_lu_els = sorted((record['lu_id'], record['frame'], record['name'])
+                          for record in source_to_records['luIndex'])
+    rewrite_luindex = expected_lu_els != found_lu_els
+
+    lexicon_index = lexicon_utils.build_lexicon_index(your_lexicon_folder)
+    new_lemma_pos_to_lemma_id = {}
+    max_lemma_id = lexicon_index['max_lemma_id']
+    cdate = get_cdate()
+
+    with lexicon_writer(your_lexicon_folder, journaled=journaled, verbose=verbose) as journal:
+        # frame/FRAME_NAME.xml files
+        frame_to_doc = {}
+        lu_id_to_lexunit_el = {}
+        for frame in sorted(frames_to_rewrite):
+            doc = xml_utils.load_doc(os.path.join(paths_your_fn['frame_dir'], f'{frame}.xml'), journal=journal)
+            for lexunit_el in doc.getroot().findall('{http://framenet.icsi.berkeley.edu}lexUnit'):
+                lu_id_to_lexunit_el.setdefault(int(lexunit_el.get('ID')), lexunit_el)
+                lexunit_el.getparent().remove(lexunit_el)
+            frame_to_doc[frame] = doc
+
+        for frame, doc in sorted(frame_to_doc.items()):
+            doc, root = xml_utils.add_skos_namespace(old_root=doc.getroot(),
+                                                     skos_namespace=skos_namespace)
+
+            for lu_id in sorted(frame_to_lu_ids[frame]):
+                record = lu_id_to_record[lu_id]
+                lu_lemma, lu_pos = lexicon_utils.get_lemma_pos_from_lu_name(lu_name=record['name'])
+
+                lexunit_el = lu_id_to_lexunit_el.get(lu_id)
+                if lexunit_el is None:
+                    lemma_id = lexicon_index['lemma_pos_to_lemma_id'].get(record['name'],
+                                                                          new_lemma_pos_to_lemma_id.get(record['name']))
+                    if lemma_id is None:
+                        max_lemma_id += 1
+                        lemma_id = new_lemma_pos_to_lemma_id[record['name']] = max_lemma_id
+
+                    skos_namespace_of_lu, skos_predicate_to_external_references = get_external_references(record['attrib'])
+                    lexunit_el = xml_utils.create_lexunit_el(status=record['attrib'].get('status'),
+                                                             lemma=lu_lemma,
+                                                             lemma_id=lemma_id,
+                                                             pos=record['attrib'].get('POS'),
+                                                             lu_id=lu_id,
+                                                             lexemes=record['lexemes'],
+                                                             agent=agent,
+                                                             provenance=provenance,
+                                                             cdate=cdate,
+                                                             definition=record['definition'],
+                                                             lu_type=record['attrib'].get('lu_type', 'singleton'),
+                                                             incorporated_fe=record['attrib'].get('incorporatedFE'),
+                                                             skos_predicate_to_external_references=skos_predicate_to_external_references,
+                                                             skos_namespace=skos_namespace_of_lu)
+                else:
+                    for attr_name in ['name', 'POS', 'status']:
+                        lexunit_el.set(attr_name, record['attrib'].get(attr_name))
+                root.append(lexunit_el)
+
+            xml_utils.save_doc(doc,
+                               os.path.join(paths_your_fn['frame_dir'], f'{frame}.xml'),
+                               journal=journal)
+
+        # luIndex.xml or its shards
+        layout = lexicon_utils.get_luindex_shard_layout(your_lexicon_folder)
+        if rewrite_luindex:
+            lu_id_to_lu_el = {}
+            if layout is None:
+                luindex_doc = xml_utils.load_doc(paths_your_fn['luIndex.xml'], journal=journal)
+                luindex_docs = [luindex_doc]
+            else:
+                luindex_docs = [xml_utils.load_doc(shard_path, journal=journal)
+                                for shard_path in lexicon_utils.get_luindex_shard_paths(your_lexicon_folder)]
+
+            for doc in luindex_docs:
+                for lu_el in doc.getroot().findall('{http://framenet.icsi.berkeley.edu}lu'):
+                    lu_id_to_lu_el.setdefault(int(lu_el.get('ID')), lu_el)
+                    lu_el.getparent().remove(lu_el)
+
+            lu_els = []
+            for lu_id, record in sorted(lu_id_to_record.items()):
+                lu_el = lu_id_to_lu_el.get(lu_id)
+                if lu_el is None:
+                    lu_lemma, lu_pos = lexicon_utils.get_lemma_pos_from_lu_name(lu_name=record['name'])
+                    skos_namespace_of_lu, skos_predicate_to_external_references = get_external_references(record['attrib'])
+                    lu_el = xml_utils.create_luindex_lu_el(frame_id=record['attrib'].get('frameID'),
+                                                           frame_name=record['frame'],
+                                                           status=record['attrib'].get('status'),
+                                                           lemma=lu_lemma,
+                                                           pos=record['attrib'].get('POS'),
+                                                           lu_id=lu_id,
+                                                           lu_type=record['attrib'].get('lu_type', 'singleton'),
+                                                           skos_predicate_to_external_references=skos_predicate_to_external_references,
+                                                           skos_namespace=skos_namespace_of_lu)
+                else:
+                    lu_el.set('frameName', record['frame'])
+                    lu_el.set('frameID', record['attrib'].get('frameID'))
+                    lu_el.set('name', record['name'])
+                lu_els.append(lu_el)
+
+            if layout is None:
+                luindex_doc, luindex_root = xml_utils.add_skos_namespace(old_root=luindex_doc.getroot(),
+                                                                         skos_namespace=skos_namespace)
+                for lu_el in lu_els:
+                    luindex_root.append(lu_el)
+                xml_utils.save_doc(luindex_doc, paths_your_fn['luIndex.xml'], journal=journal)
+            else:
+                for shard_path in lexicon_utils.get_luindex_shard_paths(your_lexicon_folder):
+                    xml_utils.remove_file(shard_path, journal=journal)
+                xml_utils.add_lu_els_to_luindex(path_lu_index=paths_your_fn['luIndex.xml'],
+                                                lu_els=lu_els,
+                                                skos_namespace=skos_namespace,
+                                                append_mode=False,
+                                                journal=journal)
+
+    if rewrite_luindex and layout is not None:
+        xml_utils.merge_luindex_shards(your_lexicon_folder, verbose=verbose)
+
+    lexicon_utils.LEXICON_INDEXES.pop(os.path.realpath(your_lexicon_folder), None)
 
-
+    if verbose:
+        print(f'repaired the lexicon at {your_lexicon_folder}: regenerated the lexUnit elements of '
+              f'{len(frame_to_doc)} frame(s), regenerated luIndex: {rewrite_luindex}')
+
+    return {
+        'report' : report,
+        'frames' : sorted(frame_to_doc),
+        'luIndex' : rewrite_luindex
+    }
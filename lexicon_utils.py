@@ -1,15 +1,475 @@
+import os
+import re
+import json
 import time
+import fcntl
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from contextlib import ExitStack
+from multiprocessing import Pool
+
+try:
+    from .path_utils import get_file_signature
+except ImportError: # imported as a top-level module, e.g., by the tests
+    from path_utils import get_file_signature
+
+
+LU_ID_ALLOCATOR_BASENAME = '.lu_ids.json'
+LU_ID_LOCK_BASENAME = '.lu_ids.lock'
+FN_NAMESPACE = 'http://framenet.icsi.berkeley.edu'
+
+# optional sharded layout of luIndex.xml (see xml_utils.shard_luindex)
+LUINDEX_SHARD_DIR = 'luIndex_shards'
+LUINDEX_SHARD_LAYOUT_BASENAME = 'layout.json'
+LUINDEX_SHARD_BASE_BASENAME = 'base.xml'
+LUINDEX_SHARD_MERGE_BASENAME = 'merged.json'
+SHARD_BY = {'frame', 'lemma_initial'}
+
+# lexicon root -> lexicon index (see get_lexicon_index)
+LEXICON_INDEXES = {}
+
+# the statuses of the LUs that NLTK's FramenetCorpusReader leaves out, e.g., of lu_ids_and_names and lus
+# (see its attribute _bad_statuses), which are hence not part of the lexicon index either
+BAD_STATUSES = {'Problem'}
+
+# the sources of a lexicon that describe its LUs (see check_lexicon_consistency)
+LEXICON_SOURCES = ['lu', 'frame', 'luIndex']
+LEXICON_FILES_PER_TASK = 500
+
+
+def get_next_lu_id(your_lexicon_folder=None):
+    """
+    generate a new lu identifier.
+    If your_lexicon_folder is provided, the identifier is obtained from the
+    persistent allocator of the lexicon (see reserve_lu_ids), which guarantees that it is unique.
+    Else, the current timestamp in milliseconds is returned.
+    """
+    if your_lexicon_folder is not None:
+        return reserve_lu_ids(your_lexicon_folder, num_lu_ids=1)[0]
 
-def get_next_lu_id():
     milliseconds = int(round(time.time() * 1000))
     return milliseconds
 
 
+def get_max_lu_id_on_disk(your_lexicon_folder):
+    """
+    highest identifier of the lu/luLU_ID.xml files of a lexicon (0 if there are none)
+    """
+    lu_dir = os.path.join(your_lexicon_folder, 'lu')
+
+    maximum = 0
+    if os.path.isdir(lu_dir):
+        for basename in os.listdir(lu_dir):
+            match = re.fullmatch(r'lu(\d+)\.xml', basename)
+            if match:
+                maximum = max(maximum, int(match.group(1)))
+
+    return maximum
+
+
+def reserve_lu_ids(your_lexicon_folder, num_lu_ids):
+    """
+    reserve a block of num_lu_ids consecutive lu identifiers.
+    The allocator is stored in the lexicon folder (LEXICON/.lu_ids.json) and
+    protected by a file lock, such that parallel processes never obtain the same identifier.
+    The identifiers are compatible with the timestamp-style identifiers of get_next_lu_id,
+    i.e., a block never starts before the current timestamp in milliseconds
+    nor before the highest identifier that is already in use.
+
+    :rtype: list
+    :return: the reserved lu identifiers
+    """
+    assert num_lu_ids >= 0, f'the number of lu ids should be positive, you provided {num_lu_ids}'
+
+    allocator_path = os.path.join(your_lexicon_folder, LU_ID_ALLOCATOR_BASENAME)
+    lock_path = os.path.join(your_lexicon_folder, LU_ID_LOCK_BASENAME)
+
+    with open(lock_path, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if os.path.exists(allocator_path):
+                with open(allocator_path) as infile:
+                    next_lu_id = json.load(infile)['next_lu_id']
+            else:
+                next_lu_id = get_max_lu_id_on_disk(your_lexicon_folder) + 1
+
+            start = max(next_lu_id, get_next_lu_id())
+            end = start + num_lu_ids
+
+            tmp_path = f'{allocator_path}.tmp'
+            with open(tmp_path, 'w') as outfile:
+                json.dump({'next_lu_id': end}, outfile)
+                outfile.flush()
+                os.fsync(outfile.fileno())
+            os.replace(tmp_path, allocator_path)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    return list(range(start, end))
+
+
 def get_lemma_pos_from_lu_name(lu_name):
     lemma, pos = lu_name.rsplit('.', 1)
     return lemma, pos
 
 
+def get_luindex_shard_layout(root):
+    """
+    :rtype: dict
+    :return: the layout of the sharded luIndex (see xml_utils.shard_luindex)
+    or None if luIndex.xml is not sharded
+    """
+    layout_path = os.path.join(root, LUINDEX_SHARD_DIR, LUINDEX_SHARD_LAYOUT_BASENAME)
+    if not os.path.exists(layout_path):
+        return None
+
+    with open(layout_path) as infile:
+        layout = json.load(infile)
+    return layout
+
+
+def get_luindex_shard_key(layout, frame_name, lu_name):
+    """
+    the shard of a luIndex/lu element, i.e., its frame or the first character of its lemma
+    """
+    if layout['shard_by'] == 'frame':
+        return frame_name
+
+    initial = lu_name[0].lower()
+    if not (initial.isascii() and initial.isalnum()):
+        initial = '_'
+    return initial
+
+
+def get_luindex_shard_path(root, shard_key):
+    return os.path.join(root, LUINDEX_SHARD_DIR, f'shard_{shard_key}.xml')
+
+
+def get_luindex_shard_paths(root):
+    shard_dir = os.path.join(root, LUINDEX_SHARD_DIR)
+    return sorted(os.path.join(shard_dir, basename)
+                  for basename in os.listdir(shard_dir)
+                  if basename.startswith('shard_') and basename.endswith('.xml'))
+
+
+def get_luindex_shard_signatures(root):
+    """
+    the signatures of the shards (see path_utils.get_file_signature), which are recorded when they are merged
+
+    :rtype: dict
+    :return: basename of a shard -> signature
+    """
+    return {os.path.basename(shard_path) : get_file_signature(shard_path)
+            for shard_path in get_luindex_shard_paths(root)}
+
+
+def write_luindex_merge_manifest(root, shard_signatures):
+    """
+    record which shards were merged into luIndex.xml (see xml_utils.merge_luindex_shards),
+    i.e., the signatures of the shards and the size and modification time of luIndex.xml after the merge
+
+    :param dict shard_signatures: see get_luindex_shard_signatures
+    """
+    luindex_stat = os.stat(os.path.join(root, 'luIndex.xml'))
+    manifest = {
+        'luIndex' : {'size' : luindex_stat.st_size, 'mtime' : luindex_stat.st_mtime_ns},
+        'shards' : shard_signatures
+    }
+
+    manifest_path = os.path.join(root, LUINDEX_SHARD_DIR, LUINDEX_SHARD_MERGE_BASENAME)
+    tmp_path = f'{manifest_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as outfile:
+        json.dump(manifest, outfile)
+    os.replace(tmp_path, manifest_path)
+
+
+def luindex_shards_are_merged(root):
+    """
+    determine whether luIndex.xml is up-to-date with the shards,
+    i.e., whether luIndex.xml and the shards are those that were recorded by the last merge
+    (see write_luindex_merge_manifest).
+
+    A shard with the recorded size and modification time was not written since the merge,
+    unless its modification time is not older than that of the merged luIndex.xml:
+    a shard that is written in the same timestamp tick as the merge can keep its size and modification time,
+    hence its content is compared with the recorded sha1 hash.
+    """
+    manifest_path = os.path.join(root, LUINDEX_SHARD_DIR, LUINDEX_SHARD_MERGE_BASENAME)
+    if not os.path.exists(manifest_path):
+        return False
+
+    with open(manifest_path) as infile:
+        try:
+            manifest = json.load(infile)
+        except ValueError:
+            return False
+
+    luindex_stat = os.stat(os.path.join(root, 'luIndex.xml'))
+    merged_luindex = manifest['luIndex']
+    if (luindex_stat.st_size, luindex_stat.st_mtime_ns) != (merged_luindex['size'], merged_luindex['mtime']):
+        return False
+
+    shard_paths = get_luindex_shard_paths(root)
+    if {os.path.basename(shard_path) for shard_path in shard_paths} != set(manifest['shards']):
+        return False
+
+    for shard_path in shard_paths:
+        merged_signature = manifest['shards'][os.path.basename(shard_path)]
+        signature = get_file_signature(shard_path, compute_hash=False)
+        if signature['size'] != merged_signature['size']:
+            return False
+        if signature['mtime'] == merged_signature['mtime'] and signature['mtime'] < merged_luindex['mtime']:
+            continue
+        if get_file_signature(shard_path)['sha1'] != merged_signature['sha1']:
+            return False
+
+    return True
+
+
+def get_luindex_paths(root):
+    """
+    the files that contain the luIndex/lu elements of a lexicon, i.e.,
+    the shards if luIndex.xml is sharded and not up-to-date, else luIndex.xml
+    """
+    if get_luindex_shard_layout(root) is not None and not luindex_shards_are_merged(root):
+        return get_luindex_shard_paths(root)
+    return [os.path.join(root, 'luIndex.xml')]
+
+
+def get_luindex_signature(root):
+    signature = {}
+    luindex_paths = [os.path.join(root, 'luIndex.xml')]
+    if get_luindex_shard_layout(root) is not None:
+        luindex_paths.extend(get_luindex_shard_paths(root))
+
+    for luindex_path in luindex_paths:
+        stat = os.stat(luindex_path)
+        signature[luindex_path] = (stat.st_size, stat.st_mtime_ns)
+
+    return signature
+
+
+def build_lexicon_index(root, verbose=0):
+    """
+    build an index of the LUs of a lexicon with one pass over luIndex.xml (or its shards, see get_luindex_paths)
+    and one pass over the frame/FRAME_NAME.xml files.
+    As in NLTK's FramenetCorpusReader.lu_ids_and_names, the LUs with a status in BAD_STATUSES are left out.
+
+    :param str root: the folder of the lexicon
+    :rtype: dict
+    :return: dictionary with the keys:
+    -root: the folder of the lexicon
+    -signature: size and modification time of luIndex.xml (and its shards) when the index was built
+    -lu_id_to_info: lu_id -> {'lemma_pos', 'frame', 'lemma_id', 'agent', 'provenance', 'referenced_lu_ids'}
+    -lemma_pos_to_lu_ids: lemma.pos -> set of lu identifiers
+    -lemma_pos_frame_to_lu_ids: (lemma.pos, frame) -> set of lu identifiers
+    -lemma_pos_to_lemma_id: lemma.pos -> lemma identifier
+    -max_lemma_id: the highest lemma identifier (0 if there are none)
+    -lu_id_to_referring_lu_ids: lu_id -> set of lu identifiers of the compounds
+    that refer to it in a lexeme (attribute lu_id)
+    """
+    index = {
+        'root' : root,
+        'signature' : get_luindex_signature(root),
+        'lu_id_to_info' : {},
+        'lemma_pos_to_lu_ids' : {},
+        'lemma_pos_frame_to_lu_ids' : {},
+        'lemma_pos_to_lemma_id' : {},
+        'max_lemma_id' : 0,
+        'lu_id_to_referring_lu_ids' : {}
+    }
+
+    lu_id_to_lexunit_attrs = {}
+    lu_id_to_referenced_lu_ids = {}
+    frame_dir = os.path.join(root, 'frame')
+    for basename in os.listdir(frame_dir):
+        if not basename.endswith('.xml'):
+            continue
+        for event, el in ET.iterparse(os.path.join(frame_dir, basename)):
+            if el.tag == f'{{{FN_NAMESPACE}}}lexUnit':
+                lu_id = int(el.get('ID'))
+                lu_id_to_lexunit_attrs[lu_id] = {
+                    'lemma_id' : int(el.get('lemmaID')),
+                    'agent' : el.get('cBy'),
+                    'provenance' : el.get('provenance')
+                }
+                lu_id_to_referenced_lu_ids[lu_id] = get_referenced_lu_ids([lexeme_el.attrib
+                                                                           for lexeme_el in el.iter(f'{{{FN_NAMESPACE}}}lexeme')])
+                el.clear()
+
+    for luindex_path in get_luindex_paths(root):
+        for event, el in ET.iterparse(luindex_path):
+            if el.tag == f'{{{FN_NAMESPACE}}}lu':
+                lu_id = int(el.get('ID'))
+                lexunit_attrs = lu_id_to_lexunit_attrs.get(lu_id, {})
+                add_lu_to_lexicon_index(index=index,
+                                        lu_id=lu_id,
+                                        lemma_pos=el.get('name'),
+                                        lemma_id=lexunit_attrs.get('lemma_id'),
+                                        frame=el.get('frameName'),
+                                        agent=lexunit_attrs.get('agent'),
+                                        provenance=lexunit_attrs.get('provenance'),
+                                        referenced_lu_ids=lu_id_to_referenced_lu_ids.get(lu_id, set()),
+                                        status=el.get('status'))
+                el.clear()
+
+    if verbose >= 1:
+        print(f'indexed {len(index["lu_id_to_info"])} LUs of the lexicon at {root}')
+
+    return index
+
+
+def get_lexicon_index(your_fn, verbose=0):
+    """
+    obtain the index of the LUs of a lexicon (see build_lexicon_index).
+    The index is built once per lexicon and kept in memory.
+    It is rebuilt if luIndex.xml (or one of its shards) was modified by another process.
+
+    :param your_fn: loaded lexicon using NLTK's FrameNetCorpusReader
+    """
+    root = os.path.realpath(your_fn.root.path)
+
+    index = LEXICON_INDEXES.get(root)
+    if index is None or index['signature'] != get_luindex_signature(root):
+        index = build_lexicon_index(root, verbose=verbose)
+        LEXICON_INDEXES[root] = index
+
+    return index
+
+
+def get_referenced_lu_ids(lexemes):
+    """
+    the lu identifiers that the lexemes of an (endocentric compound) LU refer to
+
+    :param list lexemes: list of dictionaries with the attributes of the lexemes
+    :rtype: set
+    """
+    return {int(lexeme['lu_id'])
+            for lexeme in lexemes
+            if 'lu_id' in lexeme}
+
+
+def add_lu_to_lexicon_index(index,
+                            lu_id,
+                            lemma_pos,
+                            lemma_id,
+                            frame,
+                            agent=None,
+                            provenance=None,
+                            referenced_lu_ids=set(),
+                            status=None):
+    """
+    add an LU to the index of a lexicon (see build_lexicon_index).
+    An LU with a status in BAD_STATUSES is not added.
+    """
+    if status in BAD_STATUSES:
+        return
+
+    index['lu_id_to_info'][lu_id] = {
+        'lemma_pos' : lemma_pos,
+        'frame' : frame,
+        'lemma_id' : lemma_id,
+        'agent' : agent,
+        'provenance' : provenance,
+        'referenced_lu_ids' : set(referenced_lu_ids)
+    }
+    for referenced_lu_id in referenced_lu_ids:
+        index['lu_id_to_referring_lu_ids'].setdefault(referenced_lu_id, set()).add(lu_id)
+    index['lemma_pos_to_lu_ids'].setdefault(lemma_pos, set()).add(lu_id)
+    index['lemma_pos_frame_to_lu_ids'].setdefault((lemma_pos, frame), set()).add(lu_id)
+
+    if lemma_id is not None:
+        index['lemma_pos_to_lemma_id'].setdefault(lemma_pos, lemma_id)
+        index['max_lemma_id'] = max(index['max_lemma_id'], lemma_id)
+
+
+def remove_lu_from_lexicon_index(index, lu_id):
+    """
+    remove an LU from the index of a lexicon (see build_lexicon_index).
+    The lemma identifier of its lemma.pos is kept, such that it is reused if the lemma.pos is added again.
+    """
+    info = index['lu_id_to_info'].pop(lu_id)
+
+    keys_and_mappings = [(info['lemma_pos'], index['lemma_pos_to_lu_ids']),
+                         ((info['lemma_pos'], info['frame']), index['lemma_pos_frame_to_lu_ids'])]
+    for referenced_lu_id in info['referenced_lu_ids']:
+        keys_and_mappings.append((referenced_lu_id, index['lu_id_to_referring_lu_ids']))
+
+    for key, mapping in keys_and_mappings:
+        mapping[key].discard(lu_id)
+        if not mapping[key]:
+            del mapping[key]
+
+
+def update_lexicon_index_signature(index):
+    """
+    mark the index as up-to-date with luIndex.xml after the lexicon was updated
+    and the index was updated incrementally
+    """
+    index['signature'] = get_luindex_signature(index['root'])
+
+
+def get_lemma_id_from_index(index, lemma_pos):
+    """
+    retrieve the lemma identifier of a lemma.pos or generate a new one
+    """
+    lemma_id = index['lemma_pos_to_lemma_id'].get(lemma_pos)
+    if lemma_id is None:
+        lemma_id = index['max_lemma_id'] + 1
+    return lemma_id
+
+
+def get_frames_of_lemma_pos(your_fn, lemma, pos):
+    """
+    the frames in which lemma.pos is an LU
+
+    :rtype: set
+    """
+    index = get_lexicon_index(your_fn)
+    lu_ids = index['lemma_pos_to_lu_ids'].get(f'{lemma}.{pos.lower()}', set())
+    return {index['lu_id_to_info'][lu_id]['frame'] for lu_id in lu_ids}
+
+
+def select_lu_ids_from_index(index,
+                             provenance=None,
+                             agent=None,
+                             frame=None):
+    criteria = {key: value
+                for key, value in [('provenance', provenance), ('agent', agent), ('frame', frame)]
+                if value is not None}
+
+    lu_ids = set()
+    for lu_id, info in index['lu_id_to_info'].items():
+        if all(info[key] == value for key, value in criteria.items()):
+            lu_ids.add(lu_id)
+
+    return lu_ids
+
+
+def select_lu_ids(your_fn,
+                  provenance=None,
+                  agent=None,
+                  frame=None):
+    """
+    select the LUs of a lexicon using the index (see build_lexicon_index).
+    Only the criteria that are provided are used, e.g.,
+    select_lu_ids(your_fn, provenance='my_batch') selects all LUs with provenance my_batch.
+
+    :param your_fn: loaded lexicon using NLTK's FrameNetCorpusReader
+    :param str provenance: the provenance attribute of the LU
+    :param str agent: the agent who created the LU (attribute cBy)
+    :param str frame: the frame of the LU
+
+    :rtype: set
+    :return: the matching lu identifiers
+    """
+    index = get_lexicon_index(your_fn)
+    return select_lu_ids_from_index(index,
+                                    provenance=provenance,
+                                    agent=agent,
+                                    frame=frame)
+
+
 def get_lemma_id(your_fn,
                  lemma,
                  pos):
@@ -17,26 +477,25 @@ def get_lemma_id(your_fn,
     FrameNet stores an identifier for each lemma.pos combination.
     In this function, we retrieve it or generate a new one.
     """
-    chosen_lemma_id = None
+    index = get_lexicon_index(your_fn)
+    return get_lemma_id_from_index(index, f'{lemma}.{pos.lower()}')
+
+
+def get_luid_from_index(index, frame_label, lemma, pos):
     target = f'{lemma}.{pos.lower()}'
-    for lu_id, lemma_pos in your_fn.lu_ids_and_names().items():
-        if lemma_pos == target:
-            lu = your_fn.lu(lu_id)
-            chosen_lemma_id = lu.lemmaID
-            break
-
-    if chosen_lemma_id is None:
-        lemma_ids = set()
-        for lu in your_fn.lus():
-            lemma_ids.add(lu.lemmaID)
-
-        if lemma_ids:
-            maximum = max(lemma_ids)
-        else:
-            maximum = 0
-        chosen_lemma_id = maximum + 1
+    lu_ids = index['lemma_pos_frame_to_lu_ids'].get((target, frame_label), set())
+
+    if len(lu_ids) >= 2:
+        target_lu_id = None
+        reason = f'{target} found in multiple frames (lu ids are {lu_ids}'
+    elif len(lu_ids) == 1:
+        target_lu_id = list(lu_ids)[0]
+        reason = 'succes'
+    else:
+        target_lu_id = None
+        reason = f'no lu id found matching {target}'
 
-    return chosen_lemma_id
+    return target_lu_id, reason
 
 
 def get_luid(my_fn,
@@ -54,24 +513,313 @@ def get_luid(my_fn,
 
     :return: the lu identifier or None if not found
     """
-    lu_ids = set()
-    target = f'{lemma}.{pos.lower()}'
-    for lu_id, lemma_pos in my_fn.lu_ids_and_names().items():
-        if lemma_pos == target:
-            lu = my_fn.lu(lu_id)
-            frame = lu.frame
+    index = get_lexicon_index(my_fn)
+    return get_luid_from_index(index, frame_label, lemma, pos)
 
-            if frame.name == frame_label:
-                lu_ids.add(lu_id)
 
-    if len(lu_ids) >= 2:
-        target_lu_id = None
-        reason = f'{lemma}.{pos.lower()} found in multiple frames (lu ids are {lu_ids}'
-    elif len(lu_ids) == 1:
-        target_lu_id = list(lu_ids)[0]
-        reason = 'succes'
+def get_luids(my_fn,
+              frame_lemma_pos_triples):
+    """
+    Batch version of get_luid, e.g., to resolve all predicates of an annotated corpus.
+
+    :param my_fn: loaded framenet using NLTK's FrameNetCorpusReader
+    :param list frame_lemma_pos_triples: list of (frame_label, lemma, pos) tuples
+
+    :rtype: list
+    :return: (lu identifier or None, reason) for each triple
+    """
+    index = get_lexicon_index(my_fn)
+    return [get_luid_from_index(index, frame_label, lemma, pos)
+            for frame_label, lemma, pos in frame_lemma_pos_triples]
+
+
+def read_lu_files(paths):
+    """
+    extract the LU information of lu/LU_ID.xml files.
+    Only the attributes of the root, the definition, and the lexemes are read,
+    i.e., the parsing of a file stops at its annotations.
+
+    :rtype: list
+    :return: one dictionary per file with the keys lu_id, name, frame, attrib (of the root),
+    definition, lexemes (list of attribute dictionaries), referenced_lu_ids, and path
+    """
+    records = []
+    for path in paths:
+        record = None
+        for event, el in ET.iterparse(path, events=('start', 'end')):
+            if event == 'start':
+                if record is None:
+                    record = {
+                        'lu_id' : int(el.get('ID')),
+                        'name' : el.get('name'),
+                        'frame' : el.get('frame'),
+                        'attrib' : dict(el.attrib),
+                        'definition' : None,
+                        'lexemes' : [],
+                        'path' : path
+                    }
+                elif el.tag == f'{{{FN_NAMESPACE}}}lexeme':
+                    record['lexemes'].append(dict(el.attrib))
+                elif el.tag == f'{{{FN_NAMESPACE}}}subCorpus':
+                    break
+            elif el.tag == f'{{{FN_NAMESPACE}}}definition':
+                record['definition'] = el.text
+                el.clear()
+
+        record['referenced_lu_ids'] = get_referenced_lu_ids(record['lexemes'])
+        records.append(record)
+
+    return records
+
+
+def read_frame_files(paths):
+    """
+    extract the frame/lexUnit elements of frame/FRAME_NAME.xml files
+
+    :rtype: list
+    :return: one dictionary per lexUnit element with the keys lu_id, name, frame, referenced_lu_ids, and path
+    """
+    records = []
+    for path in paths:
+        frame = None
+        record = None
+        lexemes = []
+        for event, el in ET.iterparse(path, events=('start', 'end')):
+            if event == 'start':
+                if frame is None:
+                    frame = el.get('name')
+                elif el.tag == f'{{{FN_NAMESPACE}}}lexUnit':
+                    record = {
+                        'lu_id' : int(el.get('ID')),
+                        'name' : el.get('name'),
+                        'frame' : frame,
+                        'path' : path
+                    }
+                    lexemes = []
+                elif record is not None and el.tag == f'{{{FN_NAMESPACE}}}lexeme':
+                    lexemes.append(dict(el.attrib))
+            elif el.tag == f'{{{FN_NAMESPACE}}}lexUnit':
+                record['referenced_lu_ids'] = get_referenced_lu_ids(lexemes)
+                records.append(record)
+                record = None
+                el.clear()
+
+    return records
+
+
+def read_lexunit_creation_info(root, lu_ids):
+    """
+    extract the attributes cBy, provenance, and cDate of the frame/lexUnit elements of a lexicon,
+    from which NLTK's FramenetCorpusReader loads them as well, without loading the frames or LUs with NLTK
+
+    :param str root: the folder of the lexicon
+    :param set lu_ids: the lu identifiers of the LUs of which the attributes are extracted
+
+    :rtype: dict
+    :return: lu_id -> {'cBy', 'provenance', 'cDate'} (provenance is None if the attribute is missing)
+    """
+    lu_id_to_creation_info = {}
+    frame_dir = os.path.join(root, 'frame')
+    for basename in sorted(os.listdir(frame_dir)):
+        if not basename.endswith('.xml'):
+            continue
+        for event, el in ET.iterparse(os.path.join(frame_dir, basename)):
+            if el.tag == f'{{{FN_NAMESPACE}}}lexUnit':
+                lu_id = int(el.get('ID'))
+                if lu_id in lu_ids:
+                    lu_id_to_creation_info.setdefault(lu_id, {
+                        'cBy' : el.get('cBy'),
+                        'provenance' : el.get('provenance'),
+                        'cDate' : el.get('cDate')
+                    })
+                el.clear()
+
+    return lu_id_to_creation_info
+
+
+def read_luindex_files(paths):
+    """
+    extract the luIndex/lu elements of luIndex.xml (or its shards)
+
+    :rtype: list
+    :return: one dictionary per lu element with the keys lu_id, name, frame, referenced_lu_ids, and path
+    """
+    records = []
+    for path in paths:
+        for event, el in ET.iterparse(path):
+            if el.tag == f'{{{FN_NAMESPACE}}}lu':
+                records.append({
+                    'lu_id' : int(el.get('ID')),
+                    'name' : el.get('name'),
+                    'frame' : el.get('frameName'),
+                    'referenced_lu_ids' : set(),
+                    'path' : path
+                })
+                el.clear()
+
+    return records
+
+
+def read_lexicon_files(task):
+    """
+    worker of collect_lexicon_records
+
+    :param tuple task: (source, paths), in which source is one of LEXICON_SOURCES
+    """
+    source, paths = task
+    if source == 'lu':
+        records = read_lu_files(paths)
+    elif source == 'frame':
+        records = read_frame_files(paths)
+    elif source == 'luIndex':
+        records = read_luindex_files(paths)
     else:
-        target_lu_id = None
-        reason = f'no lu id found matching {lemma}.{pos.lower()}'
+        raise ValueError(f'unknown source {source}, should be one of {LEXICON_SOURCES}')
+    return source, records
 
-    return target_lu_id, reason
+
+def collect_lexicon_records(root, num_processes=None, verbose=0):
+    """
+    read the LUs from the three sources of a lexicon, i.e., the lu/LU_ID.xml files,
+    the lexUnit elements of the frame/FRAME_NAME.xml files, and the lu elements of luIndex.xml (or its shards).
+    The files are split into tasks, which are streamed in parallel.
+
+    :param str root: the folder of the lexicon
+    :param int num_processes: the number of processes (default: number of CPUs, 1: no process pool)
+
+    :rtype: dict
+    :return: source -> list of records (see read_lu_files, read_frame_files, and read_luindex_files)
+    """
+    start = time.time()
+
+    lu_dir = os.path.join(root, 'lu')
+    lu_paths = sorted(os.path.join(lu_dir, basename)
+                      for basename in os.listdir(lu_dir)
+                      if re.fullmatch(r'lu(\d+)\.xml', basename))
+
+    frame_dir = os.path.join(root, 'frame')
+    frame_paths = sorted(os.path.join(frame_dir, basename)
+                         for basename in os.listdir(frame_dir)
+                         if basename.endswith('.xml'))
+
+    tasks = []
+    for source, paths in [('lu', lu_paths), ('frame', frame_paths)]:
+        for offset in range(0, len(paths), LEXICON_FILES_PER_TASK):
+            tasks.append((source, paths[offset:offset + LEXICON_FILES_PER_TASK]))
+    for luindex_path in get_luindex_paths(root):
+        tasks.append(('luIndex', [luindex_path]))
+
+    if num_processes is None:
+        num_processes = os.cpu_count()
+
+    source_to_records = {source: [] for source in LEXICON_SOURCES}
+    with ExitStack() as pool_context:
+        if num_processes == 1 or len(tasks) == 1:
+            results = map(read_lexicon_files, tasks)
+        else:
+            pool = pool_context.enter_context(Pool(processes=num_processes))
+            results = pool.imap_unordered(read_lexicon_files, tasks)
+
+        for source, records in results:
+            source_to_records[source].extend(records)
+
+    if verbose >= 1:
+        print(f'read {len(lu_paths)} LU files, {len(frame_paths)} frame files, '
+              f'and {len(get_luindex_paths(root))} luIndex file(s) in {time.time() - start:.1f} seconds')
+
+    return source_to_records
+
+
+def check_lexicon_consistency(root, num_processes=None, source_to_records=None, verbose=0):
+    """
+    verify that the lu/LU_ID.xml files, the lexUnit elements of the frame/FRAME_NAME.xml files,
+    and the lu elements of luIndex.xml (or its shards) of a lexicon describe the same LUs.
+
+    :param str root: the folder of the lexicon
+    :param int num_processes: the number of processes (see collect_lexicon_records)
+    :param dict source_to_records: optional result of collect_lexicon_records
+
+    :rtype: dict
+    :return: a dictionary with the keys:
+    -num_lus: source -> number of LUs
+    -orphans: the LUs that are missing in one or more sources, i.e., {lu_id, present_in, missing_in}
+    -duplicates: the LUs that occur more than once in a source, i.e., {lu_id, source, paths}
+    -frame_mismatches: the LUs for which the sources disagree about the frame, i.e., {lu_id, frames (source -> frame)}
+    -dangling_references: lexemes of which the attribute lu_id refers to an LU that is not part of any source,
+    i.e., {lu_id, referenced_lu_id, source}
+    -consistent: True if none of the above were found
+    """
+    if source_to_records is None:
+        source_to_records = collect_lexicon_records(root,
+                                                    num_processes=num_processes,
+                                                    verbose=verbose)
+
+    source_to_lu_id_to_records = {}
+    for source in LEXICON_SOURCES:
+        lu_id_to_records = defaultdict(list)
+        for record in source_to_records[source]:
+            lu_id_to_records[record['lu_id']].append(record)
+        source_to_lu_id_to_records[source] = lu_id_to_records
+
+    all_lu_ids = set()
+    for lu_id_to_records in source_to_lu_id_to_records.values():
+        all_lu_ids.update(lu_id_to_records)
+
+    report = {
+        'num_lus' : {source: len(lu_id_to_records)
+                     for source, lu_id_to_records in source_to_lu_id_to_records.items()},
+        'orphans' : [],
+        'duplicates' : [],
+        'frame_mismatches' : [],
+        'dangling_references' : [],
+    }
+
+    for lu_id in sorted(all_lu_ids):
+        present_in = [source
+                      for source in LEXICON_SOURCES
+                      if lu_id in source_to_lu_id_to_records[source]]
+
+        if len(present_in) != len(LEXICON_SOURCES):
+            report['orphans'].append({
+                'lu_id' : lu_id,
+                'present_in' : present_in,
+                'missing_in' : [source for source in LEXICON_SOURCES if source not in present_in]
+            })
+
+        frames = {}
+        for source in present_in:
+            records = source_to_lu_id_to_records[source][lu_id]
+            if len(records) > 1:
+                report['duplicates'].append({
+                    'lu_id' : lu_id,
+                    'source' : source,
+                    'paths' : sorted(record['path'] for record in records)
+                })
+            frames[source] = records[0]['frame']
+
+            for record in records:
+                for referenced_lu_id in sorted(record['referenced_lu_ids'] - all_lu_ids):
+                    report['dangling_references'].append({
+                        'lu_id' : lu_id,
+                        'referenced_lu_id' : referenced_lu_id,
+                        'source' : source
+                    })
+
+        if len(set(frames.values())) > 1:
+            report['frame_mismatches'].append({
+                'lu_id' : lu_id,
+                'frames' : frames
+            })
+
+    report['consistent'] = not any([report['orphans'],
+                                    report['duplicates'],
+                                    report['frame_mismatches'],
+                                    report['dangling_references']])
+
+    if verbose >= 1:
+        print(f'checked {len(all_lu_ids)} LUs of the lexicon at {root}: '
+              f'{len(report["orphans"])} orphan(s), {len(report["duplicates"])} duplicate(s), '
+              f'{len(report["frame_mismatches"])} frame mismatch(es), '
+              f'{len(report["dangling_references"])} dangling reference(s)')
+
+    return report
@@ -1,13 +1,26 @@
 from nltk.corpus.reader.framenet import FramenetCorpusReader
 
+from . import journal_utils
+from . import xml_utils
 
-def load(folder, verbose=0):
+
+def load(folder, merge_luindex_shards=True, verbose=0):
     """
+    Load a FrameNet lexicon. If an earlier update of the lexicon was interrupted,
+    it is first rolled forward or back (see journal_utils.recover).
+    If luIndex.xml is sharded, it is first updated from its shards (see xml_utils.merge_luindex_shards).
 
     :param verbose:
     :param str folder:
+    :param bool merge_luindex_shards: if False, luIndex.xml is not updated from its shards,
+    e.g., when only the lexicon index (see lexicon_utils.get_lexicon_index) is used to look up LUs.
     :return:
     """
+    journal_utils.recover(folder, verbose=verbose)
+
+    if merge_luindex_shards:
+        xml_utils.merge_luindex_shards(folder, verbose=verbose)
+
     your_fn = FramenetCorpusReader(folder, ['frameIndex.xml'])
 
     if verbose >= 1:
@@ -7,7 +7,7 @@ import nltk
 
 from nltk.corpus import framenet as fn_en
 
-from .rdf_utils import get_rdf_label, get_lu_identifier, load_graph
+from .rdf_utils import lookup_rdf_label, get_lu_identifier, load_graph
 
 
 
@@ -169,7 +169,7 @@ def get_most_recent_premon_uri(el):
 
 
 
-def get_annotation_dict(naf_el, markable_id_to_info, premon, verbose=0):
+def get_annotation_dict(naf_el, markable_id_to_info, premon_index, verbose=0):
 
     if naf_el.get('status') == 'deprecated':
         return None, None, None, None, None, None, None
@@ -185,8 +185,8 @@ def get_annotation_dict(naf_el, markable_id_to_info, premon, verbose=0):
     premon_uri, source, timestamp, lu_uri = get_most_recent_premon_uri(el=naf_el)
 
     # obtain frame label using premon
-    label = get_rdf_label(graph=premon,
-                          uri=premon_uri)
+    label = lookup_rdf_label(premon_index=premon_index,
+                             uri=premon_uri)
 
     return label, naf_sent_id, status, lu_uri, timestamp, pred_offsets, source
 
@@ -210,7 +210,7 @@ def load_annotations_from_naf(your_fn,
                               path_to_your_fn_in_lemon,
                               naf_path,
                               doc_id,
-                              premon):
+                              premon_index):
     """
 
     """
@@ -232,7 +232,7 @@ def load_annotations_from_naf(your_fn,
         status, lu_uri, timestamp,\
         pred_offsets, source = get_annotation_dict(naf_el=pred_el,
                                                    markable_id_to_info=markable_id_to_info,
-                                                   premon=premon)
+                                                   premon_index=premon_index)
         if frame_label is None:
             continue
 
@@ -272,7 +272,7 @@ def load_annotations_from_naf(your_fn,
             status, lu_uri, timestamp, \
             fe_offsets, source = get_annotation_dict(naf_el=role_el,
                                                        markable_id_to_info=markable_id_to_info,
-                                                       premon=premon)
+                                                       premon_index=premon_index)
             if fe_label is None:
                 continue
 
@@ -1,5 +1,6 @@
 import os
 import shutil
+import hashlib
 from glob import glob
 
 def get_lexicon_name(my_fn):
@@ -59,3 +60,78 @@ def get_relevant_paths(root, check_if_exists=True):
 
     return label_to_path
 
+
+def get_file_signature(path, compute_hash=True):
+    """
+    obtain the size, modification time and (optionally) sha1 hash of a file
+
+    :param str path: path to a file
+    :param bool compute_hash: if False, the value of 'sha1' is None
+
+    :rtype: dict
+    """
+    stat = os.stat(path)
+
+    sha1 = None
+    if compute_hash:
+        hash_obj = hashlib.sha1()
+        with open(path, 'rb') as infile:
+            for chunk in iter(lambda: infile.read(1024 * 1024), b''):
+                hash_obj.update(chunk)
+        sha1 = hash_obj.hexdigest()
+
+    return {
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'sha1': sha1
+    }
+
+
+def signature_is_valid(cached_signature, path):
+    """
+    determine whether a cached signature still describes the file at path.
+    the (expensive) hash is only computed if the size or mtime changed.
+
+    :rtype: tuple
+    :return: (is_valid, the current signature of the file)
+    """
+    signature = get_file_signature(path, compute_hash=False)
+
+    if cached_signature is None:
+        return False, signature
+
+    if cached_signature['size'] != signature['size']:
+        return False, signature
+
+    if cached_signature['mtime'] == signature['mtime']:
+        signature['sha1'] = cached_signature['sha1']
+        return True, signature
+
+    signature = get_file_signature(path, compute_hash=True)
+    return cached_signature['sha1'] == signature['sha1'], signature
+
+
+def get_changed_files(manifest, key_to_path):
+    """
+    compare files with a manifest of their signatures (see get_file_signature).
+    Files of which only the modification time changed are not considered to be changed.
+
+    :param dict manifest: key -> signature, e.g., a manifest key is frame/FRAME_NAME.xml
+    :param dict key_to_path: key -> path of the current file
+
+    :rtype: tuple
+    :return: (the changed or new files (keys), the removed files (keys), the updated manifest)
+    """
+    changed = []
+    updated_manifest = {}
+    for key, path in sorted(key_to_path.items()):
+        is_valid, signature = signature_is_valid(manifest.get(key), path)
+        if signature['sha1'] is None:
+            signature = get_file_signature(path)
+        if not is_valid:
+            changed.append(key)
+        updated_manifest[key] = signature
+
+    removed = sorted(set(manifest) - set(key_to_path))
+
+    return changed, removed, updated_manifest
@@ -1,13 +1,32 @@
-from collections import defaultdict
+import os
+import re
+import gzip
+import json
+import shutil
+import tempfile
+import pickle
+import hashlib
+from collections import defaultdict, OrderedDict
 from datetime import datetime
+from multiprocessing import Pool
 
+import rdflib
 from rdflib.namespace import RDF, RDFS, XSD
 from rdflib.namespace import Namespace
 from rdflib import URIRef
 from rdflib import Literal, BNode
 from rdflib import ConjunctiveGraph, Graph
+from rdflib.plugins.parsers.ntriples import NTriplesParser
+from rdflib.plugins.serializers.nt import _nt_row
 from graphviz import Digraph
 
+try:
+    from .path_utils import get_file_signature, signature_is_valid
+    from .validation_utils import get_vocabulary_terms
+except ImportError: # imported as a top-level module, e.g., by install.sh
+    from path_utils import get_file_signature, signature_is_valid
+    from validation_utils import get_vocabulary_terms
+
 
 
 SUPPORTED_LANGUAGES = {
@@ -20,6 +39,36 @@ LANGUAGE_TO_ADJECTIVE = {
     'nld' : 'Dutch'
 }
 
+# the namespaces of the Lemon representation (see convert_to_lemon)
+LEMON = Namespace('http://lemon-model.net/lemon#')
+DCT = Namespace('http://purl.org/dc/terms/')
+LEXINFO = Namespace('http://www.lexinfo.net/ontology/3.0/lexinfo#')
+ONTOLEX = Namespace('http://www.w3.org/ns/lemon/ontolex#')
+PROV = Namespace('http://www.w3.org/ns/prov#')
+SKOS_NAMESPACE = 'http://www.w3.org/2004/02/skos/core#'
+SKOS = Namespace(SKOS_NAMESPACE)
+
+# the terms of the vocabularies that are used by convert_to_lemon (see validate_vocabularies)
+LEMON_TERMS = ['Lexicon', 'language', 'LexicalEntry', 'Form', 'writtenRep', 'canonicalForm',
+               'sense', 'LexicalSense', 'isSenseOf', 'definition', 'entry',
+               'decomposition', 'Component', 'element', 'Word', 'Phrase']
+ONTOLEX_TERMS = ['evokes']
+
+# output formats of convert_to_lemon
+OUTPUT_FORMATS = {'turtle', 'nt'}
+
+# number of recently written triples that an NTriplesWriter remembers to skip duplicates
+DEDUP_BUFFER_SIZE = 10000
+
+# number of LUs that a worker of convert_to_lemon converts per task (the LUs of a frame are never split)
+LEMON_LUS_PER_TASK = 500
+
+# the state of a worker of convert_to_lemon (see set_lemon_worker_context)
+LEMON_WORKER_CONTEXT = {}
+
+# suffix of the path of the fingerprints of the LUs of an export (see get_fingerprints_path)
+FINGERPRINTS_SUFFIX = '.fingerprints.json'
+
 LUTYPE_TO_LU_TYPE_URL = {
     'idiom' : 'http://www.lexinfo.net/ontology/3.0/lexinfo#idiom',
 }
@@ -83,17 +132,129 @@ COMP_ATTR_TO_INFO = {
 }
 
 
+class NTriplesWriter(object):
+    """
+    A sink for triples with the methods add and bind of rdflib.graph.Graph,
+    which writes every triple to an N-Triples file (gzipped if path ends with .gz) as soon as it is added.
+    Only the most recently written dedup_buffer_size triples are remembered to skip duplicates,
+    such that memory use does not grow with the number of triples.
+    Hence, a duplicate is only skipped if it is written within dedup_buffer_size triples of the original.
+    This suffices for convert_to_lemon: the subject of each triple of an LU contains its lu identifier
+    (see get_lu_row_pattern), such that the triples of an LU only repeat among its own triples,
+    and the triples of the lexicon header and of the provenance activities are written once.
+    The file is written to a temporary path, which replaces path when the writer is closed.
+    """
+    def __init__(self, path, dedup_buffer_size=DEDUP_BUFFER_SIZE):
+        self.path = path
+        self.tmp_path = f'{path}.{os.getpid()}.tmp'
+        self.dedup_buffer_size = dedup_buffer_size
+        self.recent_rows = OrderedDict()
+        self.namespaces = {}
+        self.num_written = 0
+
+        if path.endswith('.gz'):
+            self.outfile = gzip.open(self.tmp_path, 'wt', encoding='utf-8')
+        else:
+            self.outfile = open(self.tmp_path, 'w', encoding='utf-8')
+
+    def bind(self, prefix, namespace):
+        """
+        N-Triples does not have prefixes, they are only remembered for convert_ntriples_to_turtle
+        """
+        self.namespaces[prefix] = str(namespace)
+
+    def add(self, triple):
+        self.add_row(_nt_row(triple))
+
+    def add_row(self, row):
+        """
+        add a triple that is already in the N-Triples format (one line, including the newline)
+        """
+        if row in self.recent_rows:
+            self.recent_rows.move_to_end(row)
+            return
+
+        self.recent_rows[row] = None
+        if len(self.recent_rows) > self.dedup_buffer_size:
+            self.recent_rows.popitem(last=False)
+
+        self.outfile.write(row)
+        self.num_written += 1
+
+    def add_ntriples_file(self, path):
+        """
+        add the triples of an N-Triples file (gzipped if path ends with .gz), e.g., written by another NTriplesWriter
+        """
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as infile:
+            for row in infile:
+                self.add_row(row)
+
+    def close(self):
+        self.outfile.close()
+        os.replace(self.tmp_path, self.path)
+        self.recent_rows.clear()
+
+    def abort(self):
+        self.outfile.close()
+        os.remove(self.tmp_path)
+
+
+def convert_ntriples_to_turtle(ntriples_path, output_path, namespaces={}):
+    """
+    convert an N-Triples file (gzipped if ntriples_path ends with .gz), e.g., written by an NTriplesWriter, to Turtle.
+    Please note that this loads all triples in memory.
+
+    :param dict namespaces: prefix -> namespace, used for the prefixes of the Turtle file
+    """
+    g = Graph()
+    for prefix, namespace in namespaces.items():
+        g.bind(prefix, Namespace(namespace))
+
+    opener = gzip.open if ntriples_path.endswith('.gz') else open
+    with opener(ntriples_path, 'rb') as infile:
+        g.parse(file=infile, format='nt')
+
+    g.serialize(format='turtle', destination=output_path)
+
+
+def validate_vocabularies(lemon, ontolex, LEMON, ONTOLEX):
+    """
+    verify once that the terms used by convert_to_lemon (LEMON_TERMS and ONTOLEX_TERMS) are part of the vocabularies
+    (see validation_utils.get_vocabulary_terms)
+    """
+    lemon_terms = get_vocabulary_terms(lemon)
+    for term in LEMON_TERMS:
+        assert LEMON[term] in lemon_terms, f'{LEMON[term]} not part of lemon.'
+
+    ontolex_terms = get_vocabulary_terms(ontolex)
+    for term in ONTOLEX_TERMS:
+        assert ONTOLEX[term] in ontolex_terms, f'{ONTOLEX[term]} not part of ontolex.'
+
+
+def register_lemon_urls(namespace):
+    """
+    set the URLs of our own relationships in namespace (LUTYPE_TO_LU_TYPE_URL and COMP_ATTR_TO_URL),
+    which are used to convert LUs (see add_lu_to_graph)
+    """
+    for lu_type in LU_TYPE_URL_TO_INFO:
+        LUTYPE_TO_LU_TYPE_URL[lu_type] = f'{namespace}{lu_type.replace(" ","_")}'
+
+    for comp_attr in COMP_ATTR_TO_INFO:
+        COMP_ATTR_TO_URL[comp_attr] = f'{namespace}{comp_attr}'
+
+
 def initialize_graph(g, namespace, SKOS):
     """
     initialize graph with our own relationships
 
     :return:
     """
+    register_lemon_urls(namespace=namespace)
+
     # lu types
     for lu_type, lu_type_info in LU_TYPE_URL_TO_INFO.items():
-        lu_type_url = f'{namespace}{lu_type.replace(" ","_")}'
-        LUTYPE_TO_LU_TYPE_URL[lu_type] = lu_type_url
-        lu_type_obj = URIRef(lu_type_url)
+        lu_type_obj = URIRef(LUTYPE_TO_LU_TYPE_URL[lu_type])
         g.add((lu_type_obj, RDF.type, URIRef(lu_type_info['type'])))
         g.add((lu_type_obj, RDFS.label, Literal(lu_type_info['label'])))
         g.add((lu_type_obj, RDFS.comment, Literal(lu_type_info['comment'])))
@@ -106,10 +267,7 @@ def initialize_graph(g, namespace, SKOS):
     
     # component attributes
     for comp_attr, comp_info in COMP_ATTR_TO_INFO.items():
-        comp_attr_url = f'{namespace}{comp_attr}'
-        COMP_ATTR_TO_URL[comp_attr] = comp_attr_url
-
-        comp_attr_obj = URIRef(comp_attr_url)
+        comp_attr_obj = URIRef(COMP_ATTR_TO_URL[comp_attr])
         g.add((comp_attr_obj, RDF.type, URIRef(comp_info['type'])))
         g.add((comp_attr_obj, RDFS.label, Literal(comp_info['label'])))
         g.add((comp_attr_obj, RDFS.comment, Literal(comp_info['comment'])))
@@ -119,29 +277,28 @@ def initialize_graph(g, namespace, SKOS):
 
 
 def get_lexeme_info(lexeme,
-                    premon,
+                    premon_index,
                     frame_uri,
                     fn_pos_to_lexinfo,
-                    g,
-                    DCT,
-                    LEMON,
-                    LEXINFO):
+                    lu_id_to_le_obj,
+                    LEXINFO,
+                    bn_node_id=None):
     """
     generate dictionary of information used per lexem
 
     :param nltk.corpus.reader.framenet.PrettyDict lexeme: a lexeme
+    :param dict lu_id_to_le_obj: lu identifier -> URIRef of its LexicalEntry (see convert_to_lemon)
+    :param str bn_node_id: the identifier of the blank node of the :ComponentList (by default, a random one)
 
     :rtype: dict
     """
-    bn_node = BNode()
+    bn_node = BNode(bn_node_id)
 
     lu_id = lexeme.get('lu_id', None)
 
     if lu_id is not None:
-        le_obj_of_component = get_le_uri(g=g,
-                                         DCT=DCT,
-                                         LEMON=LEMON,
-                                         lu_identifier=lu_id)
+        le_obj_of_component = lu_id_to_le_obj.get(int(lu_id))
+        assert le_obj_of_component is not None, f'expected to find the LexicalEntry of lu {lu_id}, found none'
     else:
         le_obj_of_component = None
 
@@ -166,7 +323,7 @@ def get_lexeme_info(lexeme,
             attr_obj = URIRef(COMP_ATTR_TO_URL[attr])
             value_obj = Literal(string_value, datatype=XSD.integer)
         elif attr == 'incorporatedFE':
-            fe_uri = get_fe_uri(graph=premon, frame_uri=frame_uri, fe_label=string_value)
+            fe_uri = lookup_fe_uri(premon_index=premon_index, frame_uri=frame_uri, fe_label=string_value)
             attr_obj = URIRef(COMP_ATTR_TO_URL[attr])
             value_obj = URIRef(fe_uri)
         elif attr == 'lu_id':
@@ -189,16 +346,23 @@ def add_complement_attributes(g, lexeme_info, comp_obj):
         g.add((comp_obj, attr_obj, value_obj))
 
 
+def get_component_list_id(lu_id, lexeme_order):
+    """
+    the identifier of the blank node of a :ComponentList, which is the same in every conversion of a lexicon,
+    such that exports can be compared (see convert_to_lemon)
+    """
+    return f'lu{lu_id}ComponentList{lexeme_order}'
+
+
 def add_decomposition(g,
                       fn_pos_to_lexinfo,
                       frame_uri,
                       lu,
                       LEMON,
                       LEXINFO,
-                      DCT,
-                      lemon,
-                      premon,
-                      le_obj):
+                      premon_index,
+                      le_obj,
+                      lu_id_to_le_obj):
     """
     add lemon representation of decomposition of terms
 
@@ -206,21 +370,20 @@ def add_decomposition(g,
 
     :param nltk.corpus.reader.framenet.AttrDict lu: FrameNet NLTK LU object
     :param rdflib.namespace.Namespace LEMON: Lemon namespace
-    :param rdflib.graph.Graph lemon: lemon graph
+    :param dict premon_index: see load_premon_index
     :param rdflib.URIRef le_obj: uriref of LexicalEntry
+    :param dict lu_id_to_le_obj: lu identifier -> URIRef of its LexicalEntry (see convert_to_lemon)
     """
     # LE -> : blank node representing first :ComponentList
-    assert LEMON.decomposition in lemon.subjects()
-
     lexeme_order_to_info = {
         lexeme['order'] : get_lexeme_info(lexeme=lexeme,
-                                          premon=premon,
+                                          premon_index=premon_index,
                                           frame_uri=frame_uri,
                                           fn_pos_to_lexinfo=fn_pos_to_lexinfo,
-                                          g=g,
-                                          DCT=DCT,
-                                          LEMON=LEMON,
-                                          LEXINFO=LEXINFO)
+                                          lu_id_to_le_obj=lu_id_to_le_obj,
+                                          LEXINFO=LEXINFO,
+                                          bn_node_id=get_component_list_id(lu_id=lu.ID,
+                                                                           lexeme_order=lexeme['order']))
         for lexeme in lu.lexemes
     }
 
@@ -228,14 +391,11 @@ def add_decomposition(g,
 
         comp_uri = le_obj + f'#Component{lexeme_order}'
         comp_obj = URIRef(comp_uri)
-        assert LEMON.Component in lemon.subjects()
         g.add((comp_obj, RDF.type, LEMON.Component))
 
         g.add((lexeme_info['bn_node'], RDF.first, comp_obj))
         if lexeme_info['le_obj_of_component'] is not None:
-            assert LEMON.element in lemon.subjects()
             g.add((comp_obj, LEMON.element, lexeme_info['le_obj_of_component']))
-            assert LEMON.Component in lemon.subjects()
             g.add((comp_obj, RDF.type, LEMON.Component))
 
         add_complement_attributes(g=g, lexeme_info=lexeme_info, comp_obj=comp_obj)
@@ -263,7 +423,8 @@ def get_le_uri(g,
                LEMON,
                lu_identifier):
     """
-    query to obtain LexicalEntry URI
+    query to obtain LexicalEntry URI.
+    convert_to_lemon does not use this query, since it keeps the LexicalEntry of each lu identifier in a dictionary.
     """
     query = f"""SELECT ?le_obj WHERE {{ 
             ?lu_obj <{RDF.type}> <{LEMON.LexicalSense}> . 
@@ -307,7 +468,7 @@ def get_lu_type(lu, language):
 
     return lu_type, lu_type_obj
 
-def get_word_or_phrase(lu_type, lexemes, language, LEMON, lemon):
+def get_word_or_phrase(lu_type, lexemes, language, LEMON):
     """
 
     :param lu_type:
@@ -347,10 +508,8 @@ def get_word_or_phrase(lu_type, lexemes, language, LEMON, lemon):
     lemon_obj = None
 
     if word_or_phrase == 'word':
-        assert LEMON.Word in lemon.subjects()
         lemon_obj = LEMON.Word
     elif word_or_phrase == 'phrase':
-        assert LEMON.Phrase in lemon.subjects()
         lemon_obj = LEMON.Phrase
 
     return lemon_obj
@@ -370,22 +529,29 @@ def get_date(cDate):
     return rdf_string
 
 
-def add_agents_and_provenances(your_fn,
-                               g,
-                               lexicon_uri,
-                               PROV,
-                               language,
-                               verbose=0):
+def get_provenance_obj(lexicon_uri, cby, provenance):
+    """
+    the URIRef of the provenance activity of the LUs that were created by cby with provenance
     """
+    if provenance is not None:
+        provenance_uri = f'{lexicon_uri}#Provenance#{cby}-{provenance}'
+    else:
+        provenance_uri = f'{lexicon_uri}#Provenance#{cby}'
 
-    :param your_fn: your framenet in nltk format
-    :param g: the lemon graph of your framenet
-    :param verbose:
-    :return:
+    return URIRef(provenance_uri)
+
+
+def get_cby_prov_to_cdates(lus):
+    """
+    :param lus: FrameNet NLTK LU objects or dictionaries with the keys cBy, cDate, and optionally provenance
+    (see lexicon_utils.read_lexunit_creation_info)
+
+    :rtype: dict
+    :return: (cBy, provenance) -> list of the creation dates of the LUs
     """
     cby_prov_to_cdates = defaultdict(list)
-    for lu in your_fn.lus():
-        cby = lu.cBy
+    for lu in lus:
+        cby = lu['cBy']
         prov = lu.get('provenance')
 
         if prov is not None:
@@ -393,11 +559,24 @@ def add_agents_and_provenances(your_fn,
         else:
             key = (cby, None)
 
-        date = datetime.strptime(lu.cDate[:-8], '%m/%d/%Y %H:%M:%S')
+        date = datetime.strptime(lu['cDate'][:-8], '%m/%d/%Y %H:%M:%S')
 
         cby_prov_to_cdates[key].append(date)
 
+    return cby_prov_to_cdates
+
 
+def add_provenance_activities(g,
+                              cby_prov_to_cdates,
+                              lexicon_uri,
+                              PROV,
+                              language):
+    """
+    add a software agent per cBy and a provenance activity per (cBy, provenance),
+    which starts at the first and ends at the last creation date of its LUs
+
+    :param dict cby_prov_to_cdates: see get_cby_prov_to_cdates
+    """
     cby_prov_to_prov_obj = {}
     for (cby, provenance), dates in cby_prov_to_cdates.items():
         # add software agent
@@ -408,12 +587,9 @@ def add_agents_and_provenances(your_fn,
         g.add((software_agent_obj, RDFS.label, Literal(cby, lang=language)))
 
         # add provenance
-        if provenance is not None:
-            provenance_uri = f'{lexicon_uri}#Provenance#{cby}-{provenance}'
-        else:
-            provenance_uri = f'{lexicon_uri}#Provenance#{cby}'
-
-        provenance_obj = URIRef(provenance_uri)
+        provenance_obj = get_provenance_obj(lexicon_uri=lexicon_uri,
+                                            cby=cby,
+                                            provenance=provenance)
         g.add((provenance_obj, RDF.type, PROV.Activity))
 
         start = min(dates)
@@ -434,64 +610,38 @@ def add_agents_and_provenances(your_fn,
     return cby_prov_to_prov_obj
 
 
-
-
-def convert_to_lemon(lemon,
-                     premon_nt_path,
-                     ontolex,
-                     fn_pos_to_lexinfo,
-                     your_fn,
-                     namespace,
-                     namespace_prefix,
-                     language,
-                     major_version,
-                     minor_version,
-                     output_path=None,
-                     verbose=0):
+def add_agents_and_provenances(your_fn,
+                               g,
+                               lexicon_uri,
+                               PROV,
+                               language,
+                               verbose=0):
     """
-    Convert the FrameNet in NLTK format to Lemon
-    https://lemon-model.net/lemon#
 
-    :param rdflib.graph.Graph lemon: use FrameNetNLTK.lemon
-    :param rdflib.graph.Graph premon: use FrameNetNLTK.premon_nt
-    :param rdflib.graph.Graph ontolex: use FrameNetNLTK.ontolex
-    :param dict fn_pos_to_lexinfo: use FrameNetNLTK.fn_pos_to_lexinfo
-    :param nltk.corpus.reader.framenet.FramenetCorpusReader your_fn: a FrameNet in the NLTK format
-    :param str namespace: a namespace.
-    for Dutch, we use http://rdf.cltl.nl/dfn/
-    for English, we use http://rdf.cltl.nl/efn/
-    :param str namespace_prefix: e.g., dfn for Dutch FrameNet
-    :param str language: supported: nld | eng
-    :param int major_version: the major version
-    :param int minor_version: the minor version
+    :param your_fn: your framenet in nltk format
+    :param g: the lemon graph of your framenet
+    :param verbose:
+    :return:
+    """
+    cby_prov_to_cdates = get_cby_prov_to_cdates(your_fn.lus())
+
+    return add_provenance_activities(g=g,
+                                     cby_prov_to_cdates=cby_prov_to_cdates,
+                                     lexicon_uri=lexicon_uri,
+                                     PROV=PROV,
+                                     language=language)
+
+
+def add_lexicon_header(g,
+                       namespace,
+                       namespace_prefix,
+                       language,
+                       major_version,
+                       minor_version,
+                       lexicon_uri):
+    """
+    bind the prefixes and add our own relationships (see initialize_graph) and the triples of the lexicon itself
     """
-    from .LexicalDataD2TAnnotationTool import lemmas_from_lu_name
-
-    # loading premon
-    premon = load_nt_graph(nt_path=premon_nt_path)
-
-    # validate parameters
-    error_message = f'{language} not part of supported languages: {SUPPORTED_LANGUAGES}'
-    assert language in SUPPORTED_LANGUAGES, error_message
-
-    # query for identifiers
-    lexicon_uri = generate_lexicon_rdf_uri(namespace=namespace,
-                                           language=language,
-                                           major_version=major_version,
-                                           minor_version=minor_version)
-    if verbose >= 2:
-        print(f'lexicon uri: {lexicon_uri}')
-
-
-    g = Graph()
-
-    LEMON = Namespace('http://lemon-model.net/lemon#')
-    DCT = Namespace('http://purl.org/dc/terms/')
-    LEXINFO = Namespace('http://www.lexinfo.net/ontology/3.0/lexinfo#')
-    ONTOLEX = Namespace('http://www.w3.org/ns/lemon/ontolex#')
-    PROV = Namespace('http://www.w3.org/ns/prov#')
-    skos_namespace = 'http://www.w3.org/2004/02/skos/core#'
-    SKOS =  Namespace(skos_namespace)
     FN = Namespace(namespace)
 
     g.bind('lemon', LEMON)
@@ -509,10 +659,8 @@ def convert_to_lemon(lemon,
     # update lexicon information
     lexicon_uri_obj = URIRef(lexicon_uri)
 
-    assert LEMON.Lexicon in lemon.subjects()
     g.add((lexicon_uri_obj, RDF.type, LEMON.Lexicon))
 
-    assert LEMON.language in lemon.subjects()
     g.add((lexicon_uri_obj, LEMON.language, Literal(language)))
 
     lexicon_label = f'{LANGUAGE_TO_ADJECTIVE[language]} FrameNet v{major_version}.{minor_version}'
@@ -522,204 +670,836 @@ def convert_to_lemon(lemon,
     g.add((lexicon_uri_obj, DCT.identifier, Literal(lexicon_version,
                                                     datatype=XSD.decimal)))
 
-    the_lu_iterable = list(your_fn.lus())
-
-    cby_prov_to_prov_obj = add_agents_and_provenances(your_fn=your_fn,
-                                                      g=g,
-                                                      lexicon_uri=lexicon_uri,
-                                                      PROV=PROV,
-                                                      language=language,
-                                                      verbose=verbose)
-
-    # update for each LE and LU
-    for index, lu in enumerate(the_lu_iterable):
 
-        provenance_obj = cby_prov_to_prov_obj[(lu.cBy, lu.get('provenance'))]
+def create_conversion_context(premon_index,
+                              fn_pos_to_lexinfo,
+                              namespace,
+                              language,
+                              major_version,
+                              minor_version,
+                              lexicon_uri,
+                              lu_ids):
+    """
+    compute once what is needed to convert each LU to Lemon (see add_lu_to_graph).
 
-        if verbose >= 3:
-            print(f'convert LU {lu.ID} ({lu.name}) to Lemon')
+    The URIs of the LexicalEntries only depend on the lu identifiers (see generate_le_and_lu_rdf_uri),
+    such that the LexicalEntry of a component of a compound (lexeme attribute lu_id)
+    is known before the LU of the component is converted, also when it is converted by another worker.
 
-        if all([verbose >= 5,
-                index == 5]):
-            print('QUITTING AFTER FIRST FIVE ITERATIONS TOP')
-            break
+    :param set lu_ids: the lu identifiers of the lexicon
 
-        # generate LE and LU rdf uri
-        le_uri, leform_uri, lu_uri = generate_le_and_lu_rdf_uri(your_fn=your_fn,
+    :rtype: dict
+    """
+    lu_id_to_le_obj = {}
+    for lu_id in lu_ids:
+        le_uri, leform_uri, lu_uri = generate_le_and_lu_rdf_uri(your_fn=None,
                                                                 namespace=namespace,
                                                                 language=language,
                                                                 major_version=major_version,
                                                                 minor_version=minor_version,
-                                                                lu_id=lu.ID)
+                                                                lu_id=lu_id,
+                                                                lu_ids=lu_ids)
+        lu_id_to_le_obj[lu_id] = URIRef(le_uri)
+
+    return {
+        'premon_index' : premon_index,
+        'fn_pos_to_lexinfo' : fn_pos_to_lexinfo,
+        'namespace' : namespace,
+        'language' : language,
+        'major_version' : major_version,
+        'minor_version' : minor_version,
+        'lexicon_uri' : lexicon_uri,
+        'lu_ids' : lu_ids,
+        'lu_id_to_le_obj' : lu_id_to_le_obj
+    }
 
 
-        # update LE information
-        le_obj = URIRef(le_uri)
-        assert LEMON.LexicalEntry in lemon.subjects()
-        g.add((le_obj, RDF.type, LEMON.LexicalEntry))
+def add_lu_to_graph(g, lu, context):
+    """
+    add the Lemon representation of one LU to g,
+    i.e., its LexicalEntry, Form and LexicalSense, and the decomposition of compounds and phrases
+
+    :param g: an rdflib.graph.Graph or another object with the method add, e.g., an NTriplesWriter
+    :param nltk.corpus.reader.framenet.AttrDict lu: FrameNet NLTK LU object
+    :param dict context: see create_conversion_context
+    """
+    from .LexicalDataD2TAnnotationTool import lemmas_from_lu_name
+
+    premon_index = context['premon_index']
+    fn_pos_to_lexinfo = context['fn_pos_to_lexinfo']
+    language = context['language']
+    lu_id_to_le_obj = context['lu_id_to_le_obj']
+    lexicon_uri_obj = URIRef(context['lexicon_uri'])
+
+    provenance_obj = get_provenance_obj(lexicon_uri=context['lexicon_uri'],
+                                        cby=lu.cBy,
+                                        provenance=lu.get('provenance'))
+
+    # generate LE and LU rdf uri
+    le_uri, leform_uri, lu_uri = generate_le_and_lu_rdf_uri(your_fn=None,
+                                                            namespace=context['namespace'],
+                                                            language=language,
+                                                            major_version=context['major_version'],
+                                                            minor_version=context['minor_version'],
+                                                            lu_id=lu.ID,
+                                                            lu_ids=context['lu_ids'])
+
+
+    # update LE information
+    le_obj = URIRef(le_uri)
+    g.add((le_obj, RDF.type, LEMON.LexicalEntry))
+
+    # provenance LE
+    date = get_date(cDate=lu.cDate)
+    g.add((le_obj, PROV.generatedAtTime, Literal(date,
+                                                 datatype=XSD.dateTime)))
+    g.add((le_obj, PROV.wasGeneratedBy, provenance_obj))
 
-        # provenance LE
-        date = get_date(cDate=lu.cDate)
-        g.add((le_obj, PROV.generatedAtTime, Literal(date,
-                                                     datatype=XSD.dateTime)))
-        g.add((le_obj, PROV.wasGeneratedBy, provenance_obj))
+    g.add((le_obj,
+           LEXINFO.partOfSpeech,
+           URIRef(fn_pos_to_lexinfo[lu.POS]))
+           )
 
-        g.add((le_obj,
-               LEXINFO.partOfSpeech,
-               URIRef(fn_pos_to_lexinfo[lu.POS]))
-               )
+    # update LE form
+    lemma, pos = lu.name.rsplit('.', 1)
+    le_form_obj = URIRef(leform_uri)
+    g.add((le_form_obj, RDFS.isDefinedBy, le_obj))
+    g.add((le_form_obj, RDF.type, LEMON.Form))
 
-        # update LE form
-        lemma, pos = lu.name.rsplit('.', 1)
-        le_form_obj = URIRef(leform_uri)
-        g.add((le_form_obj, RDFS.isDefinedBy, le_obj))
-        assert LEMON.Form in lemon.subjects()
-        g.add((le_form_obj, RDF.type, LEMON.Form))
-        assert LEMON.writtenRep in lemon.subjects()
+    for lemma_variant in lemmas_from_lu_name(lemma):
+        g.add((le_form_obj, LEMON.writtenRep, Literal(lemma_variant, lang=language)))
 
-        for lemma_variant in lemmas_from_lu_name(lemma):
-            g.add((le_form_obj, LEMON.writtenRep, Literal(lemma_variant, lang=language)))
+    g.add((le_obj, LEMON.canonicalForm, le_form_obj))
 
-        assert LEMON.canonicalForm in lemon.subjects()
-        g.add((le_obj, LEMON.canonicalForm, le_form_obj))
+    # update LU information
 
-        # update LU information
 
+    lu_obj = URIRef(lu_uri)
 
-        lu_obj = URIRef(lu_uri)
+    # provenance LU
+    g.add((lu_obj, PROV.generatedAtTime, Literal(date,
+                                                 datatype=XSD.dateTime)))
+    g.add((lu_obj, PROV.wasGeneratedBy, provenance_obj))
 
-        # provenance LU
-        date = get_date(cDate=lu.cDate)
-        g.add((lu_obj, PROV.generatedAtTime, Literal(date,
-                                                     datatype=XSD.dateTime)))
-        g.add((lu_obj, PROV.wasGeneratedBy, provenance_obj))
+    g.add((le_obj, LEMON.sense, lu_obj))
+    g.add((lu_obj, RDF.type, LEMON.LexicalSense))
+    g.add((lu_obj, DCT.identifier, Literal(lu.ID,
+                                          datatype=XSD.integer)))
+    g.add((lu_obj, LEMON.isSenseOf, le_obj))
 
-        assert LEMON.sense in lemon.subjects()
-        g.add((le_obj, LEMON.sense, lu_obj))
-        assert LEMON.LexicalSense in lemon.subjects()
-        g.add((lu_obj, RDF.type, LEMON.LexicalSense))
-        g.add((lu_obj, DCT.identifier, Literal(lu.ID,
-                                              datatype=XSD.integer)))
-        assert LEMON.isSenseOf in lemon.subjects()
-        g.add((lu_obj, LEMON.isSenseOf, le_obj))
+    g.add((lu_obj, LEMON.definition, Literal(lu.definition,
+                                             lang=language)))
 
-        assert LEMON.definition in lemon.subjects()
-        g.add((lu_obj, LEMON.definition, Literal(lu.definition,
-                                                 lang=language)))
 
+    # update with SKOS relationships to external references
+    table = {ord('{'): '', ord('}'): ''}
+    for attr_name, attr_value in lu.items():
+        if attr_name.startswith('{%s}' % SKOS_NAMESPACE):
+            skos_pred_uri = attr_name.translate(table)
+            skos_pred_uriref = URIRef(skos_pred_uri)
+            value_uriref = URIRef(attr_value)
+            g.add((lu_obj, skos_pred_uriref, value_uriref))
 
-        # update with SKOS relationships to external references
-        table = {ord('{'): '', ord('}'): ''}
-        for attr_name, attr_value in lu.items():
-            if attr_name.startswith('{%s}' % skos_namespace):
-                skos_pred_uri = attr_name.translate(table)
-                skos_pred_uriref = URIRef(skos_pred_uri)
-                value_uriref = URIRef(attr_value)
-                g.add((lu_obj, skos_pred_uriref, value_uriref))
+    # evokes relationship
+    frame_uri = lookup_frame_uri(premon_index=premon_index,
+                                 frame_label=lu.frame.name)
+    frame_obj = URIRef(frame_uri)
 
-        # evokes relationship
-        frame_uri = get_rdf_uri(premon_nt=premon,
-                                frame_label=lu.frame.name)
-        frame_obj = URIRef(frame_uri)
+    # add incorporatedFE if it is there
+    incorporated_fe_label = lu.get('incorporatedFE', None)
 
-        # add incorporatedFE if it is there
-        incorporated_fe_label = lu.get('incorporatedFE', None)
+    # mistakes in English FrameNet
+    if all([frame_uri == 'http://premon.fbk.eu/resource/fn17-measurable_attributes',
+            incorporated_fe_label == 'Dimension']):
+        incorporated_fe_label = None
 
-        # mistakes in English FrameNet
-        if all([frame_uri == 'http://premon.fbk.eu/resource/fn17-measurable_attributes',
-                incorporated_fe_label == 'Dimension']):
-            incorporated_fe_label = None
+    if incorporated_fe_label is not None:
+        fe_uri = lookup_fe_uri(premon_index=premon_index, frame_uri=frame_uri, fe_label=incorporated_fe_label)
+        attr_obj = URIRef(COMP_ATTR_TO_URL['incorporatedFE'])
+        g.add((lu_obj, attr_obj, URIRef(fe_uri)))
 
-        if incorporated_fe_label is not None:
-            fe_uri = get_fe_uri(graph=premon, frame_uri=frame_uri, fe_label=incorporated_fe_label)
-            attr_obj = URIRef(COMP_ATTR_TO_URL['incorporatedFE'])
-            g.add((lu_obj, attr_obj, URIRef(fe_uri)))
+    g.add((le_obj, ONTOLEX.evokes, frame_obj))
 
-        assert frame_obj in premon.subjects()
-        assert ONTOLEX.evokes in ontolex.subjects()
-        g.add((le_obj, ONTOLEX.evokes, frame_obj))
+    g.add((lexicon_uri_obj, LEMON.entry, le_obj))
 
-        assert LEMON.entry in lemon.subjects()
-        assert frame_obj
-        g.add((lexicon_uri_obj, LEMON.entry, le_obj))
+    # LU type
+    lu_type,\
+    lu_type_obj = get_lu_type(lu=lu, language=language)
+
+    if lu_type_obj is not None:
+        g.add((le_obj, RDF.type, lu_type_obj))
+
+    word_or_phrase = get_word_or_phrase(lu_type=lu_type,
+                                        lexemes=lu.lexemes,
+                                        language=language,
+                                        LEMON=LEMON)
+
+    g.add((le_obj, RDF.type, word_or_phrase))
+
+    if language == 'nld':
+        if lu_type == 'singleton':
+            return
+        elif lu_type in {'endocentric compound',
+                         'exocentric compound',
+                         'idiom',
+                         'phrasal'}:
+            add_decomposition(g=g,
+                              fn_pos_to_lexinfo=fn_pos_to_lexinfo,
+                              frame_uri=frame_uri,
+                              lu=lu,
+                              LEMON=LEMON,
+                              LEXINFO=LEXINFO,
+                              premon_index=premon_index,
+                              le_obj=le_obj,
+                              lu_id_to_le_obj=lu_id_to_le_obj)
+        else:
+            raise Exception(f'lu type ({lu_type}) not known')
+
+    elif language == 'eng':
+        if word_or_phrase == LEMON.Phrase:
+            add_decomposition(g=g,
+                              fn_pos_to_lexinfo=fn_pos_to_lexinfo,
+                              frame_uri=frame_uri,
+                              lu=lu,
+                              LEMON=LEMON,
+                              LEXINFO=LEXINFO,
+                              premon_index=premon_index,
+                              le_obj=le_obj,
+                              lu_id_to_le_obj=lu_id_to_le_obj)
+
+
+def add_lexicon_to_graph(g,
+                         lemon,
+                         ontolex,
+                         premon_index,
+                         fn_pos_to_lexinfo,
+                         your_fn,
+                         namespace,
+                         namespace_prefix,
+                         language,
+                         major_version,
+                         minor_version,
+                         lexicon_uri,
+                         verbose=0):
+    """
+    add the Lemon representation of a FrameNet to g (see convert_to_lemon for the parameters).
+    The LUs are loaded per task (see get_lemon_tasks and iterate_lus_of_tasks),
+    such that memory use does not grow with the size of the lexicon if g is an NTriplesWriter.
+
+    :param g: an rdflib.graph.Graph or another object with the methods add and bind, e.g., an NTriplesWriter
+    """
+    validate_vocabularies(lemon=lemon,
+                          ontolex=ontolex,
+                          LEMON=LEMON,
+                          ONTOLEX=ONTOLEX)
+
+    add_lexicon_header(g=g,
+                       namespace=namespace,
+                       namespace_prefix=namespace_prefix,
+                       language=language,
+                       major_version=major_version,
+                       minor_version=minor_version,
+                       lexicon_uri=lexicon_uri)
+
+    from .lexicon_utils import read_lexunit_creation_info
+
+    fn_root = str(your_fn.root)
+    tasks = get_lemon_tasks(your_fn=your_fn)
+    lu_ids = {lu_id
+              for task_index, task_lu_ids in tasks
+              for lu_id in task_lu_ids}
+
+    context = create_conversion_context(premon_index=premon_index,
+                                        fn_pos_to_lexinfo=fn_pos_to_lexinfo,
+                                        namespace=namespace,
+                                        language=language,
+                                        major_version=major_version,
+                                        minor_version=minor_version,
+                                        lexicon_uri=lexicon_uri,
+                                        lu_ids=lu_ids)
+
+    # the provenance activities require the creation dates of all LUs, which are read without loading the LUs
+    lu_id_to_creation_info = read_lexunit_creation_info(root=fn_root, lu_ids=lu_ids)
+    add_provenance_activities(g=g,
+                              cby_prov_to_cdates=get_cby_prov_to_cdates(lu_id_to_creation_info.values()),
+                              lexicon_uri=lexicon_uri,
+                              PROV=PROV,
+                              language=language)
 
-    for index, lu in enumerate(the_lu_iterable):
+    # update for each LE and LU
+    for lu in iterate_lus_of_tasks(fn_root=fn_root, tasks=tasks):
 
         if verbose >= 3:
             print(f'convert LU {lu.ID} ({lu.name}) to Lemon')
 
-        if all([verbose >= 5,
-                index >= 5]):
-            print('QUITTING AFTER FIRST FIVE ITERATIONS BOTTOM')
-            break
+        add_lu_to_graph(g=g, lu=lu, context=context)
+
+
+def get_lemon_tasks(your_fn, lus_per_task=LEMON_LUS_PER_TASK):
+    """
+    partition the LUs of a lexicon by frame.
+    The LUs are those of your_fn.lus(), i.e., LUs with a status in your_fn._bad_statuses are left out
+    (see your_fn.lu_ids_and_names). Their frames are obtained from luIndex.xml.
+    The LUs of a frame are part of the same task.
+
+    :rtype: list
+    :return: list of (task index, list of lu identifiers)
+    """
+    from .lexicon_utils import read_luindex_files
+
+    lu_ids = your_fn.lu_ids_and_names()
+
+    lu_id_to_frame = {}
+    for record in read_luindex_files([os.path.join(str(your_fn.root), 'luIndex.xml')]):
+        if record['lu_id'] in lu_ids:
+            lu_id_to_frame.setdefault(record['lu_id'], record['frame'])
+
+    frame_to_lu_ids = defaultdict(list)
+    for lu_id in lu_ids:
+        frame_to_lu_ids[lu_id_to_frame.get(lu_id, '')].append(lu_id)
+
+    tasks = []
+    task_lu_ids = []
+    for frame_label in sorted(frame_to_lu_ids):
+        task_lu_ids.extend(sorted(frame_to_lu_ids[frame_label]))
+        if len(task_lu_ids) >= lus_per_task:
+            tasks.append((len(tasks), task_lu_ids))
+            task_lu_ids = []
+
+    if task_lu_ids:
+        tasks.append((len(tasks), task_lu_ids))
+
+    return tasks
+
+
+def iterate_lus_of_tasks(fn_root, tasks):
+    """
+    iterate over the FrameNet NLTK LU objects of the tasks of get_lemon_tasks.
+    NLTK's FramenetCorpusReader keeps every frame and LU that it loaded in memory,
+    hence the LUs of each task are loaded by a FramenetCorpusReader of their own,
+    which is released when the next task starts.
+
+    :param str fn_root: the folder of the lexicon, i.e., your_fn.root
+    :param list tasks: see get_lemon_tasks
+    """
+    from nltk.corpus.reader.framenet import FramenetCorpusReader
+
+    for task_index, lu_ids in tasks:
+        task_fn = FramenetCorpusReader(fn_root, ['frameIndex.xml'])
+        for lu_id in lu_ids:
+            yield task_fn.lu(lu_id)
+
+
+def set_lemon_worker_context(fn_root, context, shard_dir):
+    """
+    initializer of the workers of convert_to_lemon: each worker loads the lexicon itself
+    """
+    from nltk.corpus.reader.framenet import FramenetCorpusReader
+
+    register_lemon_urls(namespace=context['namespace'])
+
+    LEMON_WORKER_CONTEXT['your_fn'] = FramenetCorpusReader(fn_root, ['frameIndex.xml'])
+    LEMON_WORKER_CONTEXT['context'] = context
+    LEMON_WORKER_CONTEXT['shard_dir'] = shard_dir
+
 
-        # obtain LE obj
-        le_obj = get_le_uri(g=g,
-                            DCT=DCT,
-                            LEMON=LEMON,
-                            lu_identifier=lu.ID)
+def convert_lus_in_worker(task):
+    """
+    worker of convert_to_lemon: write the Lemon representation of the LUs of a task to a shard in N-Triples
+
+    :param tuple task: see get_lemon_tasks
 
-        # LU type
-        lu_type,\
-        lu_type_obj = get_lu_type(lu=lu, language=language)
+    :rtype: tuple
+    :return: (path of the shard, see get_cby_prov_to_cdates)
+    """
+    task_index, lu_ids = task
+    your_fn = LEMON_WORKER_CONTEXT['your_fn']
+    shard_path = os.path.join(LEMON_WORKER_CONTEXT['shard_dir'], f'shard{task_index}.nt')
+
+    lus = [your_fn.lu(lu_id) for lu_id in lu_ids]
+
+    shard = NTriplesWriter(shard_path)
+    try:
+        for lu in lus:
+            add_lu_to_graph(g=shard, lu=lu, context=LEMON_WORKER_CONTEXT['context'])
+    except BaseException:
+        shard.abort()
+        raise
+    shard.close()
+
+    return shard_path, dict(get_cby_prov_to_cdates(lus))
+
+
+def add_lexicon_to_graph_in_parallel(g,
+                                     lemon,
+                                     ontolex,
+                                     premon_index,
+                                     fn_pos_to_lexinfo,
+                                     your_fn,
+                                     namespace,
+                                     namespace_prefix,
+                                     language,
+                                     major_version,
+                                     minor_version,
+                                     lexicon_uri,
+                                     num_processes,
+                                     shard_dir,
+                                     verbose=0):
+    """
+    add the Lemon representation of a FrameNet to g (see add_lexicon_to_graph)
+    using num_processes workers, which each convert the LUs of a number of frames (see get_lemon_tasks)
+    to a shard in N-Triples in shard_dir.
+    The shards are merged into g after the provenance activities were added,
+    which require the creation dates of all LUs.
+    """
+    validate_vocabularies(lemon=lemon,
+                          ontolex=ontolex,
+                          LEMON=LEMON,
+                          ONTOLEX=ONTOLEX)
+
+    tasks = get_lemon_tasks(your_fn=your_fn)
+
+    context = create_conversion_context(premon_index=premon_index,
+                                        fn_pos_to_lexinfo=fn_pos_to_lexinfo,
+                                        namespace=namespace,
+                                        language=language,
+                                        major_version=major_version,
+                                        minor_version=minor_version,
+                                        lexicon_uri=lexicon_uri,
+                                        lu_ids={lu_id
+                                                for task_index, lu_ids in tasks
+                                                for lu_id in lu_ids})
 
-        if lu_type_obj is not None:
-            g.add((le_obj, RDF.type, lu_type_obj))
+    if verbose >= 2:
+        print(f'converting {len(context["lu_ids"])} LUs in {len(tasks)} task(s) using {num_processes} process(es)')
 
-        word_or_phrase = get_word_or_phrase(lu_type=lu_type,
-                                            lexemes=lu.lexemes,
-                                            language=language,
-                                            LEMON=LEMON,
-                                            lemon=lemon)
+    with Pool(num_processes,
+              initializer=set_lemon_worker_context,
+              initargs=(str(your_fn.root), context, shard_dir)) as pool:
+        results = pool.map(convert_lus_in_worker, tasks)
 
-        g.add((le_obj, RDF.type, word_or_phrase))
+    cby_prov_to_cdates = defaultdict(list)
+    for shard_path, shard_cby_prov_to_cdates in results:
+        for key, dates in shard_cby_prov_to_cdates.items():
+            cby_prov_to_cdates[key].extend(dates)
+
+    add_lexicon_header(g=g,
+                       namespace=namespace,
+                       namespace_prefix=namespace_prefix,
+                       language=language,
+                       major_version=major_version,
+                       minor_version=minor_version,
+                       lexicon_uri=lexicon_uri)
+
+    add_provenance_activities(g=g,
+                              cby_prov_to_cdates=cby_prov_to_cdates,
+                              lexicon_uri=lexicon_uri,
+                              PROV=PROV,
+                              language=language)
+
+    for shard_path, shard_cby_prov_to_cdates in results:
+        if isinstance(g, NTriplesWriter):
+            g.add_ntriples_file(shard_path)
+        else:
+            g.parse(shard_path, format='nt')
 
-        # evokes relationship
-        frame_uri = get_rdf_uri(premon_nt=premon,
-                                frame_label=lu.frame.name)
+        if verbose >= 3:
+            print(f'merged {shard_path}')
 
 
-        if language == 'nld':
-            if lu_type == 'singleton':
+def get_fingerprints_path(output_path):
+    """
+    the path of the fingerprints of the LUs of an export (see convert_to_lemon with incremental=True)
+    """
+    return f'{output_path}{FINGERPRINTS_SUFFIX}'
+
+
+def compute_lu_fingerprints(your_fn):
+    """
+    compute a fingerprint per LU of a lexicon, i.e., the sha1 hash of what is converted to Lemon (see add_lu_to_graph):
+    the attributes of the LU as loaded by NLTK's FramenetCorpusReader, its lexemes, and its frame.
+    The LUs are exactly those of your_fn.lus(), such that LUs with a status in your_fn._bad_statuses,
+    e.g., Problem, are left out as in a full export.
+
+    :param your_fn: your FrameNet in the NLTK format
+
+    :rtype: dict
+    :return: lu_id -> {fingerprint, frame, cBy, provenance, cDate, referenced_lu_ids}
+    """
+    from .lexicon_utils import get_referenced_lu_ids
+
+    fingerprints = {}
+    for lu in your_fn.lus():
+        # the other values, e.g., the frame and the annotations, are not part of the Lemon representation of the LU
+        attributes = {attr_name : value
+                      for attr_name, value in lu.items()
+                      if isinstance(value, (str, int, float))}
+        lexemes = [dict(lexeme) for lexeme in lu.lexemes]
+        content = json.dumps([attributes, lexemes, lu.frame.name], sort_keys=True, default=str)
+
+        fingerprints[lu.ID] = {
+            'fingerprint' : hashlib.sha1(content.encode('utf-8')).hexdigest(),
+            'frame' : lu.frame.name,
+            'cBy' : lu.cBy,
+            'provenance' : lu.get('provenance'),
+            'cDate' : lu.cDate,
+            'referenced_lu_ids' : get_referenced_lu_ids(lu.lexemes)
+        }
+
+    return fingerprints
+
+
+def write_fingerprints(fingerprints_path, settings, fingerprints):
+    """
+    store the fingerprints of an export (see compute_lu_fingerprints) as JSON
+
+    :param dict settings: the parameters of convert_to_lemon that determine the triples of an LU
+    """
+    lus = {str(lu_id) : dict(info, referenced_lu_ids=sorted(info['referenced_lu_ids']))
+           for lu_id, info in fingerprints.items()}
+
+    tmp_path = f'{fingerprints_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as outfile:
+        json.dump({'settings' : settings, 'lus' : lus}, outfile)
+    os.replace(tmp_path, fingerprints_path)
+
+
+def load_fingerprints(fingerprints_path):
+    """
+    :rtype: tuple
+    :return: (settings, fingerprints) (see write_fingerprints), (None, None) if there are none
+    """
+    if not os.path.exists(fingerprints_path):
+        return None, None
+
+    with open(fingerprints_path) as infile:
+        try:
+            stored = json.load(infile)
+        except ValueError:
+            return None, None
+
+    fingerprints = {int(lu_id) : dict(info, referenced_lu_ids=set(info['referenced_lu_ids']))
+                    for lu_id, info in stored['lus'].items()}
+    return stored['settings'], fingerprints
+
+
+def get_lu_row_pattern(lexicon_uri):
+    """
+    a regular expression that matches the N-Triples rows of an LU (see add_lu_to_graph),
+    i.e., rows of which the subject is its LexicalEntry (or one of its Components), Form, LexicalSense,
+    or one of its ComponentLists (see get_component_list_id), and the lemon:entry row of its LexicalEntry.
+    The first or second group is the lu identifier.
+    """
+    escaped_uri = re.escape(lexicon_uri)
+    return re.compile(f'^(?:<{escaped_uri}-(?:le|leform|lu)-(\\d+)[>#]'
+                      f'|_:lu(\\d+)ComponentList'
+                      f'|<{escaped_uri}> <{re.escape(str(LEMON.entry))}> <{escaped_uri}-le-(\\d+)>)')
+
+
+def get_lu_id_of_row(row, lu_row_pattern):
+    """
+    :param str row: a triple in the N-Triples format
+    :param lu_row_pattern: see get_lu_row_pattern
+
+    :rtype: int
+    :return: the lu identifier of the LU to which the row belongs, None if the row does not belong to an LU,
+    e.g., the rows of the lexicon header and of the provenance activities
+    """
+    match = lu_row_pattern.match(row)
+    if match is None:
+        return None
+
+    for lu_id in match.groups():
+        if lu_id is not None:
+            return int(lu_id)
+
+
+def add_lexicon_to_graph_incrementally(g,
+                                       lemon,
+                                       ontolex,
+                                       premon_index,
+                                       fn_pos_to_lexinfo,
+                                       your_fn,
+                                       namespace,
+                                       namespace_prefix,
+                                       language,
+                                       major_version,
+                                       minor_version,
+                                       lexicon_uri,
+                                       previous_output_path,
+                                       previous_fingerprints,
+                                       fingerprints,
+                                       verbose=0):
+    """
+    add the Lemon representation of a FrameNet to g (see add_lexicon_to_graph)
+    by reusing the rows of the LUs of a previous export in N-Triples that did not change.
+
+    Only the LUs that were added or changed (see compute_lu_fingerprints) are converted again,
+    together with the compounds that refer to an added, changed or removed LU.
+    The rows of the removed LUs are left out.
+    The lexicon header and the provenance activities are always added again,
+    such that the time ranges of the activities cover the creation dates of the current LUs.
+
+    :param str previous_output_path: the previous export in N-Triples (gzipped if it ends with .gz)
+    :param dict previous_fingerprints: the fingerprints of the previous export (see load_fingerprints)
+    :param dict fingerprints: the fingerprints of the current lexicon (see compute_lu_fingerprints)
+
+    :rtype: dict
+    :return: added | changed | removed | dependent -> set of lu identifiers
+    """
+    validate_vocabularies(lemon=lemon,
+                          ontolex=ontolex,
+                          LEMON=LEMON,
+                          ONTOLEX=ONTOLEX)
+
+    added = set(fingerprints) - set(previous_fingerprints)
+    removed = set(previous_fingerprints) - set(fingerprints)
+    changed = {lu_id
+               for lu_id, info in fingerprints.items()
+               if lu_id in previous_fingerprints and
+               info['fingerprint'] != previous_fingerprints[lu_id]['fingerprint']}
+    modified = added | changed | removed
+    dependent = {lu_id
+                 for lu_id, info in fingerprints.items()
+                 if lu_id not in modified and info['referenced_lu_ids'] & modified}
+    to_convert = added | changed | dependent
+
+    if verbose >= 2:
+        print(f'incremental export: {len(added)} added, {len(changed)} changed, {len(removed)} removed, '
+              f'{len(dependent)} dependent LU(s)')
+
+    add_lexicon_header(g=g,
+                       namespace=namespace,
+                       namespace_prefix=namespace_prefix,
+                       language=language,
+                       major_version=major_version,
+                       minor_version=minor_version,
+                       lexicon_uri=lexicon_uri)
+
+    cby_prov_to_cdates = defaultdict(list)
+    for info in fingerprints.values():
+        date = datetime.strptime(info['cDate'][:-8], '%m/%d/%Y %H:%M:%S')
+        cby_prov_to_cdates[(info['cBy'], info['provenance'])].append(date)
+
+    add_provenance_activities(g=g,
+                              cby_prov_to_cdates=cby_prov_to_cdates,
+                              lexicon_uri=lexicon_uri,
+                              PROV=PROV,
+                              language=language)
+
+    # reuse the rows of the LUs that did not change
+    lu_row_pattern = get_lu_row_pattern(lexicon_uri)
+    opener = gzip.open if previous_output_path.endswith('.gz') else open
+    with opener(previous_output_path, 'rt', encoding='utf-8') as infile:
+        for row in infile:
+            lu_id = get_lu_id_of_row(row, lu_row_pattern)
+            if lu_id is None or lu_id in to_convert or lu_id in removed:
                 continue
-            elif lu_type in {'endocentric compound',
-                             'exocentric compound',
-                             'idiom',
-                             'phrasal'}:
-                add_decomposition(g=g,
-                                  fn_pos_to_lexinfo=fn_pos_to_lexinfo,
-                                  frame_uri=frame_uri,
-                                  lu=lu,
-                                  DCT=DCT,
-                                  LEMON=LEMON,
-                                  LEXINFO=LEXINFO,
-                                  lemon=lemon,
-                                  premon=premon,
-                                  le_obj=le_obj)
-            else:
-                raise Exception(f'lu type ({lu_type}) not known')
-
-        elif language == 'eng':
-            if word_or_phrase == LEMON.Phrase:
-                add_decomposition(g=g,
-                                  fn_pos_to_lexinfo=fn_pos_to_lexinfo,
-                                  frame_uri=frame_uri,
-                                  lu=lu,
-                                  DCT=DCT,
-                                  LEMON=LEMON,
-                                  LEXINFO=LEXINFO,
-                                  lemon=lemon,
-                                  premon=premon,
-                                  le_obj=le_obj)
+            g.add_row(row)
 
+    context = create_conversion_context(premon_index=premon_index,
+                                        fn_pos_to_lexinfo=fn_pos_to_lexinfo,
+                                        namespace=namespace,
+                                        language=language,
+                                        major_version=major_version,
+                                        minor_version=minor_version,
+                                        lexicon_uri=lexicon_uri,
+                                        lu_ids=set(fingerprints))
 
-    if output_path is not None:
+    for lu_id in sorted(to_convert):
+        lu = your_fn.lu(lu_id)
+
+        if verbose >= 3:
+            print(f'convert LU {lu.ID} ({lu.name}) to Lemon')
+
+        add_lu_to_graph(g=g, lu=lu, context=context)
+
+    return {
+        'added' : added,
+        'changed' : changed,
+        'removed' : removed,
+        'dependent' : dependent
+    }
+
+
+def convert_to_lemon(lemon,
+                     premon_nt_path,
+                     ontolex,
+                     fn_pos_to_lexinfo,
+                     your_fn,
+                     namespace,
+                     namespace_prefix,
+                     language,
+                     major_version,
+                     minor_version,
+                     output_path=None,
+                     output_format='turtle',
+                     turtle_output_path=None,
+                     num_processes=1,
+                     incremental=False,
+                     verbose=0):
+    """
+    Convert the FrameNet in NLTK format to Lemon
+    https://lemon-model.net/lemon#
+
+    :param rdflib.graph.Graph lemon: use FrameNetNLTK.lemon
+    :param str premon_nt_path: use FrameNetNLTK.premon_nt (the PreMOn index is built from it once, see load_premon_index)
+    :param rdflib.graph.Graph ontolex: use FrameNetNLTK.ontolex
+    :param dict fn_pos_to_lexinfo: use FrameNetNLTK.fn_pos_to_lexinfo
+    :param nltk.corpus.reader.framenet.FramenetCorpusReader your_fn: a FrameNet in the NLTK format
+    :param str namespace: a namespace.
+    for Dutch, we use http://rdf.cltl.nl/dfn/
+    for English, we use http://rdf.cltl.nl/efn/
+    :param str namespace_prefix: e.g., dfn for Dutch FrameNet
+    :param str language: supported: nld | eng
+    :param int major_version: the major version
+    :param int minor_version: the minor version
+    :param str output_path: if provided, the Lemon representation is written to it
+    :param str output_format: "turtle": the triples are collected in a graph, which is serialized to output_path.
+    "nt": the triples are streamed to output_path in the N-Triples format (gzipped if output_path ends with .gz)
+    while the LUs are converted, such that memory use does not grow with the size of the lexicon.
+    :param str turtle_output_path: if output_format is "nt", the N-Triples file is also converted to Turtle
+    (see convert_ntriples_to_turtle)
+    :param int num_processes: if higher than 1, the LUs are partitioned by frame
+    and converted by num_processes workers, which each load the lexicon from your_fn.root
+    (see add_lexicon_to_graph_in_parallel). The resulting triples are the same as when num_processes is 1,
+    i.e., the sorted N-Triples files are identical.
+    :param bool incremental: if True (requires output_format "nt"), a fingerprint per LU is stored next to output_path
+    (see get_fingerprints_path and compute_lu_fingerprints). If the fingerprints of an earlier export to output_path
+    with the same settings exist, only the LUs that were added or changed since then,
+    and the compounds that refer to added, changed or removed LUs, are converted again
+    (see add_lexicon_to_graph_incrementally). The sorted N-Triples file is identical to that of a full export.
+    Please use incremental=False once if the PreMOn file changed.
+    """
+    assert output_format in OUTPUT_FORMATS, f'output_format should be one of {OUTPUT_FORMATS}, you provided {output_format}'
+    if output_format == 'nt':
+        assert output_path is not None, 'please provide an output_path to stream the N-Triples to'
+    if incremental:
+        assert output_format == 'nt', 'an incremental export requires output_format "nt"'
+
+    if num_processes is None:
+        num_processes = os.cpu_count()
+
+    # loading premon
+    premon_index = load_premon_index(premon_nt_path=premon_nt_path,
+                                     verbose=verbose)
+
+    # validate parameters
+    error_message = f'{language} not part of supported languages: {SUPPORTED_LANGUAGES}'
+    assert language in SUPPORTED_LANGUAGES, error_message
+
+    # query for identifiers
+    lexicon_uri = generate_lexicon_rdf_uri(namespace=namespace,
+                                           language=language,
+                                           major_version=major_version,
+                                           minor_version=minor_version)
+    if verbose >= 2:
+        print(f'lexicon uri: {lexicon_uri}')
+
+    previous_fingerprints = None
+    if incremental:
+        fingerprints_path = get_fingerprints_path(output_path)
+        settings = {
+            'lexicon_uri' : lexicon_uri,
+            'premon_nt' : os.path.basename(premon_nt_path),
+            'fn_pos_to_lexinfo' : fn_pos_to_lexinfo
+        }
+        fingerprints = compute_lu_fingerprints(your_fn=your_fn)
+
+        previous_settings, previous_fingerprints = load_fingerprints(fingerprints_path)
+        if previous_settings != settings or not os.path.exists(output_path):
+            previous_fingerprints = None
+
+        if previous_fingerprints is None and verbose >= 1:
+            print(f'no earlier export with the same settings at {output_path}, all LUs are converted')
+
+    if output_format == 'nt':
+        g = NTriplesWriter(output_path)
+    else:
+        g = Graph()
+
+    try:
+        if previous_fingerprints is not None:
+            add_lexicon_to_graph_incrementally(g=g,
+                                               lemon=lemon,
+                                               ontolex=ontolex,
+                                               premon_index=premon_index,
+                                               fn_pos_to_lexinfo=fn_pos_to_lexinfo,
+                                               your_fn=your_fn,
+                                               namespace=namespace,
+                                               namespace_prefix=namespace_prefix,
+                                               language=language,
+                                               major_version=major_version,
+                                               minor_version=minor_version,
+                                               lexicon_uri=lexicon_uri,
+                                               previous_output_path=output_path,
+                                               previous_fingerprints=previous_fingerprints,
+                                               fingerprints=fingerprints,
+                                               verbose=verbose)
+        elif num_processes > 1:
+            shard_parent_dir = os.path.dirname(os.path.abspath(output_path)) if output_path is not None else None
+            shard_dir = tempfile.mkdtemp(prefix='lemon_shards_', dir=shard_parent_dir)
+            try:
+                add_lexicon_to_graph_in_parallel(g=g,
+                                                 lemon=lemon,
+                                                 ontolex=ontolex,
+                                                 premon_index=premon_index,
+                                                 fn_pos_to_lexinfo=fn_pos_to_lexinfo,
+                                                 your_fn=your_fn,
+                                                 namespace=namespace,
+                                                 namespace_prefix=namespace_prefix,
+                                                 language=language,
+                                                 major_version=major_version,
+                                                 minor_version=minor_version,
+                                                 lexicon_uri=lexicon_uri,
+                                                 num_processes=num_processes,
+                                                 shard_dir=shard_dir,
+                                                 verbose=verbose)
+            finally:
+                shutil.rmtree(shard_dir)
+        else:
+            add_lexicon_to_graph(g=g,
+                                 lemon=lemon,
+                                 ontolex=ontolex,
+                                 premon_index=premon_index,
+                                 fn_pos_to_lexinfo=fn_pos_to_lexinfo,
+                                 your_fn=your_fn,
+                                 namespace=namespace,
+                                 namespace_prefix=namespace_prefix,
+                                 language=language,
+                                 major_version=major_version,
+                                 minor_version=minor_version,
+                                 lexicon_uri=lexicon_uri,
+                                 verbose=verbose)
+    except BaseException:
+        if output_format == 'nt':
+            g.abort()
+        raise
+
+    if output_format == 'nt':
+        g.close()
+        if verbose >= 1:
+            print(f'streamed {g.num_written} triples of the Lemon representation of FrameNet '
+                  f'({major_version}.{minor_version} in language {language}) to {output_path}')
+
+        if incremental:
+            write_fingerprints(fingerprints_path=fingerprints_path,
+                               settings=settings,
+                               fingerprints=fingerprints)
+
+        if turtle_output_path is not None:
+            convert_ntriples_to_turtle(ntriples_path=output_path,
+                                       output_path=turtle_output_path,
+                                       namespaces=g.namespaces)
+            if verbose >= 1:
+                print(f'converted {output_path} to {turtle_output_path}')
+
+    elif output_path is not None:
         g.serialize(format='turtle', destination=output_path)
         if verbose >= 1:
             print(f'written Lemon representation of FrameNet ({major_version}.{minor_version} in language {language}) to {output_path}')
 
 
-
 def generate_lexicon_rdf_uri(namespace,
                              language,
                              major_version,
@@ -742,17 +1522,21 @@ def generate_le_and_lu_rdf_uri(your_fn,
                               language,
                               major_version,
                               minor_version,
-                              lu_id):
+                              lu_id,
+                              lu_ids=None):
     """
 
     :param str namespace: the RDF namespace, e.g., http://rdf.cltl.nl/
     :param str language: supported: nl | en
     :param int major_version: the major version
     :param int minor_version: the minor version
+    :param lu_ids: optional collection of the lu identifiers of your_fn (by default, obtained from your_fn)
     :return: (le_uri, leform_uri, lu_uri)
     """
+    if lu_ids is None:
+        lu_ids = your_fn.lu_ids_and_names()
     error_message = f'there is no lu for the provided lu_id ({lu_id}) in the provided FrameNet'
-    assert lu_id in your_fn.lu_ids_and_names(), error_message
+    assert lu_id in lu_ids, error_message
 
     error_message = f'the provided language ({language}) is not supported: {SUPPORTED_LANGUAGES}'
     assert language in SUPPORTED_LANGUAGES, error_message
@@ -802,6 +1586,99 @@ def load_graph(path, format='nt'):
     return g
 
 
+def get_pickle_cache_key():
+    """
+    the versions that a pickled cache depends on (see load_cached_graph and load_premon_index).
+    The cached objects are rdflib objects, of which the pickled form can change between rdflib versions.
+
+    :rtype: dict
+    """
+    return {'rdflib' : rdflib.__version__, 'pickle_protocol' : pickle.HIGHEST_PROTOCOL}
+
+
+def write_pickle_atomically(objs, output_path):
+    """
+    pickle one or more objects to output_path via a temporary file,
+    so that readers never see a partially written file.
+    """
+    tmp_path = f'{output_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as outfile:
+            for obj in objs:
+                pickle.dump(obj, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, output_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_cached_graph(path, format=None, cache_dir=None, verbose=0):
+    """
+    load an RDF file using an on-disk cache containing the parsed triples.
+    The cache is keyed by the size, mtime and sha1 hash of the source file and by the rdflib version
+    and pickle protocol (see get_pickle_cache_key). It is rebuilt when one of them changes
+    or when it cannot be unpickled.
+
+    :param str path: path to an RDF file, e.g., FrameNetNLTK.lemon_ttl_path
+    :param str format: rdflib format, e.g., ttl. If None, rdflib guesses it.
+    :param str cache_dir: folder in which the cache is stored (default: folder of path)
+
+    :rtype: rdflib.graph.Graph
+    """
+    if cache_dir is None:
+        cache_dir = os.path.dirname(os.path.realpath(path))
+    cache_path = os.path.join(cache_dir, f'{os.path.basename(path)}.graph.pickle')
+
+    cached_signature = None
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as infile:
+            try:
+                is_valid = pickle.load(infile) == get_pickle_cache_key()
+                if is_valid:
+                    cached_signature = pickle.load(infile)
+                    is_valid, signature = signature_is_valid(cached_signature, path)
+                if is_valid:
+                    namespaces, triples = pickle.load(infile)
+            except Exception: # e.g., an AttributeError or ImportError after an upgrade of rdflib
+                is_valid, signature = False, None
+
+        if is_valid:
+            g = Graph()
+            for prefix, namespace in namespaces:
+                g.bind(prefix, namespace)
+            g.addN((s, p, o, g) for s, p, o in triples)
+
+            if signature != cached_signature: # only the mtime changed
+                try:
+                    write_pickle_atomically([get_pickle_cache_key(), signature, (namespaces, triples)], cache_path)
+                except OSError as error:
+                    if verbose >= 1:
+                        print(f'unable to update cache for {path}: {error}')
+
+            if verbose >= 2:
+                print(f'loaded {path} from cache {cache_path}')
+            return g
+
+    g = Graph()
+    g.parse(path, format=format)
+
+    namespaces = list(g.namespaces())
+    triples = list(g)
+    signature = get_file_signature(path)
+    try:
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        write_pickle_atomically([get_pickle_cache_key(), signature, (namespaces, triples)], cache_path)
+        if verbose >= 2:
+            print(f'cached {path} at {cache_path}')
+    except OSError as error:
+        if verbose >= 1:
+            print(f'unable to write cache for {path}: {error}')
+
+    return g
+
+
 def get_rdf_uri(premon_nt, frame_label):
     frame_query = """SELECT ?s WHERE {
         ?s rdf:type <http://premon.fbk.eu/ontology/fn#Frame> .
@@ -884,6 +1761,160 @@ def get_fe_uri(graph, frame_uri, fe_label):
 
 
 
+PREMON_FRAME_TYPE = 'http://premon.fbk.eu/ontology/fn#Frame'
+PREMON_SEM_ROLE = 'http://premon.fbk.eu/ontology/core#semRole'
+
+
+class PremonIndexSink(object):
+    """
+    sink for the rdflib NTriplesParser that only keeps
+    the triples needed for the PreMOn index
+    """
+    def __init__(self):
+        self.frame_uris = set()
+        self.frame_uri_to_role_uris = defaultdict(set)
+        self.uri_to_labels = defaultdict(set)
+
+    def triple(self, s, p, o):
+        if p == RDF.type and str(o) == PREMON_FRAME_TYPE:
+            self.frame_uris.add(str(s))
+        elif p == RDFS.label:
+            self.uri_to_labels[str(s)].add(str(o))
+        elif str(p) == PREMON_SEM_ROLE:
+            self.frame_uri_to_role_uris[str(s)].add(str(o))
+
+
+def build_premon_index(premon_nt_path, verbose=0):
+    """
+    extract from PreMOn (N-Triples) the information needed to
+    link FrameNet to PreMOn. The N-Triples file is streamed, i.e.,
+    the full PreMOn graph is never loaded into memory.
+
+    :param str premon_nt_path: use FrameNetNLTK.premon_nt
+
+    :rtype: dict
+    :return: dictionary with the keys:
+    -frame_label_to_uris: frame label -> list of frame URIs
+    -frame_uri_to_fe_label_to_uris: frame URI -> FE label -> list of FE URIs
+    -uri_to_labels: frame or FE URI -> list of labels
+    """
+    sink = PremonIndexSink()
+    with open(premon_nt_path, 'rb') as infile:
+        NTriplesParser(sink=sink).parse(infile)
+
+    frame_label_to_uris = defaultdict(list)
+    frame_uri_to_fe_label_to_uris = defaultdict(dict)
+    uri_to_labels = {}
+
+    for frame_uri in sink.frame_uris:
+        frame_labels = sink.uri_to_labels.get(frame_uri, set())
+        uri_to_labels[frame_uri] = sorted(frame_labels)
+        for frame_label in frame_labels:
+            frame_label_to_uris[frame_label].append(frame_uri)
+
+    for frame_uri, role_uris in sink.frame_uri_to_role_uris.items():
+        fe_label_to_uris = defaultdict(list)
+        for role_uri in role_uris:
+            role_labels = sink.uri_to_labels.get(role_uri, set())
+            uri_to_labels[role_uri] = sorted(role_labels)
+            for role_label in role_labels:
+                fe_label_to_uris[role_label].append(role_uri)
+        frame_uri_to_fe_label_to_uris[frame_uri] = dict(fe_label_to_uris)
+
+    premon_index = {
+        'frame_label_to_uris': dict(frame_label_to_uris),
+        'frame_uri_to_fe_label_to_uris': dict(frame_uri_to_fe_label_to_uris),
+        'uri_to_labels': uri_to_labels
+    }
+
+    if verbose >= 1:
+        print(f'built PreMOn index from {premon_nt_path}: {len(sink.frame_uris)} frames, {len(uri_to_labels)} labeled URIs')
+
+    return premon_index
+
+
+def load_premon_index(premon_nt_path, cache_dir=None, verbose=0):
+    """
+    load the PreMOn index (see build_premon_index).
+    The index is built once and stored next to the N-Triples file (or in cache_dir).
+    It is rebuilt when the N-Triples file, the rdflib version or the pickle protocol changes
+    (see get_pickle_cache_key), or when it cannot be unpickled.
+
+    :param str premon_nt_path: use FrameNetNLTK.premon_nt
+    :param str cache_dir: folder in which the index is stored (default: folder of premon_nt_path)
+
+    :rtype: dict
+    """
+    if cache_dir is None:
+        cache_dir = os.path.dirname(os.path.realpath(premon_nt_path))
+    index_path = os.path.join(cache_dir, f'{os.path.basename(premon_nt_path)}.index.pickle')
+
+    if os.path.exists(index_path):
+        with open(index_path, 'rb') as infile:
+            try:
+                is_valid = pickle.load(infile) == get_pickle_cache_key()
+                if is_valid:
+                    cached_signature = pickle.load(infile)
+                    is_valid, signature = signature_is_valid(cached_signature, premon_nt_path)
+                if is_valid:
+                    premon_index = pickle.load(infile)
+                    if signature != cached_signature: # only the mtime changed
+                        try:
+                            write_pickle_atomically([get_pickle_cache_key(), signature, premon_index], index_path)
+                        except OSError as error:
+                            if verbose >= 1:
+                                print(f'unable to update PreMOn index at {index_path}: {error}')
+                    if verbose >= 2:
+                        print(f'loaded PreMOn index from {index_path}')
+                    return premon_index
+            except Exception: # e.g., an AttributeError or ImportError after an upgrade of rdflib
+                pass
+
+    premon_index = build_premon_index(premon_nt_path=premon_nt_path,
+                                      verbose=verbose)
+
+    signature = get_file_signature(premon_nt_path)
+    try:
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        write_pickle_atomically([get_pickle_cache_key(), signature, premon_index], index_path)
+        if verbose >= 2:
+            print(f'written PreMOn index to {index_path}')
+    except OSError as error:
+        if verbose >= 1:
+            print(f'unable to write PreMOn index to {index_path}: {error}')
+
+    return premon_index
+
+
+def lookup_frame_uri(premon_index, frame_label):
+    """
+    PreMOn frame URI of a frame label, e.g., Change_of_leadership
+    """
+    frame_uris = premon_index['frame_label_to_uris'].get(frame_label, [])
+    assert len(frame_uris) == 1, f'expected one PreMOn frame URI for {frame_label}, got {frame_uris}'
+    return frame_uris[0]
+
+
+def lookup_fe_uri(premon_index, frame_uri, fe_label):
+    """
+    PreMOn FE URI of an FE label of the frame with URI frame_uri
+    """
+    fe_label_to_uris = premon_index['frame_uri_to_fe_label_to_uris'].get(frame_uri, {})
+    fe_uris = fe_label_to_uris.get(fe_label, [])
+    assert len(fe_uris) == 1, f'expected one label for frame ({frame_uri}) with FE label ({fe_label}), got {fe_uris}'
+    return fe_uris[0]
+
+
+def lookup_rdf_label(premon_index, uri):
+    """
+    label of a PreMOn frame or FE URI
+    """
+    labels = premon_index['uri_to_labels'].get(uri, [])
+    assert len(labels) == 1, f'expected one label for {uri}, got {labels}'
+    return labels[0]
+
+
 def get_attributes(fn_in_lemon, the_lemon_type):
     """
 
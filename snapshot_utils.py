@@ -0,0 +1,162 @@
+import os
+import json
+import hashlib
+import xml.etree.ElementTree as ET
+
+
+FN_NAMESPACE = 'http://framenet.icsi.berkeley.edu'
+
+# folder in which the snapshots are stored (see get_en_frame_snapshot)
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'res', 'cache')
+
+# fn_en root -> snapshot
+EN_FRAME_SNAPSHOTS = {}
+
+
+def get_fn_en_version(fn_en_root):
+    """
+    identify a version of the English FrameNet by the name of its folder, e.g., fndata-1.7,
+    and the size and mtime of its frameIndex.xml
+
+    :rtype: dict
+    """
+    frame_index_path = os.path.join(fn_en_root, 'frameIndex.xml')
+    stat = os.stat(frame_index_path)
+    return {
+        'name' : os.path.basename(os.path.realpath(fn_en_root)),
+        'size' : stat.st_size,
+        'mtime' : stat.st_mtime
+    }
+
+
+def get_snapshot_path(version, snapshot_dir=None):
+    """
+    the path of the snapshot of a version of the English FrameNet (see get_fn_en_version).
+    The basename contains a hash of the whole version, such that copies of the English FrameNet
+    in folders with the same name do not overwrite each other's snapshot.
+    """
+    if snapshot_dir is None:
+        snapshot_dir = SNAPSHOT_DIR
+    version_hash = hashlib.sha1(json.dumps(version, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(snapshot_dir, f'fn_en_frames_{version["name"]}_{version_hash}.json')
+
+
+def build_en_frame_snapshot(fn_en_root, verbose=0):
+    """
+    extract the metadata of the frames of the English FrameNet from the frame/FRAME_NAME.xml files
+
+    :param str fn_en_root: the folder of the English FrameNet, e.g., fn_en.root
+
+    :rtype: dict
+    :return: a dictionary with the keys:
+    -version: see get_fn_en_version
+    -frames: frame label -> {
+        ID: the frame identifier,
+        FE: FE label -> {ID, coreType, fgColor, bgColor},
+        lexicalized: True if the frame has English LUs,
+        template_lu_id: the identifier of the first English LU of the frame (None if not lexicalized)
+      }
+    """
+    frames = {}
+    frame_dir = os.path.join(fn_en_root, 'frame')
+
+    for basename in sorted(os.listdir(frame_dir)):
+        if not basename.endswith('.xml'):
+            continue
+
+        frame_info = None
+        for event, el in ET.iterparse(os.path.join(frame_dir, basename), events=('start',)):
+            if el.tag == f'{{{FN_NAMESPACE}}}frame':
+                frame_info = {
+                    'ID' : int(el.get('ID')),
+                    'FE' : {},
+                    'lexicalized' : False,
+                    'template_lu_id' : None
+                }
+                frames[el.get('name')] = frame_info
+            elif el.tag == f'{{{FN_NAMESPACE}}}FE':
+                frame_info['FE'][el.get('name')] = {
+                    'ID' : int(el.get('ID')),
+                    'coreType' : el.get('coreType'),
+                    'fgColor' : el.get('fgColor'),
+                    'bgColor' : el.get('bgColor')
+                }
+            elif el.tag == f'{{{FN_NAMESPACE}}}lexUnit':
+                if frame_info['template_lu_id'] is None:
+                    frame_info['template_lu_id'] = int(el.get('ID'))
+                    frame_info['lexicalized'] = True
+
+    if verbose >= 1:
+        print(f'extracted the metadata of {len(frames)} frames from {fn_en_root}')
+
+    return {
+        'version' : get_fn_en_version(fn_en_root),
+        'frames' : frames
+    }
+
+
+def get_en_frame_snapshot(fn_en_root, snapshot_dir=None, verbose=0):
+    """
+    obtain the metadata of the frames of the English FrameNet (see build_en_frame_snapshot).
+    The snapshot is built once per version of the English FrameNet (see get_fn_en_version),
+    stored as JSON in snapshot_dir (if it is writable), and kept in memory.
+
+    :param str fn_en_root: the folder of the English FrameNet, e.g., fn_en.root
+    :param str snapshot_dir: folder in which the snapshot is stored (default: SNAPSHOT_DIR)
+
+    :rtype: dict
+    """
+    fn_en_root = os.path.realpath(str(fn_en_root))
+    version = get_fn_en_version(fn_en_root)
+
+    snapshot = EN_FRAME_SNAPSHOTS.get(fn_en_root)
+    if snapshot is not None and snapshot['version'] == version:
+        return snapshot
+
+    snapshot_path = get_snapshot_path(version, snapshot_dir=snapshot_dir)
+    snapshot = None
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path) as infile:
+            try:
+                snapshot = json.load(infile)
+            except ValueError:
+                snapshot = None
+
+        if snapshot is not None and snapshot.get('version') != version:
+            snapshot = None
+
+        if snapshot is not None and verbose >= 2:
+            print(f'loaded the frame metadata of {fn_en_root} from {snapshot_path}')
+
+    if snapshot is None:
+        snapshot = build_en_frame_snapshot(fn_en_root, verbose=verbose)
+
+        tmp_path = f'{snapshot_path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+            with open(tmp_path, 'w') as outfile:
+                json.dump(snapshot, outfile)
+            os.replace(tmp_path, snapshot_path)
+            if verbose >= 2:
+                print(f'stored the frame metadata of {fn_en_root} in {snapshot_path}')
+        except OSError as error:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if verbose >= 1:
+                print(f'unable to store the frame metadata of {fn_en_root} in {snapshot_path}: {error}')
+
+    EN_FRAME_SNAPSHOTS[fn_en_root] = snapshot
+    return snapshot
+
+
+def get_en_frames(fn_en, snapshot_dir=None, verbose=0):
+    """
+    :param fn_en: the English FrameNet
+
+    :rtype: dict
+    :return: frame label -> metadata of the frame (see build_en_frame_snapshot)
+    """
+    snapshot = get_en_frame_snapshot(fn_en_root=fn_en.root,
+                                     snapshot_dir=snapshot_dir,
+                                     verbose=verbose)
+    return snapshot['frames']
@@ -5,8 +5,15 @@ sys.path.insert(0, '../..')
 from FrameNetNLTK import add_lus_from_json
 import FrameNetNLTK
 
-add_lus_from_json(your_lexicon_folder='test_lexicon',
-                  fn_en=fn,
-                  json_path='../res/json/lus.json',
-                  skos=FrameNetNLTK.skos,
-                  verbose=2)
+report = add_lus_from_json(your_lexicon_folder='test_lexicon',
+                           fn_en=fn,
+                           json_path='../res/json/lus.json',
+                           skos=FrameNetNLTK.skos,
+                           verbose=2)
+
+for result in report:
+    assert result['status'] in {'added', 'failed to add'}
+    if result['status'] == 'added':
+        assert type(result['lu_id']) == int
+    else:
+        print(result['lu_name'], result['reason'])
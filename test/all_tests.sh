@@ -4,7 +4,20 @@
 mkdir -p stats
 
 #pytest attributes.py || exit
+pytest test_journal.py || exit
+pytest test_lu_id_allocator.py || exit
+pytest test_lexicon_index.py || exit
+pytest test_en_frame_snapshot.py || exit
+pytest test_lexicon_consistency.py || exit
+pytest test_changed_files.py || exit
+pytest test_lu_template.py || exit
+pytest test_repair_lexicon.py || exit
+pytest test_lexicon_session.py || exit
+pytest test_validate_lus.py || exit
+pytest test_convert_to_lemon.py || exit
+pytest test_pickle_cache.py || exit
 #python initialize_lexicon.py || exit
+#python sync_lexicon.py || exit
 #python load_lexicon.py || exit
 #python add_compound_with_lu_id.py || exit
 #python test_get_luid.py || exit
@@ -0,0 +1,192 @@
+"""
+shared fixtures: a small lexicon in the FrameNet XML format
+
+The lexicon has the files that are read by lexicon_utils and by the nltk FramenetCorpusReader, i.e.,
+frameIndex.xml, frRelation.xml, luIndex.xml, frame/FRAME.xml, and lu/luLU_ID.xml.
+Each LU is a dict, see LUS, in which only lu_id, name, and frame are required.
+"""
+import copy
+import os
+
+import pytest
+
+
+FRAMES = {'Leadership' : 1,
+          'Appellations' : 2,
+          'Change_of_leadership' : 3}
+
+FRAME_INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<frameIndex xmlns="http://framenet.icsi.berkeley.edu">
+{frame_els}
+</frameIndex>
+"""
+
+FRAME_RELATIONS = """<?xml version="1.0" encoding="UTF-8"?>
+<frameRelations xmlns="http://framenet.icsi.berkeley.edu">
+</frameRelations>
+"""
+
+LUINDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<luIndex xmlns="http://framenet.icsi.berkeley.edu">
+{lu_els}
+</luIndex>
+"""
+
+FRAME = """<?xml version="1.0" encoding="UTF-8"?>
+<frame xmlns="http://framenet.icsi.berkeley.edu" name="{frame}" ID="{frame_id}" cBy="FN" cDate="01/01/2002 12:00:00 PDT Tue">
+<definition>the {frame} frame</definition>
+<FE ID="{fe_id}" name="Leader" abbrev="lea" coreType="Core" cBy="FN" cDate="01/01/2002 12:00:00 PDT Tue" bgColor="FF0000" fgColor="FFFFFF"><definition>the leader</definition></FE>
+{lexunit_els}
+</frame>
+"""
+
+LEXUNIT = """<lexUnit ID="{lu_id}" name="{name}" POS="{pos}" status="{status}" lemmaID="{lemma_id}" cBy="{cBy}" cDate="{cDate}" provenance="{provenance}" lu_type="{lu_type}"{incorporated_fe}>
+<definition>{definition}</definition>
+<sentenceCount annotated="0" total="0"/>
+{lexeme_els}
+</lexUnit>"""
+
+LU = """<?xml version="1.0" encoding="UTF-8"?>
+<?xml-stylesheet type="text/xsl" href="lexUnit.xsl"?>
+<lexUnit xmlns="http://framenet.icsi.berkeley.edu" ID="{lu_id}" name="{name}" frame="{frame}" frameID="{frame_id}" POS="{pos}" status="{status}" totalAnnotated="0" lemmaID="{lemma_id}" cBy="{cBy}" cDate="{cDate}" provenance="{provenance}" lu_type="{lu_type}"{incorporated_fe}>
+<header><frame><FE name="Leader" abbrev="lea"/></frame></header>
+<definition>{definition}</definition>
+{lexeme_els}
+<subCorpus name="manually-added"><sentence ID="1"/></subCorpus>
+</lexUnit>
+"""
+
+LUS = [{'lu_id' : 1, 'name' : 'president.n', 'frame' : 'Leadership', 'lemma_id' : 10,
+        'lexemes' : [{'name' : 'president'}]},
+       {'lu_id' : 2, 'name' : 'president.n', 'frame' : 'Appellations', 'lemma_id' : 10,
+        'lexemes' : [{'name' : 'president'}]},
+       {'lu_id' : 3, 'name' : 'verkiezing.n', 'frame' : 'Change_of_leadership', 'lemma_id' : 12,
+        'lexemes' : [{'name' : 'verkiezing'}]},
+       {'lu_id' : 4, 'name' : 'presidentsverkiezing.n', 'frame' : 'Change_of_leadership', 'lemma_id' : 11,
+        'provenance' : 'batch_2', 'lu_type' : 'endocentric compound', 'cDate' : '02/02/2021 12:00:00 CET Tue',
+        'lexemes' : [{'name' : 'presidents', 'lu_id' : 2, 'breakBefore' : 'false', 'headword' : 'false'},
+                     {'name' : 'verkiezing', 'lu_id' : 3, 'breakBefore' : 'false', 'headword' : 'true'}]}]
+
+
+def get_lu_attributes(lu):
+    """
+    :param dict lu: an LU, see LUS
+    :rtype: dict
+    :return: the LU with the defaults for the missing attributes
+    """
+    attributes = {'pos' : lu['name'].rsplit('.', 1)[1].upper(),
+                  'status' : 'New',
+                  'lemma_id' : lu['lu_id'],
+                  'cBy' : 'Piek_Vossen',
+                  'cDate' : '01/01/2021 12:00:00 CET Fri',
+                  'provenance' : 'batch_1',
+                  'lu_type' : 'singleton',
+                  'definition' : 'a definition',
+                  'lexemes' : []}
+    attributes.update(lu)
+    attributes['frame_id'] = FRAMES[attributes['frame']]
+
+    attributes['incorporated_fe'] = ''
+    if attributes.get('incorporatedFE'):
+        attributes['incorporated_fe'] = f' incorporatedFE="{attributes["incorporatedFE"]}"'
+
+    lexeme_els = []
+    for order, lexeme in enumerate(attributes['lexemes'], 1):
+        lexeme_attributes = {'order' : order, 'POS' : attributes['pos']}
+        lexeme_attributes.update(lexeme)
+        lexeme_els.append('<lexeme %s/>' % ' '.join(f'{key}="{value}"'
+                                                    for key, value in lexeme_attributes.items()))
+    attributes['lexeme_els'] = '\n'.join(lexeme_els)
+    return attributes
+
+
+def get_luindex_xml(lus):
+    """
+    :param list lus: the LUs of the luIndex/lu elements, see LUS
+    :rtype: str
+    :return: the content of luIndex.xml or of one of its shards
+    """
+    lu_els = []
+    for lu in lus:
+        attributes = get_lu_attributes(lu)
+        lu_els.append(f'<lu ID="{attributes["lu_id"]}" name="{attributes["name"]}" status="{attributes["status"]}" '
+                      f'frameName="{attributes["frame"]}" frameID="{attributes["frame_id"]}" '
+                      f'hasAnnotation="false" numAnnotInstances="0"/>')
+    return LUINDEX.format(lu_els='\n'.join(lu_els))
+
+
+def write_lexicon(folder, lus, luindex_lus=None, frame_lus=None):
+    """
+    write a lexicon in which the LUs can be listed in an inconsistent manner
+
+    :param str folder: the lexicon folder
+    :param list lus: the LUs of the lu/luLU_ID.xml files, see LUS
+    :param list luindex_lus: the LUs of the luIndex/lu elements (default: lus)
+    :param list frame_lus: the LUs of the frame/lexUnit elements (default: lus)
+    """
+    if luindex_lus is None:
+        luindex_lus = lus
+    if frame_lus is None:
+        frame_lus = lus
+
+    for subfolder in ['lu', 'frame']:
+        os.makedirs(os.path.join(folder, subfolder), exist_ok=True)
+
+    frame_els = [f'<frame ID="{frame_id}" name="{frame}" cBy="FN" cDate="01/01/2002 12:00:00 PDT Tue"/>'
+                 for frame, frame_id in FRAMES.items()]
+    with open(os.path.join(folder, 'frameIndex.xml'), 'w') as outfile:
+        outfile.write(FRAME_INDEX.format(frame_els='\n'.join(frame_els)))
+
+    with open(os.path.join(folder, 'frRelation.xml'), 'w') as outfile:
+        outfile.write(FRAME_RELATIONS)
+
+    for lu in lus:
+        with open(os.path.join(folder, 'lu', f'lu{lu["lu_id"]}.xml'), 'w') as outfile:
+            outfile.write(LU.format(**get_lu_attributes(lu)))
+
+    with open(os.path.join(folder, 'luIndex.xml'), 'w') as outfile:
+        outfile.write(get_luindex_xml(luindex_lus))
+
+    for frame, frame_id in FRAMES.items():
+        lexunit_els = [LEXUNIT.format(**get_lu_attributes(lu))
+                       for lu in frame_lus
+                       if lu['frame'] == frame]
+        with open(os.path.join(folder, 'frame', f'{frame}.xml'), 'w') as outfile:
+            outfile.write(FRAME.format(frame=frame,
+                                       frame_id=frame_id,
+                                       fe_id=frame_id * 100,
+                                       lexunit_els='\n'.join(lexunit_els)))
+
+
+@pytest.fixture
+def lexicon_lus():
+    """
+    the LUs of the shared lexicon, which can be modified by a test
+    """
+    return copy.deepcopy(LUS)
+
+
+@pytest.fixture
+def create_lexicon():
+    """
+    the function to write a lexicon, see write_lexicon
+    """
+    return write_lexicon
+
+
+@pytest.fixture
+def luindex_xml():
+    """
+    the function to create the content of luIndex.xml, see get_luindex_xml
+    """
+    return get_luindex_xml
+
+
+@pytest.fixture
+def lexicon(tmpdir, lexicon_lus):
+    """
+    the folder of the shared lexicon with LUS
+    """
+    folder = str(tmpdir)
+    write_lexicon(folder, lexicon_lus)
+    return folder
@@ -1,5 +1,6 @@
 import sys
 import os
+import gzip
 sys.path.insert(0, '../..')
 from nltk.corpus import framenet as fn
 import FrameNetNLTK
@@ -42,4 +43,68 @@ convert_to_lemon(lemon=FrameNetNLTK.lemon,
                  major_version=1,
                  minor_version=7,
                  output_path=output_path,
-                 verbose=5)
\ No newline at end of file
+                 verbose=2)
+
+output_path = os.path.join(os.getcwd(),
+                           'stats',
+                           'dfn_0.1.nt.gz')
+
+convert_to_lemon(lemon=FrameNetNLTK.lemon,
+                 premon_nt_path=FrameNetNLTK.premon_nt,
+                 ontolex=FrameNetNLTK.ontolex,
+                 fn_pos_to_lexinfo=FrameNetNLTK.fn_pos_to_lexinfo,
+                 your_fn=my_fn,
+                 namespace='http://rdf.cltl.nl/dfn/',
+                 namespace_prefix='dfn',
+                 language='nld',
+                 major_version=0,
+                 minor_version=1,
+                 output_path=output_path,
+                 output_format='nt',
+                 turtle_output_path=os.path.join(os.getcwd(), 'stats', 'dfn_0.1_from_nt.ttl'),
+                 verbose=2)
+
+output_path = os.path.join(os.getcwd(),
+                           'stats',
+                           'dfn_0.1_parallel.nt.gz')
+
+convert_to_lemon(lemon=FrameNetNLTK.lemon,
+                 premon_nt_path=FrameNetNLTK.premon_nt,
+                 ontolex=FrameNetNLTK.ontolex,
+                 fn_pos_to_lexinfo=FrameNetNLTK.fn_pos_to_lexinfo,
+                 your_fn=my_fn,
+                 namespace='http://rdf.cltl.nl/dfn/',
+                 namespace_prefix='dfn',
+                 language='nld',
+                 major_version=0,
+                 minor_version=1,
+                 output_path=output_path,
+                 output_format='nt',
+                 num_processes=2,
+                 verbose=2)
+
+sorted_triples = []
+for path in ['dfn_0.1.nt.gz', 'dfn_0.1_parallel.nt.gz']:
+    with gzip.open(os.path.join(os.getcwd(), 'stats', path), 'rt') as infile:
+        sorted_triples.append(sorted(infile))
+assert sorted_triples[0] == sorted_triples[1], 'the parallel conversion differs from the serial one'
+
+# the second export only converts the LUs that changed since the first one
+for _ in range(2):
+    convert_to_lemon(lemon=FrameNetNLTK.lemon,
+                     premon_nt_path=FrameNetNLTK.premon_nt,
+                     ontolex=FrameNetNLTK.ontolex,
+                     fn_pos_to_lexinfo=FrameNetNLTK.fn_pos_to_lexinfo,
+                     your_fn=my_fn,
+                     namespace='http://rdf.cltl.nl/dfn/',
+                     namespace_prefix='dfn',
+                     language='nld',
+                     major_version=0,
+                     minor_version=1,
+                     output_path=os.path.join(os.getcwd(), 'stats', 'dfn_0.1_incremental.nt.gz'),
+                     output_format='nt',
+                     incremental=True,
+                     verbose=2)
+
+with gzip.open(os.path.join(os.getcwd(), 'stats', 'dfn_0.1_incremental.nt.gz'), 'rt') as infile:
+    assert sorted(infile) == sorted_triples[0], 'the incremental export differs from the full one'
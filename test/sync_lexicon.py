@@ -0,0 +1,11 @@
+import sys
+from nltk.corpus import framenet as fn
+
+sys.path.insert(0, '../..')
+from FrameNetNLTK import sync
+
+summary = sync(folder='test_lexicon',
+               fn_en=fn,
+               verbose=2)
+
+assert summary == {'updated': [], 'removed': []}, summary
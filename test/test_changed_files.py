@@ -0,0 +1,66 @@
+import os
+import sys
+
+sys.path.append('../')
+
+import path_utils
+
+
+def write(folder, basename, content):
+    path = os.path.join(folder, basename)
+    with open(path, 'w') as outfile:
+        outfile.write(content)
+    return path
+
+
+def create_manifest(folder):
+    key_to_path = {
+        'frRelation.xml' : write(folder, 'frRelation.xml', 'relations'),
+        'frame/Leadership.xml' : write(folder, 'Leadership.xml', 'leadership'),
+        'frame/Appellations.xml' : write(folder, 'Appellations.xml', 'appellations')
+    }
+    manifest = {key : path_utils.get_file_signature(path)
+                for key, path in key_to_path.items()}
+    return key_to_path, manifest
+
+
+def test_unchanged_files(tmpdir):
+    folder = str(tmpdir)
+    key_to_path, manifest = create_manifest(folder)
+
+    changed, removed, updated_manifest = path_utils.get_changed_files(manifest, key_to_path)
+    assert changed == []
+    assert removed == []
+    assert updated_manifest == manifest
+
+
+def test_only_mtime_changed(tmpdir):
+    folder = str(tmpdir)
+    key_to_path, manifest = create_manifest(folder)
+
+    stat = os.stat(key_to_path['frRelation.xml'])
+    os.utime(key_to_path['frRelation.xml'], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    changed, removed, updated_manifest = path_utils.get_changed_files(manifest, key_to_path)
+    assert changed == []
+    assert updated_manifest['frRelation.xml']['mtime'] == stat.st_mtime_ns + 10 ** 9
+    assert updated_manifest['frRelation.xml']['sha1'] == manifest['frRelation.xml']['sha1']
+
+
+def test_changed_new_and_removed_files(tmpdir):
+    folder = str(tmpdir)
+    key_to_path, manifest = create_manifest(folder)
+
+    # same size, different content
+    stat = os.stat(key_to_path['frame/Leadership.xml'])
+    write(folder, 'Leadership.xml', 'LEADERSHIP')
+    os.utime(key_to_path['frame/Leadership.xml'], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    key_to_path['frame/Change_of_leadership.xml'] = write(folder, 'Change_of_leadership.xml', 'change')
+    del key_to_path['frame/Appellations.xml']
+
+    changed, removed, updated_manifest = path_utils.get_changed_files(manifest, key_to_path)
+    assert changed == ['frame/Change_of_leadership.xml', 'frame/Leadership.xml']
+    assert removed == ['frame/Appellations.xml']
+    assert set(updated_manifest) == set(key_to_path)
+    assert updated_manifest['frame/Leadership.xml'] == path_utils.get_file_signature(key_to_path['frame/Leadership.xml'])
@@ -0,0 +1,188 @@
+import os
+import sys
+
+import pytest
+from rdflib import Graph, Literal, RDFS
+
+sys.path.insert(0, '..')
+sys.path.insert(0, '../..')
+import FrameNetNLTK
+from FrameNetNLTK import load, convert_to_lemon
+from FrameNetNLTK import rdf_utils, lexicon_utils
+
+
+PREMON_FRAME = '''<http://premon.fbk.eu/resource/fn17-{frame_lower}> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://premon.fbk.eu/ontology/fn#Frame> .
+<http://premon.fbk.eu/resource/fn17-{frame_lower}> <http://www.w3.org/2000/01/rdf-schema#label> "{frame}" .
+<http://premon.fbk.eu/resource/fn17-{frame_lower}> <http://premon.fbk.eu/ontology/core#semRole> <http://premon.fbk.eu/resource/fn17-{frame_lower}@leader> .
+<http://premon.fbk.eu/resource/fn17-{frame_lower}@leader> <http://www.w3.org/2000/01/rdf-schema#label> "Leader" .
+'''
+
+# an LU with a status that NLTK's FramenetCorpusReader skips, of which there is no lu/luLU_ID.xml file
+PROBLEM_LU = {'lu_id' : 5, 'name' : 'kandidaat.n', 'frame' : 'Change_of_leadership', 'status' : 'Problem',
+              'lexemes' : [{'name' : 'kandidaat'}]}
+
+
+def create_vocabularies():
+    lemon = Graph()
+    for term in rdf_utils.LEMON_TERMS:
+        lemon.add((rdf_utils.LEMON[term], RDFS.label, Literal(term)))
+
+    ontolex = Graph()
+    for term in rdf_utils.ONTOLEX_TERMS:
+        ontolex.add((rdf_utils.ONTOLEX[term], RDFS.label, Literal(term)))
+
+    return lemon, ontolex
+
+
+@pytest.fixture
+def conversion(tmpdir, create_lexicon, lexicon_lus):
+    """
+    a lexicon with a Problem LU and the parameters of convert_to_lemon, except your_fn
+    """
+    lexicon_lus.append({'lu_id' : 6, 'name' : 'leider.n', 'frame' : 'Leadership', 'incorporatedFE' : 'Leader',
+                        'cBy' : 'Marten_Postma', 'provenance' : 'batch_3',
+                        'lexemes' : [{'name' : 'leider', 'incorporatedFE' : 'Leader'}]})
+    folder = os.path.join(str(tmpdir), 'lexicon')
+    create_lexicon(folder,
+                   lus=lexicon_lus,
+                   luindex_lus=lexicon_lus + [PROBLEM_LU],
+                   frame_lus=lexicon_lus + [PROBLEM_LU])
+
+    premon_nt_path = os.path.join(str(tmpdir), 'premon.nt')
+    with open(premon_nt_path, 'w') as outfile:
+        for frame in ['Leadership', 'Appellations', 'Change_of_leadership']:
+            outfile.write(PREMON_FRAME.format(frame=frame, frame_lower=frame.lower()))
+
+    lemon, ontolex = create_vocabularies()
+    kwargs = {
+        'lemon' : lemon,
+        'premon_nt_path' : premon_nt_path,
+        'ontolex' : ontolex,
+        'fn_pos_to_lexinfo' : FrameNetNLTK.fn_pos_to_lexinfo,
+        'namespace' : 'http://rdf.cltl.nl/dfn/',
+        'namespace_prefix' : 'dfn',
+        'language' : 'nld',
+        'major_version' : 0,
+        'minor_version' : 1,
+        'output_format' : 'nt'
+    }
+    return folder, kwargs
+
+
+def read_rows(path):
+    with open(path) as infile:
+        return sorted(infile)
+
+
+def test_lemon_tasks(conversion):
+    folder, kwargs = conversion
+    your_fn = load(folder)
+
+    assert rdf_utils.get_lemon_tasks(your_fn) == [(0, [2, 3, 4, 1, 6])]
+    assert rdf_utils.get_lemon_tasks(your_fn, lus_per_task=2) == [(0, [2, 3, 4]), (1, [1, 6])]
+
+
+def test_parallel_conversion(tmpdir, conversion):
+    folder, kwargs = conversion
+
+    output_paths = []
+    for num_processes in [1, 2]:
+        output_path = os.path.join(str(tmpdir), f'dfn_{num_processes}.nt')
+        convert_to_lemon(your_fn=load(folder),
+                         output_path=output_path,
+                         num_processes=num_processes,
+                         **kwargs)
+        output_paths.append(output_path)
+
+    rows = read_rows(output_paths[0])
+    assert rows == read_rows(output_paths[1])
+
+    lexicon_uri = rdf_utils.generate_lexicon_rdf_uri(namespace=kwargs['namespace'],
+                                                     language=kwargs['language'],
+                                                     major_version=kwargs['major_version'],
+                                                     minor_version=kwargs['minor_version'])
+    lu_row_pattern = rdf_utils.get_lu_row_pattern(lexicon_uri)
+    assert {rdf_utils.get_lu_id_of_row(row, lu_row_pattern) for row in rows} == {None, 1, 2, 3, 4, 6}
+    assert len(rows) == len(set(rows))
+
+
+def test_streaming_conversion(tmpdir, conversion):
+    folder, kwargs = conversion
+    your_fn = load(folder)
+
+    # the creation dates of the provenance activities are read without loading the LUs
+    lu_ids = set(your_fn.lu_ids_and_names())
+    lu_id_to_creation_info = lexicon_utils.read_lexunit_creation_info(root=folder, lu_ids=lu_ids)
+    assert set(lu_id_to_creation_info) == {1, 2, 3, 4, 6}
+    assert lu_id_to_creation_info[6] == {'cBy' : 'Marten_Postma',
+                                         'provenance' : 'batch_3',
+                                         'cDate' : '01/01/2021 12:00:00 CET Fri'}
+    assert rdf_utils.get_cby_prov_to_cdates(lu_id_to_creation_info.values()) == \
+           rdf_utils.get_cby_prov_to_cdates(load(folder).lus())
+
+    # the LUs are loaded per task, not by your_fn, which hence does not keep them in memory
+    convert_to_lemon(your_fn=your_fn, output_path=os.path.join(str(tmpdir), 'dfn.nt'), **kwargs)
+    assert your_fn._cached_frames == {}
+
+
+def test_incremental_export(tmpdir, capsys, conversion, create_lexicon, lexicon_lus):
+    folder, kwargs = conversion
+    output_path = os.path.join(str(tmpdir), 'dfn_incremental.nt')
+    convert_to_lemon(your_fn=load(folder), output_path=output_path, incremental=True, verbose=2, **kwargs)
+    assert 'all LUs are converted' in capsys.readouterr().out
+
+    # LU 1 is removed, LU 3 is changed (and hence the compound LU 4 that refers to it), and LU 7 is added
+    lus = [lu for lu in lexicon_lus if lu['lu_id'] != 1]
+    for lu in lus:
+        if lu['lu_id'] == 3:
+            lu.update({'definition' : 'het kiezen', 'cDate' : '03/03/2021 12:00:00 CET Wed'})
+    lus.append({'lu_id' : 7, 'name' : 'leiderschap.n', 'frame' : 'Leadership', 'lexemes' : [{'name' : 'leiderschap'}],
+                'cDate' : '12/31/2020 12:00:00 CET Thu'})
+    problem_lus = [dict(PROBLEM_LU, lu_id=8), dict(PROBLEM_LU, lu_id=9)]
+    create_lexicon(folder, lus=lus, luindex_lus=lus + problem_lus, frame_lus=lus + problem_lus)
+
+    convert_to_lemon(your_fn=load(folder), output_path=output_path, incremental=True, verbose=2, **kwargs)
+    assert 'incremental export: 1 added, 1 changed, 1 removed, 1 dependent LU(s)' in capsys.readouterr().out
+
+    full_output_path = os.path.join(str(tmpdir), 'dfn_full.nt')
+    convert_to_lemon(your_fn=load(folder), output_path=full_output_path, **kwargs)
+    assert read_rows(output_path) == read_rows(full_output_path)
+
+    # the fingerprints are those of the LUs of your_fn.lus()
+    settings, fingerprints = rdf_utils.load_fingerprints(rdf_utils.get_fingerprints_path(output_path))
+    assert set(fingerprints) == {2, 3, 4, 6, 7}
+    assert fingerprints[3]['cDate'] == '03/03/2021 12:00:00 CET Wed'
+    assert fingerprints[4]['referenced_lu_ids'] == {2, 3}
+
+    # nothing changed
+    convert_to_lemon(your_fn=load(folder), output_path=output_path, incremental=True, verbose=2, **kwargs)
+    assert 'incremental export: 0 added, 0 changed, 0 removed, 0 dependent LU(s)' in capsys.readouterr().out
+    assert read_rows(output_path) == read_rows(full_output_path)
+
+
+def test_lu_row_pattern():
+    lexicon_uri = rdf_utils.generate_lexicon_rdf_uri(namespace='http://rdf.cltl.nl/dfn/',
+                                                     language='nld',
+                                                     major_version=0,
+                                                     minor_version=1)
+    other_lexicon_uri = rdf_utils.generate_lexicon_rdf_uri(namespace='http://rdf.cltl.nl/dfn/',
+                                                           language='nld',
+                                                           major_version=0,
+                                                           minor_version=10)
+    lu_row_pattern = rdf_utils.get_lu_row_pattern(lexicon_uri)
+    rdf_type = '<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>'
+
+    row_to_lu_id = {
+        f'<{lexicon_uri}-le-12> {rdf_type} <{rdf_utils.LEMON.LexicalEntry}> .\n' : 12,
+        f'<{lexicon_uri}-leform-12> {rdf_type} <{rdf_utils.LEMON.Form}> .\n' : 12,
+        f'<{lexicon_uri}-lu-12> {rdf_type} <{rdf_utils.LEMON.LexicalSense}> .\n' : 12,
+        f'<{lexicon_uri}-le-12#Component1> {rdf_type} <{rdf_utils.LEMON.Component}> .\n' : 12,
+        f'_:{rdf_utils.get_component_list_id(12, 1)} {rdf_type} <http://www.w3.org/1999/02/22-rdf-syntax-ns#List> .\n' : 12,
+        f'<{lexicon_uri}> <{rdf_utils.LEMON.entry}> <{lexicon_uri}-le-12> .\n' : 12,
+        f'<{lexicon_uri}> {rdf_type} <{rdf_utils.LEMON.Lexicon}> .\n' : None,
+        f'<{lexicon_uri}#Provenance#Piek_Vossen-batch_1> {rdf_type} <{rdf_utils.PROV.Activity}> .\n' : None,
+        f'<{other_lexicon_uri}-le-12> {rdf_type} <{rdf_utils.LEMON.LexicalEntry}> .\n' : None,
+        f'<{lexicon_uri}-le-13#Component1> <{rdf_utils.LEMON.element}> <{lexicon_uri}-le-12> .\n' : 13
+    }
+    for row, lu_id in row_to_lu_id.items():
+        assert rdf_utils.get_lu_id_of_row(row, lu_row_pattern) == lu_id, row
@@ -0,0 +1,113 @@
+import os
+import sys
+
+sys.path.append('../')
+
+import snapshot_utils
+
+
+FRAME_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<frame xmlns="http://framenet.icsi.berkeley.edu" ID="{frame_id}" name="{frame_name}">
+    <definition>a definition</definition>
+    <FE bgColor="FF0000" fgColor="FFFFFF" coreType="Core" ID="{fe_id}" name="Leader">
+        <definition>a definition</definition>
+    </FE>
+    {lexunits}
+</frame>
+'''
+
+
+def create_fn_en(folder):
+    os.mkdir(os.path.join(folder, 'frame'))
+    with open(os.path.join(folder, 'frameIndex.xml'), 'w') as outfile:
+        outfile.write('<frameIndex/>')
+
+    for frame_id, frame_name, lexunits in [(1, 'Leadership', '<lexUnit ID="10" name="leader.n"/><lexUnit ID="11" name="lead.v"/>'),
+                                           (2, 'Appellations', '')]:
+        with open(os.path.join(folder, 'frame', f'{frame_name}.xml'), 'w') as outfile:
+            outfile.write(FRAME_XML.format(frame_id=frame_id,
+                                           frame_name=frame_name,
+                                           fe_id=frame_id * 100,
+                                           lexunits=lexunits))
+
+
+def test_snapshot(tmpdir):
+    fn_en_root = os.path.join(str(tmpdir), 'fndata-1.7')
+    os.mkdir(fn_en_root)
+    create_fn_en(fn_en_root)
+    snapshot_dir = os.path.join(str(tmpdir), 'cache')
+
+    snapshot = snapshot_utils.get_en_frame_snapshot(fn_en_root, snapshot_dir=snapshot_dir)
+    frames = snapshot['frames']
+
+    assert frames['Leadership']['ID'] == 1
+    assert frames['Leadership']['FE']['Leader'] == {'ID' : 100,
+                                                    'coreType' : 'Core',
+                                                    'fgColor' : 'FFFFFF',
+                                                    'bgColor' : 'FF0000'}
+    assert frames['Leadership']['lexicalized']
+    assert frames['Leadership']['template_lu_id'] == 10
+    assert not frames['Appellations']['lexicalized']
+    assert frames['Appellations']['template_lu_id'] is None
+
+    snapshot_path = snapshot_utils.get_snapshot_path(snapshot['version'], snapshot_dir=snapshot_dir)
+    assert os.path.exists(snapshot_path)
+
+    # loaded from disk
+    snapshot_utils.EN_FRAME_SNAPSHOTS.clear()
+    assert snapshot_utils.get_en_frame_snapshot(fn_en_root, snapshot_dir=snapshot_dir) == snapshot
+
+
+def test_snapshot_of_new_version(tmpdir):
+    fn_en_root = os.path.join(str(tmpdir), 'fndata-1.7')
+    os.mkdir(fn_en_root)
+    create_fn_en(fn_en_root)
+    snapshot_dir = os.path.join(str(tmpdir), 'cache')
+
+    snapshot_utils.get_en_frame_snapshot(fn_en_root, snapshot_dir=snapshot_dir)
+
+    os.remove(os.path.join(fn_en_root, 'frame', 'Appellations.xml'))
+    with open(os.path.join(fn_en_root, 'frameIndex.xml'), 'w') as outfile:
+        outfile.write('<frameIndex></frameIndex>')
+
+    snapshot = snapshot_utils.get_en_frame_snapshot(fn_en_root, snapshot_dir=snapshot_dir)
+    assert set(snapshot['frames']) == {'Leadership'}
+
+
+def test_snapshots_of_folders_with_the_same_name(tmpdir):
+    snapshot_dir = os.path.join(str(tmpdir), 'cache')
+    fn_en_roots = []
+    for parent in ['first', 'second']:
+        fn_en_root = os.path.join(str(tmpdir), parent, 'fndata-1.7')
+        os.makedirs(fn_en_root)
+        create_fn_en(fn_en_root)
+        fn_en_roots.append(fn_en_root)
+
+    os.remove(os.path.join(fn_en_roots[1], 'frame', 'Appellations.xml'))
+    with open(os.path.join(fn_en_roots[1], 'frameIndex.xml'), 'w') as outfile:
+        outfile.write('<frameIndex></frameIndex>')
+
+    versions = [snapshot_utils.get_en_frame_snapshot(fn_en_root, snapshot_dir=snapshot_dir)['version']
+                for fn_en_root in fn_en_roots]
+    assert versions[0]['name'] == versions[1]['name']
+    assert len({snapshot_utils.get_snapshot_path(version, snapshot_dir=snapshot_dir) for version in versions}) == 2
+
+    # both snapshots are loaded from disk
+    snapshot_utils.EN_FRAME_SNAPSHOTS.clear()
+    assert set(snapshot_utils.get_en_frame_snapshot(fn_en_roots[0], snapshot_dir=snapshot_dir)['frames']) == {'Leadership', 'Appellations'}
+    assert set(snapshot_utils.get_en_frame_snapshot(fn_en_roots[1], snapshot_dir=snapshot_dir)['frames']) == {'Leadership'}
+
+
+def test_snapshot_dir_is_not_writable(tmpdir):
+    fn_en_root = os.path.join(str(tmpdir), 'fndata-1.7')
+    os.mkdir(fn_en_root)
+    create_fn_en(fn_en_root)
+
+    # a file instead of a folder
+    snapshot_dir = os.path.join(str(tmpdir), 'cache')
+    with open(snapshot_dir, 'w') as outfile:
+        outfile.write('')
+
+    snapshot = snapshot_utils.get_en_frame_snapshot(fn_en_root, snapshot_dir=snapshot_dir, verbose=1)
+    assert set(snapshot['frames']) == {'Leadership', 'Appellations'}
+    assert set(os.listdir(str(tmpdir))) == {'fndata-1.7', 'cache'}
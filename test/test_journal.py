@@ -0,0 +1,140 @@
+import os
+import sys
+import pytest
+
+sys.path.append('../')
+
+import journal_utils
+
+
+def create_lexicon(folder):
+    os.mkdir(os.path.join(folder, 'lu'))
+    for basename, content in [('luIndex.xml', 'old index'),
+                              ('lu/lu1.xml', 'lu 1')]:
+        with open(os.path.join(folder, basename), 'w') as outfile:
+            outfile.write(content)
+
+
+def read(folder, basename):
+    with open(os.path.join(folder, basename)) as infile:
+        return infile.read()
+
+
+def stage_changes(the_transaction, folder):
+    with open(the_transaction.stage(os.path.join(folder, 'luIndex.xml')), 'w') as outfile:
+        outfile.write('new index')
+    with open(the_transaction.stage(os.path.join(folder, 'lu/lu2.xml')), 'w') as outfile:
+        outfile.write('lu 2')
+    the_transaction.remove(os.path.join(folder, 'lu/lu1.xml'))
+
+
+def test_commit(tmpdir):
+    folder = str(tmpdir)
+    create_lexicon(folder)
+
+    with journal_utils.transaction(folder) as the_transaction:
+        stage_changes(the_transaction, folder)
+        assert read(folder, 'luIndex.xml') == 'old index'
+
+    assert read(folder, 'luIndex.xml') == 'new index'
+    assert read(folder, 'lu/lu2.xml') == 'lu 2'
+    assert not os.path.exists(os.path.join(folder, 'lu/lu1.xml'))
+
+
+def test_read_staged_version(tmpdir):
+    folder = str(tmpdir)
+    create_lexicon(folder)
+
+    with journal_utils.transaction(folder) as the_transaction:
+        stage_changes(the_transaction, folder)
+        current_path = the_transaction.current_path(os.path.join(folder, 'luIndex.xml'))
+        with open(current_path) as infile:
+            assert infile.read() == 'new index'
+
+
+def test_rollback_on_exception(tmpdir):
+    folder = str(tmpdir)
+    create_lexicon(folder)
+
+    with pytest.raises(ValueError):
+        with journal_utils.transaction(folder) as the_transaction:
+            stage_changes(the_transaction, folder)
+            raise ValueError('interrupted')
+
+    assert read(folder, 'luIndex.xml') == 'old index'
+    assert read(folder, 'lu/lu1.xml') == 'lu 1'
+    assert not os.path.exists(os.path.join(folder, 'lu/lu2.xml'))
+
+
+def test_recover_roll_back(tmpdir):
+    folder = str(tmpdir)
+    create_lexicon(folder)
+
+    # crash before the manifest was written
+    the_transaction = journal_utils.Transaction(folder)
+    the_transaction.begin()
+    stage_changes(the_transaction, folder)
+    the_transaction.release_lock()
+
+    assert journal_utils.recover(folder) == 'rolled back'
+    assert read(folder, 'luIndex.xml') == 'old index'
+    assert read(folder, 'lu/lu1.xml') == 'lu 1'
+    assert not os.path.exists(os.path.join(folder, 'lu/lu2.xml'))
+    assert journal_utils.recover(folder) is None
+
+
+def test_recover_roll_forward(tmpdir):
+    folder = str(tmpdir)
+    create_lexicon(folder)
+
+    # crash after the manifest was written, while applying it
+    the_transaction = journal_utils.Transaction(folder)
+    the_transaction.begin()
+    stage_changes(the_transaction, folder)
+    the_transaction.prepare()
+    os.replace(the_transaction.stage(os.path.join(folder, 'luIndex.xml')),
+               os.path.join(folder, 'luIndex.xml'))
+    the_transaction.release_lock()
+
+    assert journal_utils.recover(folder) == 'rolled forward'
+    assert read(folder, 'luIndex.xml') == 'new index'
+    assert read(folder, 'lu/lu2.xml') == 'lu 2'
+    assert not os.path.exists(os.path.join(folder, 'lu/lu1.xml'))
+    assert journal_utils.recover(folder) is None
+
+
+def test_insert(tmpdir):
+    folder = str(tmpdir)
+    create_lexicon(folder)
+    with open(os.path.join(folder, 'luIndex.xml'), 'w') as outfile:
+        outfile.write('<luIndex>\n</luIndex>\n')
+
+    with journal_utils.transaction(folder) as the_transaction:
+        the_transaction.insert(os.path.join(folder, 'luIndex.xml'), 10, b'  <lu/>\n</luIndex>\n')
+        assert read(folder, 'luIndex.xml') == '<luIndex>\n</luIndex>\n'
+
+        # reading the file in the transaction includes the insert
+        current_path = the_transaction.current_path(os.path.join(folder, 'luIndex.xml'))
+        with open(current_path) as infile:
+            assert infile.read() == '<luIndex>\n  <lu/>\n</luIndex>\n'
+        the_transaction.insert(os.path.join(folder, 'luIndex.xml'), 18, b'  <lu/>\n</luIndex>\n')
+
+    assert read(folder, 'luIndex.xml') == '<luIndex>\n  <lu/>\n  <lu/>\n</luIndex>\n'
+
+
+def test_recover_insert(tmpdir):
+    folder = str(tmpdir)
+    create_lexicon(folder)
+    with open(os.path.join(folder, 'luIndex.xml'), 'w') as outfile:
+        outfile.write('<luIndex>\n</luIndex>\n')
+
+    # crash after the manifest was written and the insert was applied
+    the_transaction = journal_utils.Transaction(folder)
+    the_transaction.begin()
+    the_transaction.insert(os.path.join(folder, 'luIndex.xml'), 10, b'  <lu/>\n</luIndex>\n')
+    the_transaction.prepare()
+    journal_utils.apply_manifest(the_transaction.transaction_dir, the_transaction.folder)
+    the_transaction.release_lock()
+
+    assert journal_utils.recover(folder) == 'rolled forward'
+    assert read(folder, 'luIndex.xml') == '<luIndex>\n  <lu/>\n</luIndex>\n'
@@ -0,0 +1,43 @@
+import copy
+import os
+import sys
+
+sys.path.append('../')
+
+import lexicon_utils
+
+
+def test_consistent_lexicon(lexicon):
+    report = lexicon_utils.check_lexicon_consistency(lexicon, num_processes=1)
+    assert report['consistent']
+    assert report['num_lus'] == {'lu' : 4, 'frame' : 4, 'luIndex' : 4}
+
+
+def test_lu_file_records(lexicon):
+    records = lexicon_utils.read_lu_files([os.path.join(lexicon, 'lu', 'lu4.xml')])
+    assert len(records) == 1
+    assert records[0]['frame'] == 'Change_of_leadership'
+    assert records[0]['definition'] == 'a definition'
+    assert [lexeme['name'] for lexeme in records[0]['lexemes']] == ['presidents', 'verkiezing']
+    assert records[0]['referenced_lu_ids'] == {2, 3}
+
+
+def test_inconsistent_lexicon(tmpdir, create_lexicon, lexicon_lus):
+    folder = str(tmpdir)
+    luindex_lus = copy.deepcopy(lexicon_lus) + [lexicon_lus[3]]
+    luindex_lus[1]['frame'] = 'Leadership'
+    create_lexicon(folder,
+                   lus=lexicon_lus[1:],
+                   luindex_lus=luindex_lus,
+                   frame_lus=lexicon_lus[1:] + [{'lu_id' : 5, 'name' : 'leider.n', 'frame' : 'Leadership',
+                                                 'lexemes' : [{'name' : 'leider', 'lu_id' : 6}]}])
+
+    report = lexicon_utils.check_lexicon_consistency(folder, num_processes=2)
+    assert not report['consistent']
+    assert report['orphans'] == [{'lu_id' : 1, 'present_in' : ['luIndex'], 'missing_in' : ['lu', 'frame']},
+                                 {'lu_id' : 5, 'present_in' : ['frame'], 'missing_in' : ['lu', 'luIndex']}]
+    assert [(duplicate['lu_id'], duplicate['source']) for duplicate in report['duplicates']] == [(4, 'luIndex')]
+    assert report['frame_mismatches'] == [{'lu_id' : 2, 'frames' : {'lu' : 'Appellations',
+                                                                    'frame' : 'Appellations',
+                                                                    'luIndex' : 'Leadership'}}]
+    assert report['dangling_references'] == [{'lu_id' : 5, 'referenced_lu_id' : 6, 'source' : 'frame'}]
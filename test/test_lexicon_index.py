@@ -0,0 +1,136 @@
+import os
+import sys
+
+sys.path.append('../')
+
+import lexicon_utils
+
+
+def test_lookups(lexicon):
+    index = lexicon_utils.build_lexicon_index(lexicon)
+
+    assert index['max_lemma_id'] == 12
+    assert lexicon_utils.get_lemma_id_from_index(index, 'president.n') == 10
+    assert lexicon_utils.get_lemma_id_from_index(index, 'nieuw.n') == 13
+    assert lexicon_utils.get_luid_from_index(index, 'Leadership', 'president', 'N') == (1, 'succes')
+    assert lexicon_utils.get_luid_from_index(index, 'Leadership', 'verkiezing', 'N')[0] is None
+
+
+def test_incremental_updates(lexicon):
+    index = lexicon_utils.build_lexicon_index(lexicon)
+
+    lexicon_utils.add_lu_to_lexicon_index(index, lu_id=5, lemma_pos='nieuw.n', lemma_id=13, frame='Leadership')
+    assert lexicon_utils.get_luid_from_index(index, 'Leadership', 'nieuw', 'N') == (5, 'succes')
+    assert index['max_lemma_id'] == 13
+
+    lexicon_utils.remove_lu_from_lexicon_index(index, lu_id=1)
+    assert lexicon_utils.get_luid_from_index(index, 'Leadership', 'president', 'N')[0] is None
+    assert index['lemma_pos_to_lu_ids']['president.n'] == {2}
+    assert lexicon_utils.get_lemma_id_from_index(index, 'president.n') == 10
+
+
+def test_problem_lus(tmpdir, create_lexicon, lexicon_lus):
+    # as in NLTK's lu_ids_and_names, LUs with the status Problem are not part of the index
+    folder = str(tmpdir)
+    problem_lu = {'lu_id' : 5, 'name' : 'leider.n', 'frame' : 'Leadership', 'status' : 'Problem', 'lemma_id' : 13,
+                  'lexemes' : [{'name' : 'leider'}]}
+    create_lexicon(folder,
+                   lus=lexicon_lus,
+                   luindex_lus=lexicon_lus + [problem_lu],
+                   frame_lus=lexicon_lus + [problem_lu])
+
+    index = lexicon_utils.build_lexicon_index(folder)
+    assert set(index['lu_id_to_info']) == {1, 2, 3, 4}
+    assert lexicon_utils.get_luid_from_index(index, 'Leadership', 'leider', 'N')[0] is None
+    assert index['max_lemma_id'] == 12
+
+    lexicon_utils.add_lu_to_lexicon_index(index, lu_id=6, lemma_pos='nieuw.n', lemma_id=14, frame='Leadership',
+                                          status='Problem')
+    assert 6 not in index['lu_id_to_info']
+    assert index['max_lemma_id'] == 12
+
+
+def test_referring_lu_ids(lexicon):
+    index = lexicon_utils.build_lexicon_index(lexicon)
+
+    assert index['lu_id_to_referring_lu_ids'] == {2: {4}, 3: {4}}
+
+    lexicon_utils.add_lu_to_lexicon_index(index, lu_id=5, lemma_pos='presidentsverkiezingen.n', lemma_id=13,
+                                          frame='Change_of_leadership',
+                                          referenced_lu_ids=lexicon_utils.get_referenced_lu_ids([{'lu_id': '3'}, {}]))
+    assert index['lu_id_to_referring_lu_ids'][3] == {4, 5}
+
+    lexicon_utils.remove_lu_from_lexicon_index(index, lu_id=4)
+    lexicon_utils.remove_lu_from_lexicon_index(index, lu_id=5)
+    assert index['lu_id_to_referring_lu_ids'] == {}
+
+
+def test_select_lu_ids(lexicon):
+    index = lexicon_utils.build_lexicon_index(lexicon)
+
+    assert lexicon_utils.select_lu_ids_from_index(index, provenance='batch_1') == {1, 2, 3}
+    assert lexicon_utils.select_lu_ids_from_index(index, provenance='batch_1', frame='Leadership') == {1}
+    assert lexicon_utils.select_lu_ids_from_index(index, agent='Piek_Vossen') == {1, 2, 3, 4}
+    assert lexicon_utils.select_lu_ids_from_index(index, agent='someone else') == set()
+
+
+def test_sharded_luindex(lexicon, lexicon_lus, luindex_xml):
+    folder = lexicon
+    shard_dir = os.path.join(folder, lexicon_utils.LUINDEX_SHARD_DIR)
+    os.mkdir(shard_dir)
+    with open(os.path.join(shard_dir, lexicon_utils.LUINDEX_SHARD_LAYOUT_BASENAME), 'w') as outfile:
+        outfile.write('{"shard_by": "lemma_initial"}')
+
+    layout = lexicon_utils.get_luindex_shard_layout(folder)
+    assert lexicon_utils.get_luindex_shard_key(layout, 'Leadership', 'president.n') == 'p'
+    assert lexicon_utils.get_luindex_shard_key(layout, 'Leadership', 'één.num') == '_'
+
+    # a shard that is newer than luIndex.xml: the index is built from the shards
+    with open(lexicon_utils.get_luindex_shard_path(folder, 'p'), 'w') as outfile:
+        outfile.write(luindex_xml([lu for lu in lexicon_lus if lu['lu_id'] != 3]))
+    with open(lexicon_utils.get_luindex_shard_path(folder, 'v'), 'w') as outfile:
+        outfile.write(luindex_xml([{'lu_id' : 5, 'name' : 'verkiezing.n', 'frame' : 'Change_of_leadership'}]))
+    os.utime(os.path.join(folder, 'luIndex.xml'), ns=(0, 0))
+
+    assert not lexicon_utils.luindex_shards_are_merged(folder)
+    index = lexicon_utils.build_lexicon_index(folder)
+    assert set(index['lu_id_to_info']) == {1, 2, 4, 5}
+
+
+
+def test_merged_luindex_shards(lexicon, lexicon_lus, luindex_xml):
+    folder = lexicon
+    luindex_path = os.path.join(folder, 'luIndex.xml')
+    shard_dir = os.path.join(folder, lexicon_utils.LUINDEX_SHARD_DIR)
+    os.mkdir(shard_dir)
+    with open(os.path.join(shard_dir, lexicon_utils.LUINDEX_SHARD_LAYOUT_BASENAME), 'w') as outfile:
+        outfile.write('{"shard_by": "lemma_initial"}')
+
+    shard_path = lexicon_utils.get_luindex_shard_path(folder, 'p')
+    with open(shard_path, 'w') as outfile:
+        outfile.write(luindex_xml([lu for lu in lexicon_lus if lu['lu_id'] != 3]))
+    with open(lexicon_utils.get_luindex_shard_path(folder, 'v'), 'w') as outfile:
+        outfile.write(luindex_xml([lu for lu in lexicon_lus if lu['lu_id'] == 3]))
+    assert not lexicon_utils.luindex_shards_are_merged(folder)
+
+    # luIndex.xml is merged in the same timestamp tick as the last modification of the shards
+    shard_stat = os.stat(shard_path)
+    os.utime(luindex_path, ns=(shard_stat.st_atime_ns, shard_stat.st_mtime_ns))
+    lexicon_utils.write_luindex_merge_manifest(folder, lexicon_utils.get_luindex_shard_signatures(folder))
+    assert lexicon_utils.luindex_shards_are_merged(folder)
+
+    # a shard is rewritten in that tick as well, such that its size and modification time do not change
+    with open(shard_path) as infile:
+        shard = infile.read()
+    with open(shard_path, 'w') as outfile:
+        outfile.write(shard.replace('president', 'President'))
+    os.utime(shard_path, ns=(shard_stat.st_atime_ns, shard_stat.st_mtime_ns))
+    assert os.stat(shard_path).st_size == shard_stat.st_size
+    assert not lexicon_utils.luindex_shards_are_merged(folder)
+
+    # a new shard
+    lexicon_utils.write_luindex_merge_manifest(folder, lexicon_utils.get_luindex_shard_signatures(folder))
+    assert lexicon_utils.luindex_shards_are_merged(folder)
+    with open(lexicon_utils.get_luindex_shard_path(folder, 'l'), 'w') as outfile:
+        outfile.write(luindex_xml([]))
+    assert not lexicon_utils.luindex_shards_are_merged(folder)
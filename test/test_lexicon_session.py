@@ -0,0 +1,129 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, '..')
+sys.path.insert(0, '../..')
+from FrameNetNLTK import LexiconSession, remove_lu, remove_lus, check_lexicon_consistency
+from FrameNetNLTK import xml_utils, lexicon_utils, load_utils
+
+
+NAMESPACE = '{http://framenet.icsi.berkeley.edu}'
+
+
+def get_lu_ids(path):
+    doc = xml_utils.load_doc(path)
+    return {int(el.get('ID')) for el in doc.getroot() if el.get('ID') is not None}
+
+
+def test_load_and_save_doc(lexicon):
+    luindex_path = os.path.join(lexicon, 'luIndex.xml')
+    new_path = os.path.join(lexicon, 'frame', 'Leader.xml')
+
+    with LexiconSession(lexicon) as session:
+        doc = xml_utils.load_doc(luindex_path, journal=session)
+        assert xml_utils.load_doc(luindex_path, journal=session) is doc
+
+        # the session is keyed by the real path of a file
+        assert xml_utils.load_doc(os.path.join(lexicon, 'lu', '..', 'luIndex.xml'), journal=session) is doc
+
+        doc.getroot().remove(doc.getroot().find(f'{NAMESPACE}lu'))
+        xml_utils.save_doc(doc, luindex_path, journal=session)
+        xml_utils.save_doc(doc, new_path, journal=session)
+        assert xml_utils.file_exists(new_path, journal=session)
+
+        # nothing is written before the session is flushed
+        assert get_lu_ids(luindex_path) == {1, 2, 3, 4}
+        assert not os.path.exists(new_path)
+
+    assert get_lu_ids(luindex_path) == {2, 3, 4}
+    assert get_lu_ids(new_path) == {2, 3, 4}
+    assert session.dirty == set()
+
+
+def test_remove_file(lexicon):
+    lu_path = os.path.join(lexicon, 'lu', 'lu1.xml')
+
+    with LexiconSession(lexicon) as session:
+        xml_utils.load_doc(lu_path, journal=session)
+        xml_utils.remove_file(lu_path, journal=session)
+        assert not xml_utils.file_exists(lu_path, journal=session)
+        with pytest.raises(AssertionError):
+            xml_utils.load_doc(lu_path, journal=session)
+        assert os.path.exists(lu_path)
+
+    assert not os.path.exists(lu_path)
+    assert session.removed == set()
+
+
+def test_explicit_flush(lexicon):
+    luindex_path = os.path.join(lexicon, 'luIndex.xml')
+
+    session = LexiconSession(lexicon, journaled=False)
+    doc = session.load_doc(luindex_path)
+    doc.getroot().remove(doc.getroot().find(f'{NAMESPACE}lu'))
+    session.save_doc(doc, luindex_path)
+    session.remove_file(os.path.join(lexicon, 'lu', 'lu1.xml'))
+    session.flush()
+
+    assert get_lu_ids(luindex_path) == {2, 3, 4}
+    assert not os.path.exists(os.path.join(lexicon, 'lu', 'lu1.xml'))
+
+    # the parsed documents remain cached after a flush
+    assert session.load_doc(luindex_path) is doc
+
+
+def test_discard_on_exception(lexicon):
+    luindex_path = os.path.join(lexicon, 'luIndex.xml')
+    lu_path = os.path.join(lexicon, 'lu', 'lu1.xml')
+    with open(luindex_path) as infile:
+        luindex = infile.read()
+
+    lexicon_utils.LEXICON_INDEXES[os.path.realpath(lexicon)] = {'signature' : None}
+    with pytest.raises(ValueError):
+        with LexiconSession(lexicon) as session:
+            doc = xml_utils.load_doc(luindex_path, journal=session)
+            doc.getroot().remove(doc.getroot().find(f'{NAMESPACE}lu'))
+            xml_utils.save_doc(doc, luindex_path, journal=session)
+            xml_utils.remove_file(lu_path, journal=session)
+            raise ValueError('something went wrong')
+
+    with open(luindex_path) as infile:
+        assert infile.read() == luindex
+    assert os.path.exists(lu_path)
+    assert session.docs == {}
+    assert os.path.realpath(lexicon) not in lexicon_utils.LEXICON_INDEXES
+
+
+def test_lexicon_index_of_discarded_session(lexicon):
+    with pytest.raises(ValueError):
+        with LexiconSession(lexicon) as session:
+            remove_lus(lexicon, lu_ids=[4], session=session)
+
+            # the lexicon index already reflects the edits of the session
+            your_fn = load_utils.load(folder=lexicon, merge_luindex_shards=False)
+            assert 4 not in lexicon_utils.get_lexicon_index(your_fn)['lu_id_to_info']
+            raise ValueError('something went wrong')
+
+    your_fn = load_utils.load(folder=lexicon, merge_luindex_shards=False)
+    assert 4 in lexicon_utils.get_lexicon_index(your_fn)['lu_id_to_info']
+    assert check_lexicon_consistency(lexicon, num_processes=1)['consistent']
+
+    with LexiconSession(lexicon) as session:
+        remove_lus(lexicon, lu_ids=[3, 4], session=session)
+
+    your_fn = load_utils.load(folder=lexicon, merge_luindex_shards=False)
+    assert set(lexicon_utils.get_lexicon_index(your_fn)['lu_id_to_info']) == {1, 2}
+    assert check_lexicon_consistency(lexicon, num_processes=1)['consistent']
+    assert check_lexicon_consistency(lexicon, num_processes=1)['num_lus'] == {'lu' : 2, 'frame' : 2, 'luIndex' : 2}
+
+
+def test_remove_lu_in_session(lexicon, capsys):
+    with LexiconSession(lexicon) as session:
+        remove_lu(lexicon, lu_id=4, session=session, verbose=1)
+    assert 'removed 1 LU(s) from 1 frame(s) of the lexicon.' in capsys.readouterr().out
+
+    remove_lu(lexicon, lu_id=3, verbose=0)
+    assert capsys.readouterr().out == ''
+    assert check_lexicon_consistency(lexicon, num_processes=1)['num_lus'] == {'lu' : 2, 'frame' : 2, 'luIndex' : 2}
@@ -0,0 +1,55 @@
+import os
+import sys
+from multiprocessing import Pool
+
+sys.path.append('../')
+
+import lexicon_utils
+
+
+def reserve_block(folder):
+    return lexicon_utils.reserve_lu_ids(your_lexicon_folder=folder,
+                                        num_lu_ids=50)
+
+
+def test_timestamp_style_lu_id():
+    new_lu_id = lexicon_utils.get_next_lu_id()
+    assert type(new_lu_id) == int
+    assert len(str(new_lu_id)) == 13
+
+
+def test_reserve_block(tmpdir):
+    folder = str(tmpdir)
+    first = lexicon_utils.reserve_lu_ids(your_lexicon_folder=folder, num_lu_ids=1000)
+    second = lexicon_utils.reserve_lu_ids(your_lexicon_folder=folder, num_lu_ids=1000)
+
+    assert len(first) == len(set(first)) == 1000
+    assert first == list(range(first[0], first[0] + 1000))
+    assert min(second) > max(first)
+    assert len(str(first[0])) == 13
+
+
+def test_next_lu_id_from_allocator(tmpdir):
+    folder = str(tmpdir)
+    lu_ids = [lexicon_utils.get_next_lu_id(your_lexicon_folder=folder)
+              for _ in range(100)]
+    assert len(set(lu_ids)) == 100
+
+
+def test_existing_lu_ids(tmpdir):
+    folder = str(tmpdir)
+    os.mkdir(os.path.join(folder, 'lu'))
+    future_lu_id = lexicon_utils.get_next_lu_id() + 10 ** 6
+    open(os.path.join(folder, 'lu', f'lu{future_lu_id}.xml'), 'w').close()
+
+    lu_id = lexicon_utils.get_next_lu_id(your_lexicon_folder=folder)
+    assert lu_id == future_lu_id + 1
+
+
+def test_parallel_reservations(tmpdir):
+    folder = str(tmpdir)
+    with Pool(4) as pool:
+        blocks = pool.map(reserve_block, [folder] * 20)
+
+    all_lu_ids = [lu_id for block in blocks for lu_id in block]
+    assert len(all_lu_ids) == len(set(all_lu_ids)) == 1000
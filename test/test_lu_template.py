@@ -0,0 +1,100 @@
+import os
+import sys
+
+sys.path.insert(0, '..')
+sys.path.insert(0, '../..')
+from FrameNetNLTK import xml_utils
+
+
+EN_LU = """<?xml version="1.0" encoding="UTF-8"?>
+<?xml-stylesheet type="text/xsl" href="lexUnit.xsl"?>
+<lexUnit xmlns="http://framenet.icsi.berkeley.edu" ID="10" name="leader.n" frame="Leadership" frameID="1" POS="N" status="Finished_Initial" totalAnnotated="3">
+<header><corpus name="BNC"/><frame><FE name="Leader" abbrev="lea"/></frame></header>
+<definition>COD: the person who leads.</definition>
+<lexeme POS="N" name="leader" order="1"/>
+<semType name="Human" ID="1"/>
+<valences/>
+<subCorpus name="N-s"><sentence ID="1"/></subCorpus>
+</lexUnit>
+"""
+
+STYLESHEET = '<?xml-stylesheet type="text/xsl" href="lexUnit.xsl"?>'
+
+
+class FrameNet(object):
+    """
+    the attributes of an nltk FramenetCorpusReader that are used to create LU files
+    """
+    _lu_dir = 'lu'
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(os.path.join(root, 'lu'))
+
+
+def create_framenets(folder):
+    fn_en = FrameNet(os.path.join(folder, 'fn_en'))
+    with open(os.path.join(fn_en.root, 'lu', 'lu10.xml'), 'w') as outfile:
+        outfile.write(EN_LU)
+
+    your_fn = FrameNet(os.path.join(folder, 'your_fn'))
+    en_frames = {'Leadership' : {'ID' : 1, 'FE' : {}, 'lexicalized' : True, 'template_lu_id' : 10}}
+    return fn_en, your_fn, en_frames
+
+
+def get_processing_instructions(root):
+    processing_instructions = []
+    el = root.getprevious()
+    while el is not None:
+        processing_instructions.append(el.target)
+        el = el.getprevious()
+    return processing_instructions
+
+
+def test_template_keeps_stylesheet(tmpdir):
+    fn_en, your_fn, en_frames = create_framenets(str(tmpdir))
+    xml_utils.LU_TEMPLATES.clear()
+
+    for template_dir in [None, os.path.join(str(tmpdir), 'templates')]:
+        # the second call per template_dir is served from the cache
+        for _ in range(2):
+            root = xml_utils.get_lu_template(fn_en=fn_en,
+                                             frame='Leadership',
+                                             template_dir=template_dir,
+                                             en_frames=en_frames)
+            assert get_processing_instructions(root) == ['xml-stylesheet']
+            assert root.find('{http://framenet.icsi.berkeley.edu}subCorpus') is None
+            assert root.find('{http://framenet.icsi.berkeley.edu}lexeme') is None
+            root.set('ID', '1') # copies do not affect the template
+        xml_utils.LU_TEMPLATES.clear()
+
+    # loaded from template_dir
+    root = xml_utils.get_lu_template(fn_en=fn_en,
+                                     frame='Leadership',
+                                     template_dir=os.path.join(str(tmpdir), 'templates'),
+                                     en_frames=en_frames)
+    assert get_processing_instructions(root) == ['xml-stylesheet']
+    assert root.get('ID') == '10'
+
+
+def test_lu_file_keeps_stylesheet(tmpdir):
+    fn_en, your_fn, en_frames = create_framenets(str(tmpdir))
+    xml_utils.LU_TEMPLATES.clear()
+
+    for lu_id in [1, 2]:
+        xml_utils.create_lu_xml_file(fn_en=fn_en,
+                                     your_fn=your_fn,
+                                     frame='Leadership',
+                                     lu_id=lu_id,
+                                     status='New',
+                                     lexemes=[{'order' : '1', 'name' : 'leider', 'POS' : 'N'}],
+                                     lemma='leider',
+                                     pos='N',
+                                     definition='iemand die leidt',
+                                     lu_type='singleton',
+                                     en_frames=en_frames)
+
+        with open(os.path.join(your_fn.root, 'lu', f'lu{lu_id}.xml')) as infile:
+            content = infile.read()
+        assert STYLESHEET in content
+        assert f'ID="{lu_id}"' in content
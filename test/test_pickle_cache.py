@@ -0,0 +1,68 @@
+import os
+import pickle
+import sys
+
+sys.path.insert(0, '..')
+sys.path.insert(0, '../..')
+from FrameNetNLTK import rdf_utils
+from FrameNetNLTK.path_utils import get_file_signature
+
+
+TURTLE = '''@prefix ex: <http://example.org/> .
+ex:a ex:b ex:c .
+'''
+
+PREMON_NT = '''<http://premon.fbk.eu/resource/fn17-leadership> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://premon.fbk.eu/ontology/fn#Frame> .
+<http://premon.fbk.eu/resource/fn17-leadership> <http://www.w3.org/2000/01/rdf-schema#label> "Leadership" .
+'''
+
+# a pickle of an object of which the class no longer exists, e.g., after an upgrade of rdflib
+MISSING_CLASS_PICKLE = b'cnot_a_module\nNotAClass\n)\x81.'
+
+
+def write_cache(cache_path, source_path, cache_key, payload=None):
+    with open(cache_path, 'wb') as outfile:
+        pickle.dump(cache_key, outfile)
+        pickle.dump(get_file_signature(source_path), outfile)
+        if payload is None:
+            outfile.write(MISSING_CLASS_PICKLE)
+        else:
+            pickle.dump(payload, outfile)
+
+
+def test_cached_graph(tmpdir):
+    path = os.path.join(str(tmpdir), 'vocabulary.ttl')
+    with open(path, 'w') as outfile:
+        outfile.write(TURTLE)
+    cache_path = f'{path}.graph.pickle'
+
+    assert len(rdf_utils.load_cached_graph(path, format='ttl')) == 1
+    with open(cache_path, 'rb') as infile:
+        assert pickle.load(infile) == rdf_utils.get_pickle_cache_key()
+
+    # a cache that cannot be unpickled is rebuilt
+    write_cache(cache_path, path, rdf_utils.get_pickle_cache_key())
+    assert len(rdf_utils.load_cached_graph(path, format='ttl')) == 1
+
+    # a cache of another rdflib version is not read
+    write_cache(cache_path, path, dict(rdf_utils.get_pickle_cache_key(), rdflib='0.0.1'), payload=([], []))
+    assert len(rdf_utils.load_cached_graph(path, format='ttl')) == 1
+    with open(cache_path, 'rb') as infile:
+        assert pickle.load(infile) == rdf_utils.get_pickle_cache_key()
+
+
+def test_cached_premon_index(tmpdir):
+    path = os.path.join(str(tmpdir), 'premon.nt')
+    with open(path, 'w') as outfile:
+        outfile.write(PREMON_NT)
+    index_path = f'{path}.index.pickle'
+    expected_uris = ['http://premon.fbk.eu/resource/fn17-leadership']
+
+    assert rdf_utils.load_premon_index(path)['frame_label_to_uris']['Leadership'] == expected_uris
+
+    write_cache(index_path, path, rdf_utils.get_pickle_cache_key())
+    assert rdf_utils.load_premon_index(path)['frame_label_to_uris']['Leadership'] == expected_uris
+
+    write_cache(index_path, path, dict(rdf_utils.get_pickle_cache_key(), pickle_protocol=0),
+                payload={'frame_label_to_uris' : {}})
+    assert rdf_utils.load_premon_index(path)['frame_label_to_uris']['Leadership'] == expected_uris
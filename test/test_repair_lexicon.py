@@ -0,0 +1,120 @@
+import os
+import sys
+
+from lxml import etree
+
+sys.path.insert(0, '..')
+sys.path.insert(0, '../..')
+from FrameNetNLTK import repair_lexicon, check_lexicon_consistency, shard_luindex
+from FrameNetNLTK import lexicon_utils
+
+
+NAMESPACE = '{http://framenet.icsi.berkeley.edu}'
+
+
+def get_lexunit_els(folder, frame):
+    doc = etree.parse(os.path.join(folder, 'frame', f'{frame}.xml'))
+    return {int(lexunit_el.get('ID')) : lexunit_el
+            for lexunit_el in doc.getroot().findall(f'{NAMESPACE}lexUnit')}
+
+
+def get_luindex_lu_els(path):
+    doc = etree.parse(path)
+    return {int(lu_el.get('ID')) : lu_el
+            for lu_el in doc.getroot().findall(f'{NAMESPACE}lu')}
+
+
+def test_consistent_lexicon_is_not_rewritten(lexicon):
+    result = repair_lexicon(lexicon, num_processes=1, agent='Piek_Vossen')
+    assert result['report']['consistent']
+    assert result['frames'] == []
+    assert not result['luIndex']
+
+
+def test_repair_orphans(tmpdir, create_lexicon, lexicon_lus):
+    folder = str(tmpdir)
+    orphan = {'lu_id' : 5, 'name' : 'leider.n', 'frame' : 'Leadership', 'lemma_id' : 13}
+    create_lexicon(folder,
+                   lus=lexicon_lus,
+                   luindex_lus=lexicon_lus[1:] + [orphan],
+                   frame_lus=lexicon_lus[1:] + [orphan])
+
+    result = repair_lexicon(folder, num_processes=2, agent='Piek_Vossen', provenance='repair')
+    assert [orphan['lu_id'] for orphan in result['report']['orphans']] == [1, 5]
+    assert result['frames'] == ['Leadership']
+    assert result['luIndex']
+    assert check_lexicon_consistency(folder, num_processes=1)['consistent']
+
+    # the lexUnit element of LU 1 is recreated from its LU file, the one of LU 5 is removed
+    lexunit_els = get_lexunit_els(folder, 'Leadership')
+    assert set(lexunit_els) == {1}
+    assert lexunit_els[1].get('name') == 'president.n'
+    assert lexunit_els[1].get('lemmaID') == '10' # the lemma id of president.n in Appellations
+    assert lexunit_els[1].get('provenance') == 'repair'
+    assert [lexeme_el.get('name') for lexeme_el in lexunit_els[1].findall(f'{NAMESPACE}lexeme')] == ['president']
+
+    assert set(get_luindex_lu_els(os.path.join(folder, 'luIndex.xml'))) == {1, 2, 3, 4}
+
+    index = lexicon_utils.build_lexicon_index(folder)
+    assert lexicon_utils.get_luid_from_index(index, 'Leadership', 'president', 'N') == (1, 'succes')
+    assert lexicon_utils.get_luid_from_index(index, 'Leadership', 'leider', 'N')[0] is None
+
+
+def test_repair_frame_mismatch_keeps_metadata(tmpdir, create_lexicon, lexicon_lus):
+    folder = str(tmpdir)
+    wrong_frame_lus = [dict(lu, frame='Leadership') if lu['lu_id'] == 2 else lu
+                       for lu in lexicon_lus]
+    for lu in wrong_frame_lus:
+        if lu['lu_id'] == 2:
+            lu.update({'cBy' : 'Marten_Postma', 'provenance' : 'batch_0', 'lemma_id' : 20})
+    create_lexicon(folder,
+                   lus=lexicon_lus,
+                   luindex_lus=wrong_frame_lus,
+                   frame_lus=wrong_frame_lus)
+
+    result = repair_lexicon(folder, num_processes=1, agent='Piek_Vossen')
+    assert result['report']['frame_mismatches'] == [{'lu_id' : 2, 'frames' : {'lu' : 'Appellations',
+                                                                              'frame' : 'Leadership',
+                                                                              'luIndex' : 'Leadership'}}]
+    assert result['frames'] == ['Appellations', 'Leadership']
+    assert result['luIndex']
+    assert check_lexicon_consistency(folder, num_processes=1)['consistent']
+
+    # the lexUnit element is moved, not recreated
+    assert set(get_lexunit_els(folder, 'Leadership')) == {1}
+    lexunit_el = get_lexunit_els(folder, 'Appellations')[2]
+    assert lexunit_el.get('cBy') == 'Marten_Postma'
+    assert lexunit_el.get('provenance') == 'batch_0'
+    assert lexunit_el.get('lemmaID') == '20'
+    assert lexunit_el.get('cDate') == '01/01/2021 12:00:00 CET Fri'
+
+    lu_el = get_luindex_lu_els(os.path.join(folder, 'luIndex.xml'))[2]
+    assert lu_el.get('frameName') == 'Appellations'
+    assert lu_el.get('frameID') == '2'
+    assert lu_el.get('hasAnnotation') == 'false'
+
+
+def test_repair_sharded_luindex(tmpdir, create_lexicon, lexicon_lus):
+    folder = str(tmpdir)
+    create_lexicon(folder, lus=lexicon_lus)
+    shard_luindex(folder, shard_by='frame')
+
+    # LU 3 is missing in its shard
+    shard_path = lexicon_utils.get_luindex_shard_path(folder, 'Change_of_leadership')
+    doc = etree.parse(shard_path)
+    for lu_el in doc.getroot().findall(f'{NAMESPACE}lu'):
+        if lu_el.get('ID') == '3':
+            doc.getroot().remove(lu_el)
+    doc.write(shard_path, encoding='UTF-8', xml_declaration=True)
+    os.utime(os.path.join(folder, 'luIndex.xml'), ns=(0, 0))
+
+    result = repair_lexicon(folder, num_processes=1, agent='Piek_Vossen')
+    assert [orphan['lu_id'] for orphan in result['report']['orphans']] == [3]
+    assert result['frames'] == []
+    assert result['luIndex']
+
+    assert lexicon_utils.get_luindex_shard_layout(folder) == {'shard_by' : 'frame'}
+    assert lexicon_utils.luindex_shards_are_merged(folder)
+    assert set(get_luindex_lu_els(shard_path)) == {3, 4}
+    assert set(get_luindex_lu_els(os.path.join(folder, 'luIndex.xml'))) == {1, 2, 3, 4}
+    assert check_lexicon_consistency(folder, num_processes=1)['consistent']
@@ -0,0 +1,158 @@
+import json
+import os
+import subprocess
+import sys
+
+from rdflib import Graph, Namespace, Literal, RDF, RDFS
+
+sys.path.append('../')
+
+import validation_utils
+
+
+SKOS_NAMESPACE = 'http://www.w3.org/2004/02/skos/core#'
+
+CONTEXT = {
+    'frames' : {'Leadership', 'Change_of_leadership'},
+    'frame_to_fes' : {'Leadership' : {'Leader', 'Governed'}},
+    'lu_ids' : {1, 2, 3},
+    'skos_namespace_and_predicates' : (SKOS_NAMESPACE, frozenset({'closeMatch', 'exactMatch'}))
+}
+
+
+def create_lu(**kwargs):
+    lu = {'lu_name' : 'verkiezing.n',
+          'lexemes' : [{'order' : '1', 'headword' : 'false', 'breakBefore' : 'false',
+                        'POS' : 'N', 'name' : 'verkiezing'}],
+          'pos' : 'N',
+          'frame' : 'Change_of_leadership',
+          'status' : 'New',
+          'agent' : 'Piek_Vossen',
+          'provenance' : 'batch_1'}
+    lu.update(kwargs)
+    return lu
+
+
+VALID_LUS = [
+    create_lu(),
+    create_lu(lu_name='presidentsverkiezing.n',
+              lu_type='endocentric compound',
+              lexemes=[{'order' : '1', 'headword' : 'false', 'breakBefore' : 'false',
+                        'POS' : 'N', 'name' : 'presidents', 'lu_id' : '1'},
+                       {'order' : '2', 'headword' : 'true', 'breakBefore' : 'false',
+                        'POS' : 'N', 'name' : 'verkiezing', 'lu_id' : '2'}],
+              skos_predicate_to_external_references={'closeMatch' : ['http://example.org/1']}),
+    create_lu(lu_name='leider.n',
+              frame='Leadership',
+              incorporated_fe='Leader',
+              lexemes=[{'order' : '1', 'headword' : 'false', 'breakBefore' : 'false',
+                        'POS' : 'N', 'name' : 'leider'}])
+]
+
+# an LU that fails many validation steps
+INVALID_LU = create_lu(lu_name='verkiezing.v',
+                       frame='Unknown_frame',
+                       status='Unknown_status',
+                       agent='Piek Vossen',
+                       skos_predicate_to_external_references={'broadMatch' : ['http://example.org/1']})
+
+
+def test_valid_lus():
+    for lu in VALID_LUS:
+        assert validation_utils.validate_lu_with_context(lu, CONTEXT) == []
+
+
+def test_all_errors_of_an_lu():
+    errors = validation_utils.validate_lu_with_context(INVALID_LU, CONTEXT)
+    assert len(errors) == 5
+    assert errors[0].startswith('ValidationError: different POS provided')
+    assert errors[1].startswith('ValidationError: Unknown_status')
+    assert errors[2].startswith('ValidationError: character')
+    assert errors[3] == 'KeyError: \'Unknown_frame not part of your FrameNet.\''
+    assert errors[4].startswith('ValidationError: broadMatch')
+
+
+def test_errors_of_lexemes():
+    lu = create_lu(lu_name='presidentsverkiezing.n',
+                   lu_type='endocentric compound',
+                   incorporated_fe='Leader',
+                   frame='Leadership',
+                   lexemes=[{'order' : '1', 'headword' : 'maybe', 'breakBefore' : 'false',
+                             'POS' : 'N', 'name' : 'presidents', 'lu_id' : '4'},
+                            {'order' : '3', 'headword' : 'true', 'breakBefore' : 'false',
+                             'POS' : 'N', 'name' : 'verkiezingen'}])
+    errors = validation_utils.validate_lu_with_context(lu, CONTEXT)
+    assert len(errors) == 4
+    assert 'lu id 4 not found' in errors[0]
+    assert 'order attribute' in errors[1]
+    assert 'does not match the lu_name' in errors[2]
+    assert 'mismatch between incorporatedFE' in errors[3]
+
+
+def test_missing_attributes():
+    lu = create_lu()
+    del lu['agent']
+    assert validation_utils.validate_lu_with_context(lu, CONTEXT) == ["KeyError: 'agent'"]
+
+
+def test_validate_lus_in_parallel():
+    lus = VALID_LUS + [INVALID_LU] * 3
+    report = validation_utils.validate_lus(your_fn=None, fn_en=None, lus=lus, context=CONTEXT, num_processes=1)
+    assert [entry['valid'] for entry in report] == [True, True, True, False, False, False]
+    assert report[3] == {'lu_name' : 'verkiezing.v',
+                         'frame' : 'Unknown_frame',
+                         'valid' : False,
+                         'errors' : validation_utils.validate_lu_with_context(INVALID_LU, CONTEXT)}
+
+    assert validation_utils.validate_lus(your_fn=None, fn_en=None, lus=lus, context=CONTEXT, num_processes=2) == report
+
+
+def test_malformed_lus_in_batch():
+    # an LU without lexemes and an LU without pos do not abort the validation of the other LUs
+    lus = [create_lu(lexemes=[]), VALID_LUS[0], create_lu(pos=None), VALID_LUS[2]]
+    report = validation_utils.validate_lus(your_fn=None, fn_en=None, lus=lus, context=CONTEXT, num_processes=1)
+    assert [entry['valid'] for entry in report] == [False, True, False, True]
+    assert any(error.startswith('IndexError') for error in report[0]['errors'])
+    assert any(error.startswith('AttributeError') for error in report[2]['errors'])
+
+    assert validation_utils.validate_lus(your_fn=None, fn_en=None, lus=lus, context=CONTEXT, num_processes=2) == report
+
+
+def test_validation_with_optimizations():
+    # unlike assert statements, the validation steps are also performed if Python runs with -O
+    script = '\n'.join(['import json, sys',
+                        'sys.path.append("../")',
+                        'import test_validate_lus as t',
+                        'errors = t.validation_utils.validate_lu_with_context(t.INVALID_LU, t.CONTEXT)',
+                        'print(json.dumps([sys.flags.optimize, errors]))'])
+    output = subprocess.run([sys.executable, '-O', '-c', script],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            check=True,
+                            stdout=subprocess.PIPE).stdout
+    optimize, errors = json.loads(output)
+    assert optimize == 1
+
+    # the error messages can differ in the order of the elements of a set
+    expected_errors = validation_utils.validate_lu_with_context(INVALID_LU, CONTEXT)
+    assert [error[:30] for error in errors] == [error[:30] for error in expected_errors]
+
+
+def test_skos_vocabulary():
+    SKOS = Namespace(SKOS_NAMESPACE)
+    skos = Graph()
+    skos.bind('skos', SKOS)
+    skos.add((SKOS.closeMatch, RDF.type, RDF.Property))
+
+    assert validation_utils.get_skos_namespace_and_predicates(skos) == (SKOS_NAMESPACE, frozenset({'closeMatch'}))
+    terms = validation_utils.get_vocabulary_terms(skos)
+    assert validation_utils.get_vocabulary_terms(skos) is terms
+
+    # the compiled vocabulary is cached per graph as well
+    skos_predicates = validation_utils.get_skos_namespace_and_predicates(skos)[1]
+    assert validation_utils.get_skos_namespace_and_predicates(skos)[1] is skos_predicates
+    assert validation_utils.SKOS_VOCABULARIES[skos] == (1, SKOS_NAMESPACE, skos_predicates)
+
+    # the terms are computed again if the graph changed
+    skos.add((SKOS.exactMatch, RDFS.label, Literal('exact match')))
+    assert validation_utils.get_skos_namespace_and_predicates(skos) == (SKOS_NAMESPACE, frozenset({'closeMatch', 'exactMatch'}))
+    assert validation_utils.get_skos_namespace_and_predicates(None) == (None, None)
@@ -1,3 +1,6 @@
+import weakref
+from multiprocessing import Pool
+
 import nltk
 
 from rdflib import Namespace, URIRef
@@ -14,6 +17,13 @@ POS = {'PRON', 'NUM', 'A', 'PREP', 'IDIO', 'N', 'INTJ', 'V', 'ART', 'SCON', 'ADV
 
 ILLEGAL_CHARS_IN_AGENT = {'#', '/', ' '}
 
+# vocabulary graph -> (number of triples, frozenset of its subjects) (see get_vocabulary_terms)
+VOCABULARY_TERMS = weakref.WeakKeyDictionary()
+
+# skos graph -> (number of triples, skos namespace, frozenset of skos predicates)
+# (see get_skos_namespace_and_predicates)
+SKOS_VOCABULARIES = weakref.WeakKeyDictionary()
+
 LEXEME_ATTRS = {
     'order',
     'headword',
@@ -35,6 +45,19 @@ TYPES = {
     'exocentric compound'
 }
 
+class ValidationError(AssertionError):
+    """
+    raised when an LU does not pass validation.
+    It is a subclass of AssertionError for backward compatibility,
+    but, unlike an assert statement, it is also raised when Python runs with -O.
+    """
+
+
+def require(condition, message):
+    if not condition:
+        raise ValidationError(message)
+
+
 def create_lemma(lexemes, separator=''):
     order_to_lexeme = dict()
     for lexeme in lexemes:
@@ -69,27 +92,39 @@ the_lexemes = [{
 assert create_lemma(lexemes=the_lexemes, separator=' ') == 'give up'
 
 def validate_status(status):
-    assert status in STATUS, f'{status} not part of accepted set: {STATUS}'
+    require(status in STATUS, f'{status} not part of accepted set: {STATUS}')
 
 
 validate_status(status='New')
 
 
 def validate_pos(pos):
-    assert pos in POS, f'{pos} not part of accepted set: {POS}'
+    require(pos in POS, f'{pos} not part of accepted set: {POS}')
 
 
 validate_pos(pos='N')
 
 
-def validate_frame(your_fn, frame_name):
+def validate_frame(your_fn, frame_name, frames=None):
+    """
+    :param frames: optional set of the frame labels of your FrameNet (by default, the frame is loaded from your_fn)
+    """
+    if frames is not None:
+        if frame_name not in frames:
+            raise KeyError(f'{frame_name} not part of your FrameNet.')
+        return
+
     try:
         your_fn.frame_by_name(frame_name)
     except nltk.corpus.reader.framenet.FramenetError:
         raise KeyError(f'{frame_name} not part of your FrameNet.')
 
 
-def validate_lexeme(my_fn, lexeme, lu_type):
+def validate_lexeme(my_fn, lexeme, lu_type, lu_ids=None):
+    """
+    :param lu_ids: optional collection of the lu identifiers of the lexicon
+    (by default, they are obtained from my_fn), against which the optional attribute lu_id is validated
+    """
     for lexeme_attr in LEXEME_ATTRS:
 
         # a lexeme of a phrasal verb does not need to have a POS attribute
@@ -98,45 +133,47 @@ def validate_lexeme(my_fn, lexeme, lu_type):
                 lexeme_attr == 'POS']):
             continue
 
-        assert lexeme_attr in lexeme, \
-            f'missing atribute {lexeme_attr} in {lexeme} (required are {LEXEME_ATTRS}'
+        require(lexeme_attr in lexeme,
+                f'missing atribute {lexeme_attr} in {lexeme} (required are {LEXEME_ATTRS}')
 
     for lexeme_attr, value in lexeme.items():
-        assert lexeme_attr in LEXEME_ATTRS | OPTIONAL_LEXEME_ATTRS, \
-            f'{lexeme_attr} not part of allowed attributes. Please inspect.'
+        require(lexeme_attr in LEXEME_ATTRS | OPTIONAL_LEXEME_ATTRS,
+                f'{lexeme_attr} not part of allowed attributes. Please inspect.')
 
         if lexeme_attr == 'lu_id':
-            assert int(value) in my_fn.lu_ids_and_names(), \
-                f'lu id {value} not found in your FrameNet. Please inspect.'
+            if lu_ids is None:
+                lu_ids = my_fn.lu_ids_and_names()
+            require(int(value) in lu_ids,
+                    f'lu id {value} not found in your FrameNet. Please inspect.')
 
     int(lexeme['order'])
-    assert lexeme['headword'] in {'true', 'false'}, \
-        f'possible values for headword are "true" and "false". You specified {lexeme["headword"]}'
-    assert lexeme['breakBefore'] in {'true', 'false'}, \
-        f'possible values for breakBefore are "true" and "false". You specified {lexeme["breakBefore"]}'
+    require(lexeme['headword'] in {'true', 'false'},
+            f'possible values for headword are "true" and "false". You specified {lexeme["headword"]}')
+    require(lexeme['breakBefore'] in {'true', 'false'},
+            f'possible values for breakBefore are "true" and "false". You specified {lexeme["breakBefore"]}')
 
     if 'POS' in lexeme:
         validate_pos(pos=lexeme["POS"])
 
     name = lexeme['name']
-    assert type(name) == str, f'the name of lexeme should be a string, you provided a {type(name)}.'
+    require(type(name) == str, f'the name of lexeme should be a string, you provided a {type(name)}.')
 
 
 def validate_order_attr(lexemes):
     orders_gold = [str(i) for i in range(1, len(lexemes) + 1)]
     orders_provided = [lexeme['order'] for lexeme in lexemes]
 
-    assert set(orders_gold) == set(orders_provided), f'Please inspect order attribute: {lexemes}'
+    require(set(orders_gold) == set(orders_provided), f'Please inspect order attribute: {lexemes}')
 
 
-def validate_lexemes(my_fn, lexemes, lu_type):
+def validate_lexemes(my_fn, lexemes, lu_type, lu_ids=None):
     for lexeme in lexemes:
-        validate_lexeme(my_fn=my_fn, lexeme=lexeme, lu_type=lu_type)
+        validate_lexeme(my_fn=my_fn, lexeme=lexeme, lu_type=lu_type, lu_ids=lu_ids)
 
     if len(lexemes) == 1:
         lexeme = lexemes[0]
-        assert 'lu_id' not in lexeme, \
-            f'the optional attribute lu_id is only allowed in multi-lexeme expressions. Please inspect.'
+        require('lu_id' not in lexeme,
+                f'the optional attribute lu_id is only allowed in multi-lexeme expressions. Please inspect.')
 
 
 def frames_with_lemma_pos_in_lexicon(your_fn, lemma, pos):
@@ -151,7 +188,8 @@ def frames_with_lemma_pos_in_lexicon(your_fn, lemma, pos):
 
 def validate_incorporated_fe(fn_en,
                              frame_label,
-                             incorporated_fe):
+                             incorporated_fe,
+                             fes=None):
     """
     we validate that the incorporated_fe is part of the frame
     that the LU is added to.
@@ -162,10 +200,12 @@ def validate_incorporated_fe(fn_en,
     :param fn_en:
     :param frame_label:
     :param incorporated_fe:
+    :param fes: optional set of the FE labels of the frame (by default, the frame is loaded from fn_en)
     :return:
     """
-    frame = fn_en.frame_by_name(frame_label)
-    assert incorporated_fe in frame.FE.keys(), f'{incorporated_fe} not part of frame {frame_label}'
+    if fes is None:
+        fes = fn_en.frame_by_name(frame_label).FE.keys()
+    require(incorporated_fe in fes, f'{incorporated_fe} not part of frame {frame_label}')
 
 
 def validate_incorporate_fe_lu_and_lexemes(incorporated_fe,
@@ -182,31 +222,31 @@ def validate_incorporate_fe_lu_and_lexemes(incorporated_fe,
     incorporated_fe_lu = set()
     if incorporated_fe is not None:
         incorporated_fe_lu.add(incorporated_fe)
-    assert incorporated_fes == incorporated_fe_lu,\
-        f'mismatch between incorporatedFE at LU level and in the lexemes: {incorporated_fe} {lexemes}'
+    require(incorporated_fes == incorporated_fe_lu,
+            f'mismatch between incorporatedFE at LU level and in the lexemes: {incorporated_fe} {lexemes}')
 
 
 def validate_lu_type(lu_type):
-    assert lu_type in TYPES, f'type {lu_type} is not part of the accepted set: {TYPES}'
+    require(lu_type in TYPES, f'type {lu_type} is not part of the accepted set: {TYPES}')
 
 
 def validate_lu_pos(lu_pos, pos):
-    assert lu_pos == pos.lower(), f'different POS provided for lu_name and pos of lu: {lu_pos} and {pos}'
+    require(lu_pos == pos.lower(), f'different POS provided for lu_name and pos of lu: {lu_pos} and {pos}')
 
 
 def validate_num_lexemes(lexemes, lu_type):
     if lu_type in {'singleton'}:
-        assert len(lexemes) == 1, f'for lu_type {lu_type} the number of lexemes should be one, you provided {len(lexemes)}.'
+        require(len(lexemes) == 1, f'for lu_type {lu_type} the number of lexemes should be one, you provided {len(lexemes)}.')
 
     elif lu_type in {'phrasal',
                      'endocentric compound'}:
-        assert len(lexemes) >= 2, f'for lu_type {lu_type} the number of lexemes should be 2>, you provided {len(lexemes)}.'
+        require(len(lexemes) >= 2, f'for lu_type {lu_type} the number of lexemes should be 2>, you provided {len(lexemes)}.')
 
 
 def validate_lexemes_vs_luname(lexemes, lu_type, lu_lemma):
     if lu_type == 'singleton':
         lexeme = lexemes[0]['name']
-        assert lexeme == lu_lemma, f'for lu_type singleton, the lu_name ({lu_lemma}) and lexeme ({lexeme}) should match.'
+        require(lexeme == lu_lemma, f'for lu_type singleton, the lu_name ({lu_lemma}) and lexeme ({lexeme}) should match.')
     elif lu_type == 'endocentric compound':
         recreated_lemma = create_lemma(lexemes=lexemes,
                                        separator='')
@@ -214,7 +254,7 @@ def validate_lexemes_vs_luname(lexemes, lu_type, lu_lemma):
         parts = [f'recreated lemma from lexemes ({recreated_lemma}) does not match the lu_name ({lu_lemma})',
                  f'for the chosen lu_type ({lu_type}), this is needed.']
         error_message = '\n'.join(parts)
-        assert lu_lemma == recreated_lemma, error_message
+        require(lu_lemma == recreated_lemma, error_message)
     elif lu_type in {'idiom',
                      'phrasal',
                      'exocentric compound'}:
@@ -222,26 +262,88 @@ def validate_lexemes_vs_luname(lexemes, lu_type, lu_lemma):
             name = lexeme['name']
             parts = [f'lexeme: {name} is not part of the lu_lemma ({lu_lemma})']
             error_message = '\n'.join(parts)
-            assert name in lu_lemma, error_message
+            require(name in lu_lemma, error_message)
+
+
 
+def get_vocabulary_terms(graph):
+    """
+    the subjects of a vocabulary, e.g., FrameNetNLTK.skos or FrameNetNLTK.lemon.
+    They are computed once per graph and computed again if triples were added to or removed from the graph.
+
+    :rtype: frozenset
+    """
+    num_triples = len(graph)
+    cached = VOCABULARY_TERMS.get(graph)
+    if cached is not None and cached[0] == num_triples:
+        return cached[1]
 
+    terms = frozenset(graph.subjects())
+    VOCABULARY_TERMS[graph] = (num_triples, terms)
+    return terms
 
-def validate_skos(skos_predicate_to_external_references, skos):
+
+def compile_skos_vocabulary(skos):
+    """
+    :param skos: FrameNetNLTK.skos
+
+    :rtype: tuple
+    :return: (the skos namespace, frozenset of the skos predicates (local names))
+    """
     skos_namespace = None
+    for prefix, namespace in skos.namespaces():
+        if prefix == 'skos':
+            skos_namespace = namespace.toPython()
 
-    if skos_predicate_to_external_references:
-        assert skos is not None, f'skos is None. Please provide FrameNetNLTK.skos'
+    if skos_namespace is None:
+        return None, frozenset()
+
+    skos_predicates = frozenset(str(subject)[len(skos_namespace):]
+                                for subject in get_vocabulary_terms(skos)
+                                if isinstance(subject, URIRef) and str(subject).startswith(skos_namespace))
+
+    return skos_namespace, skos_predicates
+
+
+def get_skos_namespace_and_predicates(skos):
+    """
+    obtain the compiled skos vocabulary (see compile_skos_vocabulary).
+    It is compiled once per graph and compiled again if triples were added to or removed from the graph.
+
+    :param skos: FrameNetNLTK.skos or None
+
+    :rtype: tuple
+    :return: (the skos namespace, frozenset of the skos predicates (local names)) or (None, None) if skos is None
+    """
+    if skos is None:
+        return None, None
+
+    num_triples = len(skos)
+    cached = SKOS_VOCABULARIES.get(skos)
+    if cached is not None and cached[0] == num_triples:
+        return cached[1], cached[2]
 
-    if skos is not None:
-        for prefix, namespace in skos.namespaces():
-            if prefix == 'skos':
-                skos_namespace = namespace.toPython()
+    skos_namespace, skos_predicates = compile_skos_vocabulary(skos)
+    SKOS_VOCABULARIES[skos] = (num_triples, skos_namespace, skos_predicates)
 
-        SKOS = Namespace(skos_namespace)
+    return skos_namespace, skos_predicates
 
-        for predicate in skos_predicate_to_external_references:
-            pred_uriref = URIRef(SKOS + predicate)
-            assert pred_uriref in skos.subjects(), f'{predicate} ({pred_uriref}) not part of skos.'
+
+def validate_skos(skos_predicate_to_external_references, skos, skos_namespace_and_predicates=None):
+    """
+    :param skos_namespace_and_predicates: optional result of get_skos_namespace_and_predicates(skos)
+    """
+    if skos_namespace_and_predicates is None:
+        skos_namespace_and_predicates = get_skos_namespace_and_predicates(skos)
+    skos_namespace, skos_predicates = skos_namespace_and_predicates
+
+    if skos_predicate_to_external_references:
+        require(skos_predicates is not None, f'skos is None. Please provide FrameNetNLTK.skos')
+
+    for predicate in skos_predicate_to_external_references:
+        if predicate not in skos_predicates:
+            pred_uriref = URIRef(Namespace(skos_namespace) + predicate)
+            raise ValidationError(f'{predicate} ({pred_uriref}) not part of skos.')
 
     return skos_namespace
 
@@ -250,8 +352,232 @@ def validate_skos(skos_predicate_to_external_references, skos):
 def validate_agent(agent):
 
     for illegal_char_in_agent in ILLEGAL_CHARS_IN_AGENT:
-        assert illegal_char_in_agent not in agent, f'character (repr({illegal_char_in_agent})) are not allowed in agent: {agent}'
+        require(illegal_char_in_agent not in agent, f'character (repr({illegal_char_in_agent})) are not allowed in agent: {agent}')
 
 def validate_provenance(provenance):
     for illegal_char_in_agent in ILLEGAL_CHARS_IN_AGENT:
-        assert illegal_char_in_agent not in provenance, f'character (repr({illegal_char_in_agent})) are not allowed in agent: {provenance}'
\ No newline at end of file
+        require(illegal_char_in_agent not in provenance, f'character (repr({illegal_char_in_agent})) are not allowed in agent: {provenance}')
+
+
+def validate_lu(your_fn,
+                fn_en,
+                lu_lemma,
+                lu_pos,
+                lexemes,
+                status,
+                pos,
+                frame,
+                agent,
+                provenance,
+                lu_type,
+                incorporated_fe,
+                skos_predicate_to_external_references,
+                skos,
+                lu_ids=None,
+                en_frames=None):
+    """
+    perform all attribute validation steps for one LU
+    (see lexicon.add_lu for the meaning of the parameters and validate_lexeme for lu_ids)
+
+    :param dict en_frames: optional metadata of the English frames (see snapshot_utils.get_en_frames),
+    which avoids loading the frame from fn_en
+
+    :rtype: str
+    :return: the skos namespace (None if skos is None)
+    """
+    validate_lu_type(lu_type)
+    validate_num_lexemes(lexemes, lu_type)
+    validate_lu_pos(lu_pos, pos)
+    validate_lexemes(my_fn=your_fn, lexemes=lexemes, lu_type=lu_type, lu_ids=lu_ids)
+    validate_order_attr(lexemes=lexemes)
+    validate_status(status=status)
+    validate_agent(agent=agent)
+    validate_provenance(provenance=provenance)
+    validate_pos(pos=pos)
+    validate_frame(your_fn=your_fn, frame_name=frame)
+    validate_lexemes_vs_luname(lexemes=lexemes,
+                               lu_type=lu_type,
+                               lu_lemma=lu_lemma)
+    skos_namespace = validate_skos(skos_predicate_to_external_references=skos_predicate_to_external_references,
+                                   skos=skos)
+
+    if incorporated_fe is not None:
+        fes = None
+        if en_frames is not None and frame in en_frames:
+            fes = en_frames[frame]['FE'].keys()
+        validate_incorporated_fe(fn_en=fn_en,
+                                 frame_label=frame,
+                                 incorporated_fe=incorporated_fe,
+                                 fes=fes)
+
+    validate_incorporate_fe_lu_and_lexemes(incorporated_fe=incorporated_fe,
+                                           lexemes=lexemes)
+
+    return skos_namespace
+
+
+def create_validation_context(your_fn,
+                              fn_en,
+                              lus,
+                              skos=None,
+                              lu_ids=None,
+                              en_frames=None):
+    """
+    precompute everything that is needed to validate a batch of LUs (see validate_lus),
+    such that no validation step needs to load a frame or LU.
+
+    :param list lus: the LUs to validate (see lexicon.add_lus for the format)
+    :param lu_ids: optional collection of the lu identifiers of your lexicon (by default, obtained from your_fn)
+    :param dict en_frames: optional metadata of the English frames (see snapshot_utils.get_en_frames)
+
+    :rtype: dict
+    """
+    frames = set(your_fn.frame_ids_and_names().values())
+
+    frame_to_fes = {}
+    for lu in lus:
+        frame = lu.get('frame')
+        if all([lu.get('incorporated_fe') is not None,
+                frame in frames,
+                frame not in frame_to_fes]):
+            if en_frames is not None and frame in en_frames:
+                frame_to_fes[frame] = set(en_frames[frame]['FE'])
+            else:
+                frame_to_fes[frame] = set(fn_en.frame_by_name(frame).FE.keys())
+
+    if lu_ids is None:
+        lu_ids = your_fn.lu_ids_and_names()
+
+    return {
+        'frames' : frames,
+        'frame_to_fes' : frame_to_fes,
+        'lu_ids' : set(lu_ids),
+        'skos_namespace_and_predicates' : get_skos_namespace_and_predicates(skos)
+    }
+
+
+def validate_lu_with_context(lu, context):
+    """
+    perform all attribute validation steps for one LU using a validation context (see create_validation_context).
+    Unlike validate_lu, all steps are performed, even if an earlier one fails.
+
+    :param dict lu: an LU (see lexicon.add_lus for the format)
+
+    :rtype: list
+    :return: the error messages (empty if the LU is valid)
+    """
+    errors = []
+
+    def check(validation_function, **kwargs):
+        # any exception, e.g., an IndexError for an LU without lexemes, is reported for this LU only,
+        # such that the other LUs of the batch are still validated
+        try:
+            validation_function(**kwargs)
+        except Exception as error:
+            errors.append(f'{type(error).__name__}: {error}')
+
+    try:
+        lu_lemma, lu_pos = lu['lu_name'].rsplit('.', 1)
+        lexemes = lu['lexemes']
+        pos = lu['pos']
+        frame = lu['frame']
+        status = lu['status']
+        agent = lu['agent']
+        provenance = lu['provenance']
+    except (KeyError, ValueError, AttributeError, TypeError) as error:
+        return [f'{type(error).__name__}: {error}']
+
+    lu_type = lu.get('lu_type', 'singleton')
+    incorporated_fe = lu.get('incorporated_fe')
+
+    check(validate_lu_type, lu_type=lu_type)
+    check(validate_num_lexemes, lexemes=lexemes, lu_type=lu_type)
+    check(validate_lu_pos, lu_pos=lu_pos, pos=pos)
+    check(validate_lexemes, my_fn=None, lexemes=lexemes, lu_type=lu_type, lu_ids=context['lu_ids'])
+    check(validate_order_attr, lexemes=lexemes)
+    check(validate_status, status=status)
+    check(validate_agent, agent=agent)
+    check(validate_provenance, provenance=provenance)
+    check(validate_pos, pos=pos)
+    check(validate_frame, your_fn=None, frame_name=frame, frames=context['frames'])
+    check(validate_lexemes_vs_luname, lexemes=lexemes, lu_type=lu_type, lu_lemma=lu_lemma)
+    check(validate_skos,
+          skos_predicate_to_external_references=lu.get('skos_predicate_to_external_references', {}),
+          skos=None,
+          skos_namespace_and_predicates=context['skos_namespace_and_predicates'])
+
+    if incorporated_fe is not None and frame in context['frame_to_fes']:
+        check(validate_incorporated_fe,
+              fn_en=None,
+              frame_label=frame,
+              incorporated_fe=incorporated_fe,
+              fes=context['frame_to_fes'][frame])
+
+    check(validate_incorporate_fe_lu_and_lexemes, incorporated_fe=incorporated_fe, lexemes=lexemes)
+
+    return errors
+
+
+# the validation context of a worker process (see validate_lus)
+WORKER_CONTEXT = {}
+
+
+def set_worker_context(context):
+    WORKER_CONTEXT.update(context)
+
+
+def validate_lu_in_worker(lu):
+    return validate_lu_with_context(lu, WORKER_CONTEXT)
+
+
+def validate_lus(your_fn,
+                 fn_en,
+                 lus,
+                 skos=None,
+                 lu_ids=None,
+                 context=None,
+                 num_processes=1):
+    """
+    validate a batch of LUs.
+    The information that is needed is precomputed once (see create_validation_context),
+    after which all LUs are validated, optionally in parallel.
+
+    :param list lus: the LUs to validate (see lexicon.add_lus for the format)
+    :param skos: use FrameNetNLTK.skos (needed if LUs contain external references)
+    :param lu_ids: optional collection of the lu identifiers of your lexicon
+    :param dict context: optional precomputed validation context
+    :param int num_processes: if higher than 1, the LUs are validated using a process pool
+
+    :rtype: list
+    :return: one dictionary per LU (in the order of lus) with the keys:
+    -lu_name: the lu_name of the LU
+    -frame: the frame of the LU
+    -valid: True if the LU passed all validation steps
+    -errors: the error messages of the failed validation steps
+    """
+    if context is None:
+        context = create_validation_context(your_fn=your_fn,
+                                            fn_en=fn_en,
+                                            lus=lus,
+                                            skos=skos,
+                                            lu_ids=lu_ids)
+
+    if num_processes > 1:
+        chunksize = max(1, len(lus) // (num_processes * 4))
+        with Pool(processes=num_processes,
+                  initializer=set_worker_context,
+                  initargs=(context,)) as pool:
+            errors_per_lu = pool.map(validate_lu_in_worker, lus, chunksize=chunksize)
+    else:
+        errors_per_lu = [validate_lu_with_context(lu, context) for lu in lus]
+
+    report = []
+    for lu, errors in zip(lus, errors_per_lu):
+        report.append({
+            'lu_name' : lu.get('lu_name'),
+            'frame' : lu.get('frame'),
+            'valid' : not errors,
+            'errors' : errors
+        })
+
+    return report
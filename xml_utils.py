@@ -1,49 +1,278 @@
 import os
+import re
+import json
+import time
 import shutil
 import copy
+import warnings
+from collections import OrderedDict, defaultdict
+from contextlib import ExitStack
+from multiprocessing import Pool
 
 from lxml import etree
 
 from . import path_utils
+from . import journal_utils
+from . import lexicon_utils
 
 
-def strip_lexunit_els_and_save(input_path,
-                               output_path):
+# manifest of the English FrameNet files from which the lexicon was initialized (see sync)
+EN_MANIFEST_BASENAME = '.fn_en_manifest.json'
+
+# files that are copied from the English FrameNet (labels of path_utils.get_relevant_paths)
+COPIED_LABELS = ['frRelation.xml',
+                 'frameIndex.xml',
+                 'frameIndex.xsl',
+                 'luIndex.xsl',
+                 'lexUnit.xsl',
+                 'semTypes.xml',
+                 'frame.xsl']
+
+# (English FrameNet root, frame) -> stripped lu/LU_ID.xml document (see get_lu_template)
+LU_TEMPLATES = OrderedDict()
+LU_TEMPLATE_CACHE_SIZE = 256
+
+# elements of an English lu/LU_ID.xml file that are not part of an LU template
+LU_TEMPLATE_QUERIES = ['{http://framenet.icsi.berkeley.edu}lexeme',
+                       '{http://framenet.icsi.berkeley.edu}valences',
+                       '{http://framenet.icsi.berkeley.edu}subCorpus',
+                       '{http://framenet.icsi.berkeley.edu}semType',
+                       '{http://framenet.icsi.berkeley.edu}header/{http://framenet.icsi.berkeley.edu}corpus']
+
+
+class LexiconSession(object):
+    """
+    A write-back cache of the parsed XML files of a lexicon.
+    Use it as the journal argument of the functions of this module (or the session argument of
+    add_lu, add_lus, remove_lu, and remove_lus) to apply many edits in a row:
+    every file is parsed at most once, edits are applied to the trees in memory,
+    and each modified file is written once when the session is flushed,
+    i.e., when the with block ends, in one transaction (see journal_utils).
+    If the with block raises an exception, the edits are discarded.
+
+    Please note that the files of the lexicon on disk, and hence NLTK's FramenetCorpusReader,
+    only reflect the edits after the session is flushed.
+    """
+    def __init__(self, folder, journaled=True, verbose=0):
+        self.folder = folder
+        self.journaled = journaled
+        self.verbose = verbose
+
+        # path -> parsed document
+        self.docs = {}
+        self.dirty = set()
+        self.removed = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+
+    def load_doc(self, path):
+        path = os.path.realpath(path)
+        assert path not in self.removed, f'{path} was removed in this session.'
+
+        if path not in self.docs:
+            self.docs[path] = load_doc(path)
+        return self.docs[path]
+
+    def save_doc(self, doc, path):
+        path = os.path.realpath(path)
+        self.docs[path] = doc
+        self.dirty.add(path)
+        self.removed.discard(path)
+
+    def exists(self, path):
+        path = os.path.realpath(path)
+        if path in self.docs:
+            return True
+        if path in self.removed:
+            return False
+        return os.path.exists(path)
+
+    def remove_file(self, path):
+        path = os.path.realpath(path)
+        self.docs.pop(path, None)
+        self.dirty.discard(path)
+        self.removed.add(path)
+
+    def flush(self):
+        """
+        write all modified files and remove all removed files in one transaction
+        """
+        with journal_utils.transaction(self.folder, enabled=self.journaled, verbose=self.verbose) as journal:
+            for path in sorted(self.dirty):
+                save_doc(self.docs[path], path, journal=journal)
+            for path in sorted(self.removed):
+                if os.path.exists(path):
+                    remove_file(path, journal=journal)
+
+        if self.verbose >= 1:
+            print(f'flushed session: {len(self.dirty)} file(s) written, {len(self.removed)} file(s) removed')
+
+        self.dirty = set()
+        self.removed = set()
+
+    def discard(self):
+        """
+        forget all edits of the session
+        """
+        self.docs = {}
+        self.dirty = set()
+        self.removed = set()
+
+        # the lexicon index may contain LUs of this session, which were not written
+        lexicon_utils.LEXICON_INDEXES.pop(os.path.realpath(self.folder), None)
+
+        if self.verbose >= 1:
+            print(f'discarded the edits of the session for {self.folder}')
+
+
+def load_doc(path, journal=None):
+    """
+    parse an XML file of the lexicon.
+    If a journal (see journal_utils.Transaction) is provided,
+    the version staged in the journal is read if there is one.
+    If a LexiconSession is provided, the document is obtained from the session.
+    """
+    if isinstance(journal, LexiconSession):
+        return journal.load_doc(path)
+
+    if journal is not None:
+        path = journal.current_path(path)
+
     parser = etree.XMLParser(remove_blank_text=True)
-    doc = etree.parse(input_path, parser)
-    root = doc.getroot()
+    doc = etree.parse(path, parser)
+    return doc
 
-    for lexunit_el in root.findall("{http://framenet.icsi.berkeley.edu}lexUnit"):
-        lexunit_el.getparent().remove(lexunit_el)
 
-    els = root.findall("{http://framenet.icsi.berkeley.edu}lexUnit")
-    assert len(els) == 0
+def save_doc(doc, path, journal=None):
+    """
+    write an XML file of the lexicon.
+    If a journal (see journal_utils.Transaction) is provided,
+    the file is staged in the journal and only written to path when the journal is committed.
+    If a LexiconSession is provided, the file is only written when the session is flushed.
+    """
+    if isinstance(journal, LexiconSession):
+        journal.save_doc(doc, path)
+        return
 
-    doc.write(output_path,
+    if journal is not None:
+        path = journal.stage(path)
+
+    doc.write(path,
               encoding='utf-8',
               pretty_print=True,
               xml_declaration=True)
 
 
-def strip_lu_els_and_save(input_path,
-                          output_path):
+def file_exists(path, journal=None):
+    """
+    determine whether a file of the lexicon exists (see save_doc for the role of the journal)
+    """
+    if journal is not None:
+        return journal.exists(path)
+    return os.path.exists(path)
+
+
+def remove_file(path, journal=None):
+    """
+    remove a file of the lexicon (see save_doc for the role of the journal)
+    """
+    if isinstance(journal, LexiconSession):
+        journal.remove_file(path)
+    elif journal is not None:
+        journal.remove(path)
+    else:
+        os.remove(path)
+
+
+def load_stripped_frame_doc(input_path):
+    """
+    parse an English frame/FRAME_NAME.xml file and remove its lexUnit elements
+    """
     parser = etree.XMLParser(remove_blank_text=True)
     doc = etree.parse(input_path, parser)
     root = doc.getroot()
 
-    query = '{http://framenet.icsi.berkeley.edu}lu'
-    for lu_el in root.findall(query):
-        lu_el.getparent().remove(lu_el)
+    for lexunit_el in root.findall("{http://framenet.icsi.berkeley.edu}lexUnit"):
+        lexunit_el.getparent().remove(lexunit_el)
 
-    els = root.findall(query)
+    els = root.findall("{http://framenet.icsi.berkeley.edu}lexUnit")
     assert len(els) == 0
 
+    return doc
+
+
+def strip_lexunit_els_and_save(input_path,
+                               output_path):
+    doc = load_stripped_frame_doc(input_path)
+
     doc.write(output_path,
               encoding='utf-8',
               pretty_print=True,
               xml_declaration=True)
 
 
+def strip_lexunit_els_and_save_from_paths(input_and_output_path):
+    """
+    wrapper around strip_lexunit_els_and_save for use in a process pool
+
+    :return: the signature of the input file (see path_utils.get_file_signature)
+    """
+    input_path, output_path = input_and_output_path
+    strip_lexunit_els_and_save(input_path=input_path,
+                               output_path=output_path)
+    return path_utils.get_file_signature(input_path)
+
+
+def strip_lu_els_and_save(input_path,
+                          output_path):
+    """
+    Copy luIndex.xml without the luIndex/lu elements.
+    The file is streamed, i.e., the children of the root element are parsed,
+    written, and discarded one by one, such that memory use does not grow with the size of the index.
+
+    :rtype: int
+    :return: the number of removed luIndex/lu elements
+    """
+    query = '{http://framenet.icsi.berkeley.edu}lu'
+    num_removed = 0
+    root = None
+
+    with etree.xmlfile(output_path, encoding='utf-8') as xf, ExitStack() as root_context:
+        xf.write_declaration()
+
+        for event, el in etree.iterparse(input_path,
+                                         events=('start', 'end', 'pi'),
+                                         remove_blank_text=True):
+            if event == 'pi':
+                # processing instructions before the root, e.g., the stylesheet
+                if root is None:
+                    xf.write(el, pretty_print=True)
+            elif event == 'start':
+                if root is None:
+                    root = el
+                    root_context.enter_context(xf.element(root.tag,
+                                                          attrib=dict(root.attrib),
+                                                          nsmap=root.nsmap))
+            elif el.getparent() is root:
+                if el.tag == query:
+                    num_removed += 1
+                else:
+                    xf.write(el, pretty_print=True)
+
+                el.clear()
+                while el.getprevious() is not None:
+                    del root[0]
+
+    return num_removed
+
+
 def strip_corpus_els_and_save(input_path,
                               output_path,
                               verbose=0):
@@ -67,9 +296,126 @@ def strip_corpus_els_and_save(input_path,
         print(f'removed corpus els and saved it to {output_path}')
 
 
+def save_en_manifest(folder, en_manifest, journal=None):
+    """
+    write the manifest of the English FrameNet files (see sync)
+    """
+    output_path = os.path.join(folder, EN_MANIFEST_BASENAME)
+    if journal is not None:
+        output_path = journal.stage(output_path)
+
+    with open(output_path, 'w') as outfile:
+        json.dump(en_manifest, outfile, indent=1, sort_keys=True)
+
+
+def get_changed_en_files(en_manifest, paths_fn_en):
+    """
+    compare the English FrameNet files with the manifest (see path_utils.get_changed_files)
+
+    :rtype: tuple
+    :return: (the changed or new files (manifest keys), the removed files (manifest keys), the updated manifest)
+    """
+    key_to_path = {label: paths_fn_en[label] for label in COPIED_LABELS}
+    for frame, frame_xml in paths_fn_en['frame_to_xml_path'].items():
+        key_to_path[f'frame/{frame}.xml'] = frame_xml
+
+    return path_utils.get_changed_files(manifest=en_manifest,
+                                        key_to_path=key_to_path)
+
+
+def sync(folder,
+         fn_en,
+         journaled=True,
+         verbose=0):
+    """
+    Incrementally update a lexicon after the English FrameNet was updated.
+    Using the manifest that was written by initialize, only the English files that changed are processed:
+    -copied files (e.g., frRelation.xml, semTypes.xml, frameIndex.xml) are copied again
+    -frame/FRAME_NAME.xml files are stripped again, after which the lexUnit elements of your lexicon are added back
+    Frames that were removed from the English FrameNet are removed, unless your lexicon has LUs in them.
+
+    :param str folder: the folder of your lexicon
+    :param fn_en: the English FrameNet (from nltk.corpus import framenet as fn_en)
+    :param bool journaled: if True, all files are updated in one transaction (see journal_utils)
+
+    :rtype: dict
+    :return: mapping from "updated" and "removed" to the manifest keys of the files
+    """
+    en_manifest_path = os.path.join(folder, EN_MANIFEST_BASENAME)
+    assert os.path.exists(en_manifest_path), \
+        f'{en_manifest_path} does not exist. Please use initialize to create the lexicon.'
+
+    with open(en_manifest_path) as infile:
+        en_manifest = json.load(infile)
+
+    paths_your_fn = path_utils.get_relevant_paths(folder, check_if_exists=False)
+    paths_fn_en = path_utils.get_relevant_paths(fn_en.root)
+
+    changed, removed, updated_manifest = get_changed_en_files(en_manifest=en_manifest,
+                                                              paths_fn_en=paths_fn_en)
+
+    query = '{http://framenet.icsi.berkeley.edu}lexUnit'
+    summary = {'updated' : [], 'removed' : []}
+
+    with journal_utils.transaction(folder, enabled=journaled, verbose=verbose) as journal:
+        for key in changed:
+            if key in COPIED_LABELS:
+                output_path = paths_your_fn[key]
+                if journal is not None:
+                    output_path = journal.stage(output_path)
+                shutil.copy(src=paths_fn_en[key],
+                            dst=output_path)
+            else:
+                frame = key[len('frame/'):-len('.xml')]
+                output_path = os.path.join(paths_your_fn['frame_dir'], f'{frame}.xml')
+                doc = load_stripped_frame_doc(paths_fn_en['frame_to_xml_path'][frame])
+
+                if os.path.exists(output_path):
+                    root = doc.getroot()
+                    for lexunit_el in load_doc(output_path, journal=journal).getroot().findall(query):
+                        root.append(lexunit_el)
+
+                save_doc(doc, output_path, journal=journal)
+
+            summary['updated'].append(key)
+
+        for key in removed:
+            output_path = os.path.join(folder, key)
+            if os.path.exists(output_path):
+                if load_doc(output_path, journal=journal).getroot().findall(query):
+                    warnings.warn(f'{key} was removed from the English FrameNet, but your lexicon has LUs in it. '
+                                  f'The file is kept. Please inspect.')
+                    continue
+                remove_file(output_path, journal=journal)
+            summary['removed'].append(key)
+
+        save_en_manifest(folder=folder,
+                         en_manifest=updated_manifest,
+                         journal=journal)
+
+    if verbose:
+        print(f'synced {folder} with {fn_en.root}: '
+              f'{len(summary["updated"])} file(s) updated, {len(summary["removed"])} file(s) removed')
+
+    return summary
+
+
 def initialize(folder,
                fn_en,
+               num_processes=None,
                verbose=0):
+    """
+    Initialize an empty lexicon, i.e., a copy of the English FrameNet without LUs and annotations.
+    The frame files are processed in parallel.
+    A manifest of the English files is stored in the lexicon, such that it can
+    later be updated incrementally with sync.
+
+    :param str folder: the folder of the new lexicon (it is removed if it exists)
+    :param fn_en: the English FrameNet (from nltk.corpus import framenet as fn_en)
+    :param int num_processes: the number of processes used for the frame files
+    (default: number of CPUs, 1: no process pool)
+    :param int verbose: 1: timing summary, 2: progress reports
+    """
     # validate fn_en
     root_en = fn_en.root
     assert os.path.exists(
@@ -86,26 +432,50 @@ def initialize(folder,
     path_utils.remove_and_create_folder(fldr=paths_your_fn['lu_dir'], verbose=verbose)
     path_utils.remove_and_create_folder(fldr=paths_your_fn['frame_dir'], verbose=verbose)
 
-    for label in ['frRelation.xml',
-                  'frameIndex.xml',
-                  'frameIndex.xsl',
-                  'luIndex.xsl',
-                  'lexUnit.xsl',
-                  'semTypes.xml',
-                  'frame.xsl']:
+    en_manifest = {}
+    for label in COPIED_LABELS:
         shutil.copy(src=paths_fn_en[label],
                     dst=paths_your_fn[label])
+        en_manifest[label] = path_utils.get_file_signature(paths_fn_en[label])
 
     # load frame/*xml files and remove lexUnit elements
-    for frame, frame_xml in paths_fn_en['frame_to_xml_path'].items():
-        output_path = os.path.join(paths_your_fn['frame_dir'],
-                                   f'{frame}.xml')
-        strip_lexunit_els_and_save(input_path=frame_xml,
-                                   output_path=output_path)
-
-    # load luIndex.xml and strip luIndex/lu elements
-    strip_lu_els_and_save(input_path=paths_fn_en['luIndex.xml'],
-                          output_path=paths_your_fn['luIndex.xml'])
+    frames = sorted(paths_fn_en['frame_to_xml_path'])
+    input_and_output_paths = [(paths_fn_en['frame_to_xml_path'][frame],
+                               os.path.join(paths_your_fn['frame_dir'], f'{frame}.xml'))
+                              for frame in frames]
+    num_frames = len(input_and_output_paths)
+
+    start = time.time()
+    with ExitStack() as pool_context:
+        if num_processes == 1:
+            results = map(strip_lexunit_els_and_save_from_paths, input_and_output_paths)
+        else:
+            pool = pool_context.enter_context(Pool(processes=num_processes))
+            results = pool.imap(strip_lexunit_els_and_save_from_paths,
+                                input_and_output_paths,
+                                chunksize=16)
+
+        for num_done, (frame, signature) in enumerate(zip(frames, results), start=1):
+            en_manifest[f'frame/{frame}.xml'] = signature
+            if verbose >= 2 and (num_done % 100 == 0 or num_done == num_frames):
+                elapsed = time.time() - start
+                print(f'stripped {num_done}/{num_frames} frame files ({num_done / elapsed:.1f} files/s)')
+
+    if verbose >= 1:
+        elapsed = time.time() - start
+        print(f'stripped lexUnit elements from {num_frames} frame files in {elapsed:.1f} seconds')
+
+    # stream luIndex.xml and strip luIndex/lu elements
+    start = time.time()
+    num_removed = strip_lu_els_and_save(input_path=paths_fn_en['luIndex.xml'],
+                                        output_path=paths_your_fn['luIndex.xml'])
+
+    if verbose >= 1:
+        elapsed = time.time() - start
+        print(f'stripped {num_removed} lu elements from luIndex.xml in {elapsed:.1f} seconds')
+
+    save_en_manifest(folder=folder,
+                     en_manifest=en_manifest)
 
     if verbose:
         print(f'initialized empty FrameNet lexicon at {folder}')
@@ -126,17 +496,29 @@ def create_lexeme_els(lexemes):
 
 
 def add_skos_namespace(old_root, skos_namespace):
+    """
+    declare the skos namespace on the root element, in place and only if it is not declared yet.
+
+    :rtype: tuple
+    :return: (the document of the root, the root)
+    """
+    root = old_root
+
     if skos_namespace is not None:
         etree.register_namespace('skos', skos_namespace)
-        root = copy.deepcopy(old_root)
-    else:
-        root = old_root
+        if root.nsmap.get('skos') != skos_namespace:
+            etree.cleanup_namespaces(root,
+                                     top_nsmap={'skos': skos_namespace},
+                                     keep_ns_prefixes=['skos'])
 
     doc = root.getroottree()
 
     return doc, root
 
 def add_skos_attributes(element, skos_predicate_to_external_references, skos_namespace):
+    if skos_predicate_to_external_references:
+        etree.register_namespace('skos', skos_namespace)
+
     for skos_predicate, external_refs in skos_predicate_to_external_references.items():
         attribute = '{%s}%s' % (skos_namespace, skos_predicate)
         value = '||'.join(external_refs)
@@ -144,6 +526,82 @@ def add_skos_attributes(element, skos_predicate_to_external_references, skos_nam
 
 
 
+def get_lu_template(fn_en, frame, template_dir=None, en_frames=None):
+    """
+    obtain a copy of the template for new LUs of a frame.
+    The template is the lu/LU_ID.xml file of the first English LU of the frame
+    without its annotations, valences, lexemes, and semantic types.
+    Templates are kept in memory (the LU_TEMPLATE_CACHE_SIZE most recently used ones)
+    and, if template_dir is provided, stored on disk, such that each English file is only parsed once.
+
+    :param fn_en: the English FrameNet
+    :param str frame: a frame label
+    :param str template_dir: optional folder in which templates are stored
+    :param dict en_frames: optional metadata of the English frames (see snapshot_utils.get_en_frames),
+    which avoids loading the frame from fn_en
+
+    :return: the root element of a copy of the template document,
+    which includes the processing instructions that precede the root, e.g., the xml-stylesheet
+    """
+    key = (str(fn_en.root), frame)
+    template_doc = LU_TEMPLATES.get(key)
+
+    if template_doc is not None:
+        LU_TEMPLATES.move_to_end(key)
+    else:
+        # we select the first English LU from the frame that we want to add a new LU to
+        # we modify the existing XML file for the English to create the new XML file for the new LU
+        if en_frames is not None and frame in en_frames:
+            assert en_frames[frame]['lexicalized'], f'{frame} is not lexicalized in English. Not able to add the LU.'
+            en_lu_id = en_frames[frame]['template_lu_id']
+        else:
+            frame_obj = fn_en.frame_by_name(frame)
+
+            assert len(frame_obj.lexUnit), f'{frame} is not lexicalized in English. Not able to add the LU.'
+
+            for lu_obj in frame_obj.lexUnit.values():
+                en_lu_id = lu_obj.ID
+                break
+
+        input_path = os.path.join(fn_en.root,
+                                  fn_en._lu_dir,
+                                  f'lu{en_lu_id}.xml')
+
+        template_path = None
+        if template_dir is not None:
+            template_path = os.path.join(template_dir, f'lu_template_{frame}_{en_lu_id}.xml')
+
+        template_is_stored = (template_path is not None and
+                              os.path.exists(template_path) and
+                              os.path.getmtime(template_path) >= os.path.getmtime(input_path))
+
+        if template_is_stored:
+            template_doc = load_doc(template_path)
+        else:
+            template_doc = load_doc(input_path)
+            template_root = template_doc.getroot()
+
+            for query in LU_TEMPLATE_QUERIES:
+                for el in template_root.findall(query):
+                    el.getparent().remove(el)
+
+            if 'incorporatedFE' in template_root.attrib:
+                del template_root.attrib['incorporatedFE']
+
+            if template_path is not None:
+                os.makedirs(template_dir, exist_ok=True)
+                tmp_path = f'{template_path}.{os.getpid()}.tmp'
+                save_doc(template_doc, tmp_path)
+                os.replace(tmp_path, template_path)
+
+        LU_TEMPLATES[key] = template_doc
+        if len(LU_TEMPLATES) > LU_TEMPLATE_CACHE_SIZE:
+            LU_TEMPLATES.popitem(last=False)
+
+    # a copy of the root element alone would lose the processing instructions
+    return copy.deepcopy(template_doc).getroot()
+
+
 def create_lu_xml_file(fn_en,
                        your_fn,
                        frame,
@@ -156,24 +614,14 @@ def create_lu_xml_file(fn_en,
                        lu_type,
                        incorporated_fe=None,
                        skos_predicate_to_external_references={},
-                       skos_namespace=None):
-    frame = fn_en.frame_by_name(frame)
-
-    assert len(frame.lexUnit), f'{frame} is not lexicalized in English. Not able to add the LU.'
-
-    # we select the first English LU from the frame that we want to add a new LU to
-    # we modify the existing XML file for the English to create the new XML file for the new LU
-    for lu_obj in frame.lexUnit.values():
-        en_lu_id = lu_obj.ID
-        break
-
-    input_path = os.path.join(fn_en.root,
-                              fn_en._lu_dir,
-                              f'lu{en_lu_id}.xml')
-
-    parser = etree.XMLParser(remove_blank_text=True)
-    doc = etree.parse(input_path, parser)
-    root = doc.getroot()
+                       skos_namespace=None,
+                       template_dir=None,
+                       en_frames=None,
+                       journal=None):
+    root = get_lu_template(fn_en=fn_en,
+                           frame=frame,
+                           template_dir=template_dir,
+                           en_frames=en_frames)
 
     doc, root = add_skos_namespace(old_root=root,
                                    skos_namespace=skos_namespace)
@@ -190,25 +638,13 @@ def create_lu_xml_file(fn_en,
 
     if incorporated_fe is not None:
         root.set('incorporatedFE', incorporated_fe)
-    else:
-        if 'incorporatedFE' in root.attrib:
-            del root.attrib['incorporatedFE']
 
     def_el = root.find('{http://framenet.icsi.berkeley.edu}definition')
     if definition is None:
         definition = ''
     def_el.text = definition
 
-    # update lexemes
-    queries = ['{http://framenet.icsi.berkeley.edu}lexeme',
-               '{http://framenet.icsi.berkeley.edu}valences',
-               '{http://framenet.icsi.berkeley.edu}subCorpus',
-               '{http://framenet.icsi.berkeley.edu}semType',
-               '{http://framenet.icsi.berkeley.edu}header/{http://framenet.icsi.berkeley.edu}corpus']
-    for query in queries:
-        for el in root.findall(query):
-            el.getparent().remove(el)
-
+    # add lexemes
     lexeme_els = create_lexeme_els(lexemes)
     for lexeme_el in lexeme_els:
         root.append(lexeme_el)
@@ -217,15 +653,11 @@ def create_lu_xml_file(fn_en,
                                your_fn._lu_dir,
                                f'lu{lu_id}.xml')
 
-    doc.write(output_path,
-              encoding='utf-8',
-              pretty_print=True,
-              xml_declaration=True)
+    save_doc(doc, output_path, journal=journal)
     return root
 
 
-def add_lu_el_to_luindex(path_lu_index,
-                         frame_id,
+def create_luindex_lu_el(frame_id,
                          frame_name,
                          status,
                          lemma,
@@ -234,13 +666,6 @@ def add_lu_el_to_luindex(path_lu_index,
                          lu_type,
                          skos_predicate_to_external_references={},
                          skos_namespace=None):
-    parser = etree.XMLParser(remove_blank_text=True)
-    doc = etree.parse(path_lu_index, parser)
-    root = doc.getroot()
-
-    doc, root = add_skos_namespace(old_root=root,
-                                   skos_namespace=skos_namespace)
-
     lu_el = etree.Element('lu',
                           attrib={
                               'numAnnotInstances': "0",
@@ -257,41 +682,305 @@ def add_lu_el_to_luindex(path_lu_index,
                         skos_predicate_to_external_references=skos_predicate_to_external_references,
                         skos_namespace=skos_namespace)
 
-    root.append(lu_el)
+    return lu_el
 
-    doc.write(path_lu_index,
-              encoding='utf-8',
-              pretty_print=True,
-              xml_declaration=True)
 
+def append_els_before_closing_tag(path, els, namespace_to_prefix={}, journal=None):
+    """
+    append elements to the root of an XML file at byte level, i.e.,
+    by inserting them just before the closing tag of the root, without parsing the file.
+    This is only possible if the root start tag declares the required namespaces.
 
-def add_lu_to_frame_xml_file(your_fn,
-                             frame,
-                             status,
-                             lemma,
-                             lemma_id,
-                             pos,
-                             lu_id,
-                             lexemes,
-                             agent,
-                             provenance,
-                             cdate,
-                             definition,
-                             lu_type,
-                             incorporated_fe=None,
-                             skos_predicate_to_external_references={},
-                             skos_namespace=None):
-    frame_xml_path = os.path.join(your_fn.root,
-                                  'frame',
-                                  f'{frame}.xml')
+    :param str path: path to an XML file of the lexicon
+    :param list els: the elements to append
+    :param dict namespace_to_prefix: the namespaces that the root should declare (namespace -> prefix)
+    :param journal: see save_doc (a LexiconSession is not supported)
 
-    parser = etree.XMLParser(remove_blank_text=True)
-    doc = etree.parse(frame_xml_path, parser)
+    :rtype: bool
+    :return: True if the elements were appended, False if the file should be rewritten
+    """
+    current_path = path
+    if journal is not None:
+        current_path = journal.current_path(path)
+
+    file_size = os.path.getsize(current_path)
+    with open(current_path, 'rb') as infile:
+        head = infile.read(8192)
+        infile.seek(max(0, file_size - 1024))
+        tail = infile.read()
+
+    root_start_tag = re.search(rb'<([^?!\s/>]+)([^>]*)>', head)
+    closing_tag = re.search(rb'</([^\s>]+)\s*>\s*$', tail)
+    if root_start_tag is None or closing_tag is None:
+        return False
+    if root_start_tag.group(1) != closing_tag.group(1) or root_start_tag.group(2).rstrip().endswith(b'/'):
+        return False
+
+    for namespace, prefix in namespace_to_prefix.items():
+        if f'xmlns:{prefix}="{namespace}"'.encode('utf-8') not in root_start_tag.group(2):
+            return False
+
+    fragment = b''.join([b'  ' + etree.tostring(el, encoding='utf-8', pretty_print=True)
+                         for el in els])
+
+    # validate that the fragment is well-formed
+    etree.fromstring(b'<fragment>' + fragment + b'</fragment>')
+
+    offset = file_size - len(tail) + closing_tag.start()
+    data = fragment + tail[closing_tag.start():]
+
+    if journal is not None:
+        journal.insert(path, offset, data)
+    else:
+        journal_utils.insert_at(path, offset, data)
+
+    return True
+
+
+def add_els_to_xml_file(path,
+                        els,
+                        skos_namespace=None,
+                        append_mode=True,
+                        journal=None):
+    """
+    add elements to the root of an XML file of the lexicon.
+    If append_mode is True, the elements are appended at byte level (see append_els_before_closing_tag),
+    such that the cost does not depend on the size of the file.
+    The file is only parsed and rewritten if the skos namespace has to be added to it.
+    """
+    if append_mode and not isinstance(journal, LexiconSession):
+        namespace_to_prefix = {}
+        if skos_namespace is not None:
+            namespace_to_prefix[skos_namespace] = 'skos'
+
+        if append_els_before_closing_tag(path=path,
+                                         els=els,
+                                         namespace_to_prefix=namespace_to_prefix,
+                                         journal=journal):
+            return
+
+    doc = load_doc(path, journal=journal)
     root = doc.getroot()
 
     doc, root = add_skos_namespace(old_root=root,
                                    skos_namespace=skos_namespace)
 
+    for el in els:
+        root.append(el)
+
+    save_doc(doc, path, journal=journal)
+
+
+def create_luindex_shard_doc(folder, journal=None):
+    """
+    create an empty luIndex shard, i.e., a luIndex root element without children
+    """
+    base_path = os.path.join(folder, lexicon_utils.LUINDEX_SHARD_DIR, lexicon_utils.LUINDEX_SHARD_BASE_BASENAME)
+    base_root = load_doc(base_path, journal=journal).getroot()
+
+    root = etree.Element(base_root.tag,
+                         attrib=dict(base_root.attrib),
+                         nsmap=base_root.nsmap)
+    return etree.ElementTree(root)
+
+
+def shard_luindex(folder,
+                  shard_by='frame',
+                  verbose=0):
+    """
+    Store the luIndex/lu elements of a lexicon in shards, i.e., LEXICON/luIndex_shards/shard_KEY.xml files,
+    with one shard per frame (shard_by="frame") or per first character of the lemma (shard_by="lemma_initial").
+    From then on, adding and removing LUs only rewrites the affected shards.
+    luIndex.xml remains available as a merged view of the shards for NLTK's FramenetCorpusReader,
+    which is updated by load (see merge_luindex_shards).
+
+    :param str folder: the folder of your lexicon
+    :param str shard_by: "frame" | "lemma_initial"
+    """
+    assert shard_by in lexicon_utils.SHARD_BY, f'shard_by should be one of {lexicon_utils.SHARD_BY}, you provided {shard_by}'
+    assert lexicon_utils.get_luindex_shard_layout(folder) is None, f'luIndex.xml of {folder} is already sharded.'
+
+    layout = {'shard_by' : shard_by}
+    shard_dir = os.path.join(folder, lexicon_utils.LUINDEX_SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+
+    doc = load_doc(os.path.join(folder, 'luIndex.xml'))
+    root = doc.getroot()
+
+    shard_key_to_lu_els = defaultdict(list)
+    for lu_el in root.findall('{http://framenet.icsi.berkeley.edu}lu'):
+        root.remove(lu_el)
+        shard_key = lexicon_utils.get_luindex_shard_key(layout=layout,
+                                                        frame_name=lu_el.get('frameName'),
+                                                        lu_name=lu_el.get('name'))
+        shard_key_to_lu_els[shard_key].append(lu_el)
+
+    with journal_utils.transaction(folder, verbose=verbose) as journal:
+        save_doc(doc,
+                 os.path.join(shard_dir, lexicon_utils.LUINDEX_SHARD_BASE_BASENAME),
+                 journal=journal)
+
+        for shard_key, lu_els in sorted(shard_key_to_lu_els.items()):
+            shard_doc = create_luindex_shard_doc(folder, journal=journal)
+            for lu_el in lu_els:
+                shard_doc.getroot().append(lu_el)
+            save_doc(shard_doc,
+                     lexicon_utils.get_luindex_shard_path(folder, shard_key),
+                     journal=journal)
+
+        # the layout is written last, since its presence indicates that luIndex.xml is sharded
+        with open(journal.stage(os.path.join(shard_dir, lexicon_utils.LUINDEX_SHARD_LAYOUT_BASENAME)), 'w') as outfile:
+            json.dump(layout, outfile)
+
+    if verbose:
+        print(f'stored the lu elements of {folder} in {len(shard_key_to_lu_els)} shard(s) by {shard_by}')
+
+
+def merge_luindex_shards(folder, verbose=0):
+    """
+    update luIndex.xml from its shards (see shard_luindex) if one of them was modified
+    since the last merge (see lexicon_utils.luindex_shards_are_merged).
+    The shards are streamed, such that memory use does not grow with the size of the lexicon.
+
+    :rtype: bool
+    :return: True if luIndex.xml was updated
+    """
+    if lexicon_utils.get_luindex_shard_layout(folder) is None:
+        return False
+    if lexicon_utils.luindex_shards_are_merged(folder):
+        return False
+
+    start = time.time()
+
+    # prevent that a transaction replaces shards while they are merged
+    the_transaction = journal_utils.Transaction(folder, verbose=verbose)
+    the_transaction.acquire_lock()
+    try:
+        shard_paths = lexicon_utils.get_luindex_shard_paths(folder)
+        shard_signatures = lexicon_utils.get_luindex_shard_signatures(folder)
+
+        base_path = os.path.join(folder, lexicon_utils.LUINDEX_SHARD_DIR, lexicon_utils.LUINDEX_SHARD_BASE_BASENAME)
+        base_root = load_doc(base_path).getroot()
+
+        nsmap = dict(base_root.nsmap)
+        for shard_path in shard_paths:
+            for event, shard_root in etree.iterparse(shard_path, events=('start',)):
+                nsmap.update(shard_root.nsmap)
+                break
+
+        luindex_path = os.path.join(folder, 'luIndex.xml')
+        tmp_path = f'{luindex_path}.{os.getpid()}.tmp'
+        with etree.xmlfile(tmp_path, encoding='utf-8') as xf:
+            xf.write_declaration()
+            for sibling in reversed(list(base_root.itersiblings(preceding=True))):
+                xf.write(sibling, pretty_print=True)
+
+            with xf.element(base_root.tag, attrib=dict(base_root.attrib), nsmap=nsmap):
+                for child in base_root:
+                    xf.write(child, pretty_print=True)
+
+                for shard_path in shard_paths:
+                    for event, lu_el in etree.iterparse(shard_path,
+                                                        tag='{http://framenet.icsi.berkeley.edu}lu',
+                                                        remove_blank_text=True):
+                        xf.write(lu_el, pretty_print=True)
+                        lu_el.clear()
+
+        os.replace(tmp_path, luindex_path)
+        lexicon_utils.write_luindex_merge_manifest(folder, shard_signatures)
+    finally:
+        the_transaction.release_lock()
+
+    if verbose >= 1:
+        print(f'merged {len(shard_paths)} luIndex shard(s) into {luindex_path} in {time.time() - start:.1f} seconds')
+
+    return True
+
+
+def add_lu_els_to_luindex(path_lu_index,
+                          lu_els,
+                          skos_namespace=None,
+                          append_mode=True,
+                          journal=None):
+    """
+    add one or more luIndex/lu elements (see create_luindex_lu_el)
+    to luIndex.xml, which is parsed and written once (see add_els_to_xml_file).
+    If luIndex.xml is sharded (see shard_luindex), the elements are added to their shards.
+    """
+    folder = os.path.dirname(path_lu_index)
+    layout = lexicon_utils.get_luindex_shard_layout(folder)
+
+    if layout is None:
+        add_els_to_xml_file(path=path_lu_index,
+                            els=lu_els,
+                            skos_namespace=skos_namespace,
+                            append_mode=append_mode,
+                            journal=journal)
+        return
+
+    shard_key_to_lu_els = defaultdict(list)
+    for lu_el in lu_els:
+        shard_key = lexicon_utils.get_luindex_shard_key(layout=layout,
+                                                        frame_name=lu_el.get('frameName'),
+                                                        lu_name=lu_el.get('name'))
+        shard_key_to_lu_els[shard_key].append(lu_el)
+
+    for shard_key, lu_els_of_shard in sorted(shard_key_to_lu_els.items()):
+        shard_path = lexicon_utils.get_luindex_shard_path(folder, shard_key)
+
+        if not file_exists(shard_path, journal=journal):
+            save_doc(create_luindex_shard_doc(folder, journal=journal),
+                     shard_path,
+                     journal=journal)
+
+        add_els_to_xml_file(path=shard_path,
+                            els=lu_els_of_shard,
+                            skos_namespace=skos_namespace,
+                            append_mode=append_mode,
+                            journal=journal)
+
+
+def add_lu_el_to_luindex(path_lu_index,
+                         frame_id,
+                         frame_name,
+                         status,
+                         lemma,
+                         pos,
+                         lu_id,
+                         lu_type,
+                         skos_predicate_to_external_references={},
+                         skos_namespace=None,
+                         journal=None):
+    lu_el = create_luindex_lu_el(frame_id=frame_id,
+                                 frame_name=frame_name,
+                                 status=status,
+                                 lemma=lemma,
+                                 pos=pos,
+                                 lu_id=lu_id,
+                                 lu_type=lu_type,
+                                 skos_predicate_to_external_references=skos_predicate_to_external_references,
+                                 skos_namespace=skos_namespace)
+
+    add_lu_els_to_luindex(path_lu_index=path_lu_index,
+                          lu_els=[lu_el],
+                          skos_namespace=skos_namespace,
+                          journal=journal)
+
+
+def create_lexunit_el(status,
+                      lemma,
+                      lemma_id,
+                      pos,
+                      lu_id,
+                      lexemes,
+                      agent,
+                      provenance,
+                      cdate,
+                      definition,
+                      lu_type,
+                      incorporated_fe=None,
+                      skos_predicate_to_external_references={},
+                      skos_namespace=None):
     lu_el = etree.Element('lexUnit',
                           attrib={
                               'status': status,
@@ -323,79 +1012,194 @@ def add_lu_to_frame_xml_file(your_fn,
     for lexeme_el in lexeme_els:
         lu_el.append(lexeme_el)
 
-    root.append(lu_el)
+    return lu_el
 
-    doc.write(frame_xml_path,
-              encoding='utf-8',
-              pretty_print=True,
-              xml_declaration=True)
+
+def add_lexunit_els_to_frame_xml_file(your_fn,
+                                      frame,
+                                      lexunit_els,
+                                      skos_namespace=None,
+                                      journal=None):
+    """
+    add one or more frame/lexUnit elements (see create_lexunit_el)
+    to frame/FRAME_NAME.xml, which is parsed and written once.
+    """
+    frame_xml_path = os.path.join(your_fn.root,
+                                  'frame',
+                                  f'{frame}.xml')
+
+    doc = load_doc(frame_xml_path, journal=journal)
+    root = doc.getroot()
+
+    doc, root = add_skos_namespace(old_root=root,
+                                   skos_namespace=skos_namespace)
+
+    for lexunit_el in lexunit_els:
+        root.append(lexunit_el)
+
+    save_doc(doc, frame_xml_path, journal=journal)
+
+
+def add_lu_to_frame_xml_file(your_fn,
+                             frame,
+                             status,
+                             lemma,
+                             lemma_id,
+                             pos,
+                             lu_id,
+                             lexemes,
+                             agent,
+                             provenance,
+                             cdate,
+                             definition,
+                             lu_type,
+                             incorporated_fe=None,
+                             skos_predicate_to_external_references={},
+                             skos_namespace=None,
+                             journal=None):
+    lu_el = create_lexunit_el(status=status,
+                              lemma=lemma,
+                              lemma_id=lemma_id,
+                              pos=pos,
+                              lu_id=lu_id,
+                              lexemes=lexemes,
+                              agent=agent,
+                              provenance=provenance,
+                              cdate=cdate,
+                              definition=definition,
+                              lu_type=lu_type,
+                              incorporated_fe=incorporated_fe,
+                              skos_predicate_to_external_references=skos_predicate_to_external_references,
+                              skos_namespace=skos_namespace)
+
+    add_lexunit_els_to_frame_xml_file(your_fn=your_fn,
+                                      frame=frame,
+                                      lexunit_els=[lu_el],
+                                      skos_namespace=skos_namespace,
+                                      journal=journal)
 
 
 def remove_lu_xml_file(your_fn,
-                       lu_id):
+                       lu_id,
+                       journal=None):
     input_path = os.path.join(your_fn.root,
                               your_fn._lu_dir,
                               f'lu{lu_id}.xml')
-    os.remove(input_path)
+    remove_file(input_path, journal=journal)
 
 
-def remove_lu_el_from_luindex(path_lu_index,
-                              lu_id):
-    parser = etree.XMLParser(remove_blank_text=True)
-    doc = etree.parse(path_lu_index, parser)
-    root = doc.getroot()
+def remove_els_with_lu_ids(root, query, lu_ids):
+    """
+    remove the elements matching query of which the attribute ID is one of lu_ids
+    """
+    target_ids = {str(lu_id) for lu_id in lu_ids}
 
-    query = '{http://framenet.icsi.berkeley.edu}lu'
     els = root.findall(query)
 
     before = len(els)
 
     for lu_el in els:
-        if lu_el.get('ID') == str(lu_id):
+        if lu_el.get('ID') in target_ids:
             lu_el.getparent().remove(lu_el)
 
     els = root.findall(query)
     after = len(els)
 
-    assert before == (after + 1)
+    assert before == (after + len(target_ids))
 
-    doc.write(path_lu_index,
-              encoding='utf-8',
-              pretty_print=True,
-              xml_declaration=True)
 
+def remove_lu_els_from_luindex(path_lu_index,
+                               lu_ids,
+                               lu_id_to_frame_and_lu_name=None,
+                               journal=None):
+    """
+    remove the luIndex/lu elements of one or more LUs
+    from luIndex.xml, which is parsed and written once.
+    If luIndex.xml is sharded (see shard_luindex), the elements are removed from their shards,
+    which are determined using lu_id_to_frame_and_lu_name (lu_id -> (frame, lu name)),
+    e.g., from the lexicon index, or by inspecting all shards if it is not provided.
+    """
+    folder = os.path.dirname(path_lu_index)
+    layout = lexicon_utils.get_luindex_shard_layout(folder)
+
+    if layout is None:
+        path_to_lu_ids = {path_lu_index: set(lu_ids)}
+    elif lu_id_to_frame_and_lu_name is not None:
+        path_to_lu_ids = defaultdict(set)
+        for lu_id in lu_ids:
+            frame_name, lu_name = lu_id_to_frame_and_lu_name[lu_id]
+            shard_key = lexicon_utils.get_luindex_shard_key(layout=layout,
+                                                            frame_name=frame_name,
+                                                            lu_name=lu_name)
+            path_to_lu_ids[lexicon_utils.get_luindex_shard_path(folder, shard_key)].add(lu_id)
+    else:
+        target_ids = {str(lu_id) for lu_id in lu_ids}
+        path_to_lu_ids = defaultdict(set)
+        for shard_path in lexicon_utils.get_luindex_shard_paths(folder):
+            for lu_el in load_doc(shard_path, journal=journal).getroot().iter('{http://framenet.icsi.berkeley.edu}lu'):
+                if lu_el.get('ID') in target_ids:
+                    path_to_lu_ids[shard_path].add(int(lu_el.get('ID')))
 
-def remove_lexunit_el_from_frame_xml(your_fn,
-                                     lu_id):
-    lu = your_fn.lu(lu_id)
-    frame_name = lu.frame.name
+        num_found = sum(len(lu_ids_of_path) for lu_ids_of_path in path_to_lu_ids.values())
+        assert num_found == len(target_ids), f'only {num_found} of {len(target_ids)} lu ids were found in the luIndex shards.'
+
+    for path, lu_ids_of_path in sorted(path_to_lu_ids.items()):
+        doc = load_doc(path, journal=journal)
+        root = doc.getroot()
 
+        remove_els_with_lu_ids(root=root,
+                               query='{http://framenet.icsi.berkeley.edu}lu',
+                               lu_ids=lu_ids_of_path)
+
+        save_doc(doc, path, journal=journal)
+
+
+def remove_lu_el_from_luindex(path_lu_index,
+                              lu_id,
+                              journal=None):
+    remove_lu_els_from_luindex(path_lu_index=path_lu_index,
+                               lu_ids=[lu_id],
+                               journal=journal)
+
+
+def remove_lexunit_els_from_frame_xml(your_fn,
+                                      frame_name,
+                                      lu_ids,
+                                      journal=None):
+    """
+    remove the lexUnit elements of one or more LUs of the same frame
+    from the frame/FRAME_NAME.xml file, which is parsed and written once.
+    """
     frame_xml_path = os.path.join(your_fn.root,
                                   'frame',
                                   f'{frame_name}.xml')
 
-    parser = etree.XMLParser(remove_blank_text=True)
-    doc = etree.parse(frame_xml_path, parser)
+    doc = load_doc(frame_xml_path, journal=journal)
     root = doc.getroot()
 
-    query = '{http://framenet.icsi.berkeley.edu}lexUnit'
-    els = root.findall(query)
-
-    before = len(els)
-
-    for lu_el in els:
-        if lu_el.get('ID') == str(lu_id):
-            lu_el.getparent().remove(lu_el)
+    remove_els_with_lu_ids(root=root,
+                           query='{http://framenet.icsi.berkeley.edu}lexUnit',
+                           lu_ids=lu_ids)
 
-    els = root.findall(query)
-    after = len(els)
+    save_doc(doc, frame_xml_path, journal=journal)
 
-    assert before == (after + 1)
 
-    doc.write(frame_xml_path,
-              encoding='utf-8',
-              pretty_print=True,
-              xml_declaration=True)
+def remove_lexunit_el_from_frame_xml(your_fn,
+                                     lu_id,
+                                     frame_name=None,
+                                     journal=None):
+    """
+    remove the lexUnit element of an LU from its frame/FRAME_NAME.xml file.
+    If frame_name is not provided, it is obtained by loading the LU.
+    """
+    if frame_name is None:
+        lu = your_fn.lu(lu_id)
+        frame_name = lu.frame.name
+
+    remove_lexunit_els_from_frame_xml(your_fn=your_fn,
+                                      frame_name=frame_name,
+                                      lu_ids=[lu_id],
+                                      journal=journal)
 
 
 def add_annotations_to_nltk_doc(doc_xml_path,